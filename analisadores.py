@@ -0,0 +1,769 @@
+import os
+import pickle
+import subprocess
+import sys
+import threading
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from scipy.stats import poisson
+
+from base_historica import expandir_equipes, garantir_placares, memorizar, obter_indice_equipes
+from mercados import garantir_mercados, mercado_equipe, usa_ht
+from rastreamento import cronometrar, rastreador
+
+# 🔥 MOTORES DE PROBABILIDADE DO PICO MÁXIMO
+# 'monte_carlo': sorteia 100.000 jogos; 'analitico': mesma distribuição, calculada de forma exata
+MOTORES_PICO_MAXIMO = ('monte_carlo', 'analitico')
+MOTOR_PADRAO = 'monte_carlo'
+
+# Fração dos gols FT que acontece no primeiro tempo
+PROPORCAO_GOLS_HT = 0.4
+
+# Simulações por jogo e memória máxima de cada bloco da simulação em lote
+NUM_SIMULACOES = 100000
+MEMORIA_MAXIMA_SIMULACAO = 256 * 1024 * 1024
+
+# Monte Carlo em paralelo: jogos por tarefa enviada aos processos (fixo, para o resultado
+# não depender do número de processos)
+JOGOS_POR_TAREFA = 8
+# Pico aproximado de bytes por célula (jogo x simulação): temporários int64 do gerador + matrizes int16
+BYTES_POR_SIMULACAO = 32
+
+
+def _pmf_poisson(media, max_gols):
+    """P(X = k) para k = 0..max_gols, sem o custo de chamar o scipy a cada jogo"""
+    razoes = np.empty(max_gols + 1)
+    razoes[0] = np.exp(-media)
+    razoes[1:] = media / np.arange(1, max_gols + 1)
+    return np.cumprod(razoes)
+
+
+def simular_lote_monte_carlo(lambdas_casa, lambdas_fora, num_simulacoes=NUM_SIMULACOES, gerador=None,
+                             memoria_maxima=MEMORIA_MAXIMA_SIMULACAO, progresso=None):
+    """Simula todos os jogos de uma vez (matriz jogos x simulações), em blocos que cabem em memoria_maxima.
+
+    Retorna a frequência de cada mercado como um array com um valor por jogo.
+    """
+    gerador = gerador if gerador is not None else np.random.default_rng()
+    lambdas_casa = np.asarray(lambdas_casa, dtype=float)
+    lambdas_fora = np.asarray(lambdas_fora, dtype=float)
+    total_jogos = len(lambdas_casa)
+    jogos_por_bloco = max(1, int(memoria_maxima // (num_simulacoes * BYTES_POR_SIMULACAO)))
+
+    mercados = {}
+    for inicio in range(0, total_jogos, jogos_por_bloco):
+        fim = min(inicio + jogos_por_bloco, total_jogos)
+        forma = (fim - inicio, num_simulacoes)
+
+        gols_casa_ft = gerador.poisson(lambdas_casa[inicio:fim, None], size=forma).astype(np.int16)
+        gols_fora_ft = gerador.poisson(lambdas_fora[inicio:fim, None], size=forma).astype(np.int16)
+        gols_casa_ht = gerador.binomial(gols_casa_ft, PROPORCAO_GOLS_HT).astype(np.int16)
+        gols_fora_ht = gerador.binomial(gols_fora_ft, PROPORCAO_GOLS_HT).astype(np.int16)
+        total_ht = gols_casa_ht + gols_fora_ht
+        total_ft = gols_casa_ft + gols_fora_ft
+        btts = (gols_casa_ft > 0) & (gols_fora_ft > 0)
+
+        def frequencia(condicao):
+            return np.count_nonzero(condicao, axis=1) / num_simulacoes
+
+        bloco = {
+            'gols_esperados_ht': total_ht.sum(axis=1, dtype=np.int64) / num_simulacoes,
+            'over_05_ht': frequencia(total_ht > 0),
+            'over_15_ht': frequencia(total_ht > 1),
+            'casa_marca_ht': frequencia(gols_casa_ht > 0),
+            'fora_marca_ht': frequencia(gols_fora_ht > 0),
+            'gols_esperados_ft': total_ft.sum(axis=1, dtype=np.int64) / num_simulacoes,
+            'over_05_ft': frequencia(total_ft > 0),
+            'over_15_ft': frequencia(total_ft > 1),
+            'over_25_ft': frequencia(total_ft > 2),
+            'over_35_ft': frequencia(total_ft > 3),
+            'over_45_ft': frequencia(total_ft > 4),
+            'btts': frequencia(btts),
+            'btts_over_25': frequencia(btts & (total_ft > 2)),
+            'casa_marca_15': frequencia(gols_casa_ft > 1),
+            'fora_marca_15': frequencia(gols_fora_ft > 1),
+            'casa_vence': frequencia(gols_casa_ft > gols_fora_ft),
+            'empate': frequencia(gols_casa_ft == gols_fora_ft),
+            'fora_vence': frequencia(gols_casa_ft < gols_fora_ft),
+        }
+        for chave, valores in bloco.items():
+            mercados.setdefault(chave, np.empty(total_jogos))[inicio:fim] = valores
+
+        if progresso:
+            progresso(fim, total_jogos)
+
+    return mercados
+
+
+# 🔥 MONTE CARLO EM PARALELO (POOL DE PROCESSOS NUM SERVIDOR DEDICADO)
+# Os processos recebem só as médias de gols de cada jogo: a base histórica e a tabela de forma
+# ficam no processo principal, onde o cálculo dos lambdas é barato.
+# O pool fica num processo próprio (python -m servidor_monte_carlo): no spawn cada processo do pool
+# importa o __main__ de quem o criou, que assim é sempre o servidor e nunca o script que chamou
+# (no Streamlit, o próprio app.py, que seria reexecutado em cada processo)
+_servidores = {}
+_lock_servidores = threading.Lock()
+
+
+class _ServidorMonteCarlo:
+    """Processo do servidor_monte_carlo com um pool de `processos`; pedidos e respostas em pickle"""
+
+    def __init__(self, processos):
+        self._processo = subprocess.Popen(
+            [sys.executable, '-m', 'servidor_monte_carlo', str(processos)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        # Um pedido por vez (sessões do app podem chamar ao mesmo tempo)
+        self._lock = threading.Lock()
+
+    def simular(self, pedido, progresso=None):
+        with self._lock:
+            try:
+                pickle.dump(pedido, self._processo.stdin)
+                self._processo.stdin.flush()
+                while True:
+                    tipo, *conteudo = pickle.load(self._processo.stdout)
+                    if tipo != 'progresso':
+                        break
+                    if progresso:
+                        progresso(*conteudo)
+            except (EOFError, OSError) as e:
+                raise BrokenProcessPool("servidor do Monte Carlo encerrado") from e
+        if tipo == 'erro':
+            raise conteudo[0]
+        return conteudo[0]
+
+    def encerrar(self):
+        # Fechar a entrada encerra o servidor e o pool; se não sair a tempo, é derrubado
+        try:
+            self._processo.stdin.close()
+            self._processo.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._processo.kill()
+
+
+def _obter_servidor(processos):
+    """Servidor reaproveitado entre chamadas (um por número de processos)"""
+    with _lock_servidores:
+        if processos not in _servidores:
+            _servidores[processos] = _ServidorMonteCarlo(processos)
+        return _servidores[processos]
+
+
+def _descartar_servidor(processos):
+    with _lock_servidores:
+        servidor = _servidores.pop(processos, None)
+    if servidor:
+        servidor.encerrar()
+
+
+def _simular_tarefa(lambdas_casa, lambdas_fora, num_simulacoes, semente):
+    return simular_lote_monte_carlo(lambdas_casa, lambdas_fora, num_simulacoes,
+                                    gerador=np.random.default_rng(semente))
+
+
+def simular_lote_em_pool(pool, lambdas_casa, lambdas_fora, num_simulacoes=NUM_SIMULACOES, semente=None,
+                         jogos_por_tarefa=JOGOS_POR_TAREFA, progresso=None):
+    """simular_lote_monte_carlo com os jogos divididos em tarefas no pool, na mesma ordem (roda no servidor).
+
+    Cada tarefa tem um gerador próprio (SeedSequence(semente).spawn): com semente fixa o
+    resultado é o mesmo para qualquer número de processos. progresso(concluidos, total) é
+    chamado a cada tarefa concluída.
+    """
+    total_jogos = len(lambdas_casa)
+    inicios = range(0, total_jogos, jogos_por_tarefa)
+    sementes = np.random.SeedSequence(semente).spawn(len(inicios))
+
+    mercados, concluidos = {}, 0
+    tarefas = {
+        pool.submit(_simular_tarefa, lambdas_casa[inicio:inicio + jogos_por_tarefa],
+                    lambdas_fora[inicio:inicio + jogos_por_tarefa], num_simulacoes, semente_tarefa): inicio
+        for inicio, semente_tarefa in zip(inicios, sementes)
+    }
+    for tarefa in as_completed(tarefas):
+        inicio = tarefas[tarefa]
+        for chave, valores in tarefa.result().items():
+            mercados.setdefault(chave, np.empty(total_jogos))[inicio:inicio + len(valores)] = valores
+        concluidos += min(jogos_por_tarefa, total_jogos - inicio)
+        if progresso:
+            progresso(concluidos, total_jogos)
+    return mercados
+
+
+def simular_lote_paralelo(lambdas_casa, lambdas_fora, num_simulacoes=NUM_SIMULACOES, semente=None,
+                          processos=None, progresso=None, jogos_por_tarefa=JOGOS_POR_TAREFA):
+    """simular_lote_em_pool no servidor com `processos` processos (iniciado na primeira chamada).
+
+    Com semente fixa o resultado é o mesmo para qualquer número de processos; progresso(concluidos,
+    total) é chamado aqui, a cada tarefa concluída no servidor.
+    """
+    processos = processos or os.cpu_count() or 1
+    pedido = (np.asarray(lambdas_casa, dtype=float), np.asarray(lambdas_fora, dtype=float), num_simulacoes,
+              semente, jogos_por_tarefa)
+    try:
+        return _obter_servidor(processos).simular(pedido, progresso)
+    except BrokenProcessPool:
+        # Servidor ou processo do pool morto (ex.: falta de memória): a próxima chamada inicia outro
+        _descartar_servidor(processos)
+        raise
+
+
+# 🔥 CLASSE ANALISADOR PICO MÁXIMO (INTEGRADA)
+class AnalisadorPicoMaximo:
+    def __init__(self, dados_historicos, motor=MOTOR_PADRAO):
+        if motor not in MOTORES_PICO_MAXIMO:
+            raise ValueError(f"Motor desconhecido: {motor} (use {', '.join(MOTORES_PICO_MAXIMO)})")
+        self.dados = garantir_mercados(garantir_placares(dados_historicos))
+        self.motor = motor
+        self.pesos_progressivos = [0.08, 0.12, 0.16, 0.20, 0.25, 0.35, 0.50, 0.65, 0.80, 0.95]
+        # Métricas da tabela de forma que vêm de mercados (ver mercados.py)
+        self.mercados_forma = {
+            'over_05_ht': 'Over 0.5 HT', 'over_15_ht': 'Over 1.5 HT',
+            'over_05_ft': 'Over 0.5 FT', 'over_15_ft': 'Over 1.5 FT',
+            'over_25_ft': 'Over 2.5 FT', 'over_35_ft': 'Over 3.5 FT',
+            'btts': 'BTTS FT', 'goals_1_5_plus': 'Marca 1.5', 'goals_2_5_plus': 'Marca 2.5',
+        }
+        self._tabelas_forma = {}
+
+    def calcular_estatisticas_avancadas(self, equipe, num_jogos=15):
+        """Estatísticas ponderadas dos últimos jogos da equipe (None se a equipe não tiver jogos)"""
+        return self.estatisticas_equipe(equipe, num_jogos)
+
+    def calcular_tabela_forma(self, num_jogos=15):
+        """Estatísticas ponderadas dos últimos num_jogos de todas as equipes (equipe x métrica)"""
+        if num_jogos not in self._tabelas_forma:
+            self._tabelas_forma[num_jogos] = memorizar(
+                self.dados, 'pico_maximo_tabela', None,
+                (num_jogos, tuple(self.pesos_progressivos), tuple(self.mercados_forma.items())),
+                lambda: self._montar_tabela_forma(num_jogos))
+        return self._tabelas_forma[num_jogos][0]
+
+    def _montar_tabela_forma(self, num_jogos):
+        """Retorna (tabela, dict equipe -> métricas)"""
+        metricas = ['gols_feitos_ht', 'gols_sofridos_ht', 'gols_feitos_ft', 'gols_sofridos_ft',
+                    'over_05_ht', 'over_15_ht', 'over_05_ft', 'over_15_ft', 'over_25_ft', 'over_35_ft',
+                    'btts', 'goals_1_5_plus', 'goals_2_5_plus']
+
+        if any(col not in self.dados.columns for col in ['Casa', 'Fora', 'HT', 'FT']) or self.dados.empty:
+            return pd.DataFrame(columns=metricas, dtype=float), {}
+
+        gols = {coluna: self.dados[coluna].to_numpy(dtype=float)
+                for coluna in ['Gols Casa HT', 'Gols Fora HT', 'Gols Casa FT', 'Gols Fora FT']}
+
+        # Uma linha por (equipe, jogo): perspectiva do mandante + perspectiva do visitante
+        codigos, nomes, fora_distinto = expandir_equipes(self.dados)
+        linhas = np.arange(len(self.dados))
+        posicoes = np.concatenate([linhas, linhas[fora_distinto]])
+        feitos_ht = np.concatenate([gols['Gols Casa HT'], gols['Gols Fora HT'][fora_distinto]])
+        sofridos_ht = np.concatenate([gols['Gols Fora HT'], gols['Gols Casa HT'][fora_distinto]])
+        feitos_ft = np.concatenate([gols['Gols Casa FT'], gols['Gols Fora FT'][fora_distinto]])
+        sofridos_ft = np.concatenate([gols['Gols Fora FT'], gols['Gols Casa FT'][fora_distinto]])
+        em_casa = np.concatenate([np.ones(len(linhas), dtype=bool), np.zeros(fora_distinto.sum(), dtype=bool)])
+
+        ordem = np.lexsort((posicoes, codigos))
+        codigos = codigos[ordem]
+        tamanhos = np.bincount(codigos, minlength=len(nomes))
+        inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+
+        # Posição de cada jogo contada a partir do mais recente (0 = último jogo)
+        do_fim = tamanhos[codigos] - 1 - (np.arange(len(codigos)) - inicios[codigos])
+        manter = do_fim < num_jogos
+        ordem, codigos, do_fim = ordem[manter], codigos[manter], do_fim[manter]
+
+        # Índice dentro da janela (0 = jogo mais antigo), como no enumerate do cálculo por equipe
+        jogos_janela = np.minimum(tamanhos, num_jogos)
+        indice_janela = jogos_janela[codigos] - 1 - do_fim
+        pesos = np.array([self.pesos_progressivos[i] if i < len(self.pesos_progressivos) else 0.1
+                          for i in range(num_jogos)])
+        peso = pesos[indice_janela]
+        pesos_acumulados = np.cumsum(self.pesos_progressivos)
+        denominador = pesos_acumulados[np.minimum(jogos_janela, len(self.pesos_progressivos)) - 1]
+
+        feitos_ht, sofridos_ht = feitos_ht[ordem], sofridos_ht[ordem]
+        feitos_ft, sofridos_ft = feitos_ft[ordem], sofridos_ft[ordem]
+
+        valores = {
+            'gols_feitos_ht': feitos_ht * peso, 'gols_sofridos_ht': sofridos_ht * peso,
+            'gols_feitos_ft': feitos_ft * peso, 'gols_sofridos_ft': sofridos_ft * peso,
+        }
+        # Mercados lidos das colunas calculadas na ingestão (contagem simples, sem peso)
+        for metrica, mercado in self.mercados_forma.items():
+            valores[metrica] = mercado_equipe(self.dados, mercado, em_casa[ordem], posicoes[ordem])
+        tabela = pd.DataFrame({
+            metrica: np.bincount(codigos, weights=valor.astype(float), minlength=len(nomes)) / denominador
+            for metrica, valor in valores.items()
+        }, index=pd.Index(nomes, name='Equipe'))
+
+        return tabela, tabela.to_dict('index')
+
+    def estatisticas_equipe(self, equipe, num_jogos=15):
+        """Linha da tabela de forma da equipe (None se a equipe não tiver jogos)"""
+        self.calcular_tabela_forma(num_jogos)
+        return self._tabelas_forma[num_jogos][1].get(equipe)
+
+    def calcular_lambdas(self, stats_casa, stats_fora):
+        """Médias de gols FT (casa, fora) usadas pelos dois motores de probabilidade"""
+        lambda_casa_ft = max(0.1, (stats_casa['gols_feitos_ft'] * 0.6 + stats_fora['gols_sofridos_ft'] * 0.4))
+        lambda_fora_ft = max(0.1, (stats_fora['gols_feitos_ft'] * 0.6 + stats_casa['gols_sofridos_ft'] * 0.4))
+
+        fator_casa = 1.15
+        lambda_casa_ft *= fator_casa
+        lambda_fora_ft *= 0.85
+        return lambda_casa_ft, lambda_fora_ft
+
+    def simular_jogo_monte_carlo(self, stats_casa, stats_fora, num_simulacoes=50000):
+        if not stats_casa or not stats_fora:
+            return None
+
+        lambda_casa_ft, lambda_fora_ft = self.calcular_lambdas(stats_casa, stats_fora)
+
+        try:
+            gols_casa_ft = poisson.rvs(mu=lambda_casa_ft, size=num_simulacoes)
+            gols_fora_ft = poisson.rvs(mu=lambda_fora_ft, size=num_simulacoes)
+
+            gols_ht_casa = np.random.binomial(gols_casa_ft, PROPORCAO_GOLS_HT, size=num_simulacoes)
+            gols_ht_fora = np.random.binomial(gols_fora_ft, PROPORCAO_GOLS_HT, size=num_simulacoes)
+
+            resultados = {
+                'gols_ht_casa': gols_ht_casa, 'gols_ht_fora': gols_ht_fora,
+                'gols_ft_casa': gols_casa_ft, 'gols_ft_fora': gols_fora_ft,
+                'total_ht': gols_ht_casa + gols_ht_fora, 'total_ft': gols_casa_ft + gols_fora_ft
+            }
+
+            return resultados
+        except:
+            return None
+
+    def calcular_mercados_analiticos(self, stats_casa, stats_fora):
+        """Mesmos mercados de simular_lote_monte_carlo, calculados de forma exata (sem sorteio).
+
+        Gols FT ~ Poisson(lambda) independentes por equipe; o HT é o afinamento binomial (0.4)
+        do FT, ou seja, Poisson(0.4 * lambda). As distribuições FT são truncadas onde a cauda
+        restante fica abaixo de ~1e-12.
+        """
+        if not stats_casa or not stats_fora:
+            return None
+
+        lambda_casa_ft, lambda_fora_ft = self.calcular_lambdas(stats_casa, stats_fora)
+        maior = max(lambda_casa_ft, lambda_fora_ft)
+        max_gols = int(maior + 12 * np.sqrt(maior)) + 12
+
+        # Placares FT: P(casa = i) e P(fora = j); a matriz de placares é o produto externo das duas
+        p_casa_ft = _pmf_poisson(lambda_casa_ft, max_gols)
+        p_fora_ft = _pmf_poisson(lambda_fora_ft, max_gols)
+        acumulado_total_ft = np.cumsum(np.convolve(p_casa_ft, p_fora_ft)[:5])
+        acumulado_fora_ft = np.cumsum(p_fora_ft)
+
+        # HT: só P(0) e P(1) de cada Poisson afinado são necessários
+        media_casa_ht = lambda_casa_ft * PROPORCAO_GOLS_HT
+        media_fora_ht = lambda_fora_ft * PROPORCAO_GOLS_HT
+        media_total_ht = media_casa_ht + media_fora_ht
+        zero_total_ht = np.exp(-media_total_ht)
+
+        btts = (1 - p_casa_ft[0]) * (1 - p_fora_ft[0])
+        casa_vence = float(np.dot(p_casa_ft[1:], acumulado_fora_ft[:-1]))
+        empate = float(np.dot(p_casa_ft, p_fora_ft))
+        return {
+            'gols_esperados_ht': media_total_ht,
+            'over_05_ht': 1 - zero_total_ht,
+            'over_15_ht': 1 - zero_total_ht * (1 + media_total_ht),
+            'casa_marca_ht': 1 - np.exp(-media_casa_ht),
+            'fora_marca_ht': 1 - np.exp(-media_fora_ht),
+            'gols_esperados_ft': lambda_casa_ft + lambda_fora_ft,
+            'over_05_ft': 1 - acumulado_total_ft[0],
+            'over_15_ft': 1 - acumulado_total_ft[1],
+            'over_25_ft': 1 - acumulado_total_ft[2],
+            'over_35_ft': 1 - acumulado_total_ft[3],
+            'over_45_ft': 1 - acumulado_total_ft[4],
+            'btts': btts,
+            # BTTS com até 2 gols só acontece no 1-1
+            'btts_over_25': btts - p_casa_ft[1] * p_fora_ft[1],
+            'casa_marca_15': 1 - p_casa_ft[0] - p_casa_ft[1],
+            'fora_marca_15': 1 - p_fora_ft[0] - p_fora_ft[1],
+            'casa_vence': casa_vence,
+            'empate': empate,
+            'fora_vence': 1 - casa_vence - empate,
+        }
+
+    def calcular_probabilidades_pico_maximo(self, casa, fora, motor=None, semente=None):
+        return self.calcular_probabilidades_lote([(casa, fora)], motor=motor, semente=semente)[0]
+
+    def calcular_probabilidades_lote(self, confrontos, motor=None, num_simulacoes=NUM_SIMULACOES,
+                                     semente=None, progresso=None, processos=1):
+        """Probabilidades de uma lista de confrontos (casa, fora), na mesma ordem.
+
+        Confrontos sem histórico de alguma das equipes ficam como None. No Monte Carlo todos os
+        jogos são simulados juntos (simular_lote_monte_carlo), ou divididos entre processos
+        (simular_lote_paralelo) com processos > 1; progresso(concluidos, total) é chamado a cada
+        bloco. Resultados reproduzíveis (motor analítico ou semente fixa) são memorizados para a
+        versão da base.
+        """
+        motor = motor or self.motor
+        confrontos = [tuple(confronto) for confronto in confrontos]
+        # O motor analítico é exato e rápido: só o Monte Carlo vai para os processos
+        paralelo = motor != 'analitico' and (processos or 1) > 1
+        processos = processos if paralelo else 1
+        with rastreador.span('pico_maximo.lote', motor=motor, confrontos=len(confrontos), processos=processos):
+            if motor != 'analitico' and semente is None:
+                return self._calcular_probabilidades_lote(confrontos, motor, num_simulacoes, semente, progresso,
+                                                          processos)
+
+            resultados = memorizar(
+                self.dados, 'pico_maximo_lote', tuple(confrontos),
+                (motor, num_simulacoes, semente, paralelo, tuple(self.pesos_progressivos),
+                 tuple(self.mercados_forma.items())),
+                lambda: self._calcular_probabilidades_lote(confrontos, motor, num_simulacoes, semente, progresso,
+                                                           processos))
+        if progresso:
+            progresso(len(confrontos), len(confrontos))
+        return resultados
+
+    def _calcular_probabilidades_lote(self, confrontos, motor, num_simulacoes, semente, progresso, processos=1):
+        resultados = [None] * len(confrontos)
+
+        validos, lambdas = [], []
+        for posicao, (casa, fora) in enumerate(confrontos):
+            stats_casa = self.estatisticas_equipe(casa)
+            stats_fora = self.estatisticas_equipe(fora)
+            if stats_casa and stats_fora:
+                validos.append(posicao)
+                lambdas.append((stats_casa, stats_fora))
+
+        if not validos:
+            if progresso:
+                progresso(0, 0)
+            return resultados
+
+        if motor == 'analitico':
+            mercados_jogos = [self.calcular_mercados_analiticos(stats_casa, stats_fora)
+                              for stats_casa, stats_fora in lambdas]
+            if progresso:
+                progresso(len(validos), len(validos))
+        else:
+            lambdas_casa, lambdas_fora = zip(*(self.calcular_lambdas(stats_casa, stats_fora)
+                                               for stats_casa, stats_fora in lambdas))
+            if processos > 1:
+                mercados = simular_lote_paralelo(lambdas_casa, lambdas_fora, num_simulacoes, semente, processos,
+                                                 progresso)
+            else:
+                mercados = simular_lote_monte_carlo(lambdas_casa, lambdas_fora, num_simulacoes,
+                                                    gerador=np.random.default_rng(semente), progresso=progresso)
+            mercados_jogos = [{chave: valores[i] for chave, valores in mercados.items()}
+                              for i in range(len(validos))]
+
+        for posicao, mercados_jogo in zip(validos, mercados_jogos):
+            resultados[posicao] = self.calibrar_probabilidades(mercados_jogo)
+        return resultados
+
+    def calibrar_probabilidades(self, mercados):
+        """Converte as frequências dos mercados nas probabilidades exibidas (com os limites de cada mercado)"""
+        if not mercados:
+            return None
+
+        prob = {}
+
+        try:
+            # MERCADOS HT
+            prob['Gols Esperados HT'] = mercados['gols_esperados_ht']
+            prob['Over 0.5 HT'] = max(60, min(95, mercados['over_05_ht'] * 100 * 1.08))
+            prob['Over 1.5 HT'] = max(40, min(85, mercados['over_15_ht'] * 100 * 1.06))
+            prob['Casa Marca HT'] = max(50, min(90, mercados['casa_marca_ht'] * 100 * 1.05))
+            prob['Fora Marca HT'] = max(45, min(85, mercados['fora_marca_ht'] * 100 * 1.05))
+
+            # MERCADOS FT
+            prob['Gols Esperados FT'] = mercados['gols_esperados_ft']
+            prob['Over 0.5 FT'] = max(85, min(99, mercados['over_05_ft'] * 100 * 1.02))
+            prob['Over 1.5 FT'] = max(70, min(95, mercados['over_15_ft'] * 100 * 1.04))
+            prob['Over 2.5 FT'] = max(50, min(90, mercados['over_25_ft'] * 100 * 1.05))
+            prob['Over 3.5 FT'] = max(25, min(75, mercados['over_35_ft'] * 100 * 1.06))
+            prob['Over 4.5 FT'] = max(10, min(50, mercados['over_45_ft'] * 100 * 1.08))
+
+            # BTTS
+            btts_prob = mercados['btts'] * 100
+            prob['BTTS FT'] = max(40, min(85, btts_prob * 1.07))
+
+            # BTTS & Over 2.5
+            btts_over25_prob = mercados['btts_over_25'] * 100
+            prob['BTTS & Over 2.5'] = max(25, min(70, btts_over25_prob * 1.08))
+
+            # Equipe marca 1.5+
+            prob['Casa Marca 1.5'] = max(30, min(80, mercados['casa_marca_15'] * 100 * 1.09))
+            prob['Fora Marca 1.5'] = max(25, min(70, mercados['fora_marca_15'] * 100 * 1.09))
+
+            # Probabilidades básicas para vitória/empate
+            prob['Casa Vence'] = mercados['casa_vence'] * 100
+            prob['Empate'] = mercados['empate'] * 100
+            prob['Fora Vence'] = mercados['fora_vence'] * 100
+
+            return prob
+        except Exception:
+            return None
+
+
+# 🔥 CLASSE PARA DICAS ESTATÍSTICAS - ATUALIZADA
+class AnalisadorDicasEstatisticas:
+    def __init__(self, dados_historicos):
+        self.dados = garantir_mercados(garantir_placares(dados_historicos))
+        self.mercados_config = {
+            'Over 0.5 HT': {'nome': 'Over 0.5 HT', 'icone': '⚡', 'limite': 75, 'tipo': 'over_ht', 'linha': 0.5},
+            'Over 1.5 HT': {'nome': 'Over 1.5 HT', 'icone': '⚡', 'limite': 45, 'tipo': 'over_ht', 'linha': 1.5},
+            'Over 0.5 FT': {'nome': 'Over 0.5 FT', 'icone': '🎯', 'limite': 85, 'tipo': 'over_ft', 'linha': 0.5},
+            'Over 1.5 FT': {'nome': 'Over 1.5 FT', 'icone': '🎯', 'limite': 70, 'tipo': 'over_ft', 'linha': 1.5},
+            'Over 2.5 FT': {'nome': 'Over 2.5 FT', 'icone': '🎯', 'limite': 55, 'tipo': 'over_ft', 'linha': 2.5},
+            'Over 3.5 FT': {'nome': 'Over 3.5 FT', 'icone': '🎯', 'limite': 35, 'tipo': 'over_ft', 'linha': 3.5},
+            'BTTS FT': {'nome': 'BTTS FT', 'icone': '🔀', 'limite': 60, 'tipo': 'btts', 'linha': None},
+            'BTTS & Over 2.5': {'nome': 'BTTS & Over 2.5', 'icone': '🔥', 'limite': 45, 'tipo': 'combinado',
+                                'linha': None},
+            'Casa Marca 1.5': {'nome': 'Casa Marca 1.5+', 'icone': '🏠', 'limite': 50, 'tipo': 'equipe_ataque',
+                               'linha': 1.5},
+            'Fora Marca 1.5': {'nome': 'Fora Marca 1.5+', 'icone': '✈️', 'limite': 40, 'tipo': 'equipe_ataque',
+                               'linha': 1.5},
+            'Casa Vence': {'nome': 'Vitória Casa', 'icone': '🏠', 'limite': 65, 'tipo': 'resultado', 'linha': None},
+            'Fora Vence': {'nome': 'Vitória Fora', 'icone': '✈️', 'limite': 55, 'tipo': 'resultado', 'linha': None}
+        }
+        # Estatística da equipe -> mercado em mercados.py
+        self.mercados_estatisticas = {
+            'Casa Vence': 'Vence em Casa', 'Fora Vence': 'Vence Fora',
+            'Over 0.5 HT': 'Over 0.5 HT', 'Over 1.5 HT': 'Over 1.5 HT',
+            'Over 0.5 FT': 'Over 0.5 FT', 'Over 1.5 FT': 'Over 1.5 FT',
+            'Over 2.5 FT': 'Over 2.5 FT', 'Over 3.5 FT': 'Over 3.5 FT',
+            'BTTS FT': 'BTTS FT', 'BTTS & Over 2.5': 'BTTS & Over 2.5',
+            'Casa Marca 1.5': 'Marca 1.5 em Casa', 'Fora Marca 1.5': 'Marca 1.5 Fora',
+        }
+
+    @cronometrar('dicas.jogo')
+    def gerar_dicas_jogo(self, casa, fora, mercado_filtro=None):
+        """Gera dicas estatísticas para um jogo específico com filtro por mercado"""
+        stats_casa = self.calcular_estatisticas_equipe(casa)
+        stats_fora = self.calcular_estatisticas_equipe(fora)
+
+        if not stats_casa or not stats_fora:
+            return []
+
+        dicas = []
+
+        # Filtrar mercados se especificado
+        mercados_para_analisar = self.mercados_config
+        if mercado_filtro and mercado_filtro != "Todos":
+            mercados_para_analisar = {k: v for k, v in self.mercados_config.items()
+                                      if v['nome'] == mercado_filtro}
+
+        # Calcular probabilidades combinadas
+        for mercado, config in mercados_para_analisar.items():
+            prob_casa = stats_casa.get(mercado, 0)
+            prob_fora = stats_fora.get(mercado, 0)
+
+            # Média ponderada considerando força das equipes
+            probabilidade_combinada = (prob_casa * 0.6 + prob_fora * 0.4)
+
+            if probabilidade_combinada >= config['limite']:
+                dicas.append({
+                    'mercado': config['nome'],
+                    'icone': config['icone'],
+                    'probabilidade': probabilidade_combinada,
+                    'casa_percent': prob_casa,
+                    'fora_percent': prob_fora,
+                    'tipo': config['tipo'],
+                    'linha': config['linha']
+                })
+
+        # 🔥 SELEÇÃO INTELIGENTE - Evitar mercados redundantes
+        dicas_filtradas = self._filtrar_mercados_redundantes(dicas)
+
+        # Ordenar por probabilidade (maior primeiro)
+        dicas_filtradas.sort(key=lambda x: x['probabilidade'], reverse=True)
+        return dicas_filtradas
+
+    def _filtrar_mercados_redundantes(self, dicas):
+        """Filtra mercados redundantes, mantendo apenas a linha mais alta"""
+        if not dicas:
+            return []
+
+        # Agrupar por tipo de mercado
+        mercados_por_tipo = {}
+        for dica in dicas:
+            tipo = dica['tipo']
+            if tipo not in mercados_por_tipo:
+                mercados_por_tipo[tipo] = []
+            mercados_por_tipo[tipo].append(dica)
+
+        dicas_finais = []
+
+        # Para cada tipo, manter apenas o mercado com linha mais alta
+        for tipo, mercados in mercados_por_tipo.items():
+            if tipo in ['over_ht', 'over_ft']:
+                # Para mercados Over, manter apenas o com linha mais alta
+                mercado_maior_linha = max(mercados, key=lambda x: x['linha'] if x['linha'] else 0)
+                dicas_finais.append(mercado_maior_linha)
+            else:
+                # Para outros tipos, manter todos
+                dicas_finais.extend(mercados)
+
+        return dicas_finais
+
+    def calcular_estatisticas_equipe(self, equipe, num_jogos=10):
+        """Calcula estatísticas recentes de uma equipe"""
+        return memorizar(self.dados, 'dicas', equipe, num_jogos,
+                         lambda: self._calcular_estatisticas_equipe(equipe, num_jogos))
+
+    def _calcular_estatisticas_equipe(self, equipe, num_jogos):
+        posicoes = obter_indice_equipes(self.dados).posicoes(equipe, ultimos=num_jogos)
+
+        if len(posicoes) == 0:
+            return None
+
+        em_casa = self.dados['Casa'].iloc[posicoes].to_numpy() == equipe
+        total_jogos = len(posicoes)
+
+        # Percentual de jogos em que o mercado bateu (mercados da equipe: ver MERCADOS_EQUIPE)
+        stats = {}
+        for chave, mercado in self.mercados_estatisticas.items():
+            acertos = int(np.count_nonzero(mercado_equipe(self.dados, mercado, em_casa, posicoes)))
+            stats[chave] = (acertos / total_jogos) * 100
+        stats['total_jogos'] = total_jogos
+
+        return stats
+
+
+def _chave_cronologica(dados):
+    """Data Jogo como int64 para ordenar (sem data: antes de todos; sem a coluna: ordem das linhas)"""
+    if 'Data Jogo' not in dados.columns:
+        return np.zeros(len(dados), dtype=np.int64)
+    return dados['Data Jogo'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+# 🔥 CLASSE PARA ALERTAS INTELIGENTES - COMPLETA E CORRIGIDA
+class AnalisadorAlertasInteligentes:
+    def __init__(self, dados_historicos):
+        self.dados = garantir_mercados(garantir_placares(dados_historicos))
+        self.mercados = {
+            'Vitorias': {'nome': 'Vitórias', 'icone': '✅', 'tipo': 'vitoria'},
+            'Derrotas': {'nome': 'Derrotas', 'icone': '❌', 'tipo': 'derrota'},
+            'Over 0.5 HT': {'nome': 'Over 0.5 HT', 'icone': '⚡', 'tipo': 'over_ht', 'linha': 0.5},
+            'Over 1.5 HT': {'nome': 'Over 1.5 HT', 'icone': '⚡', 'tipo': 'over_ht', 'linha': 1.5},
+            'BTTS HT': {'nome': 'BTTS HT', 'icone': '🔀', 'tipo': 'btts_ht'},
+            'Over 1.5 FT': {'nome': 'Over 1.5 FT', 'icone': '🎯', 'tipo': 'over_ft', 'linha': 1.5},
+            'Over 2.5 FT': {'nome': 'Over 2.5 FT', 'icone': '🎯', 'tipo': 'over_ft', 'linha': 2.5},
+            'Over 3.5 FT': {'nome': 'Over 3.5 FT', 'icone': '🎯', 'tipo': 'over_ft', 'linha': 3.5},
+            'BTTS FT': {'nome': 'BTTS FT', 'icone': '🔀', 'tipo': 'btts_ft'},
+            'Casa Marca 1.5': {'nome': 'Casa Marca 1.5+', 'icone': '🏠', 'tipo': 'equipe_ataque', 'linha': 1.5},
+            'Fora Marca 1.5': {'nome': 'Fora Marca 1.5+', 'icone': '✈️', 'tipo': 'equipe_ataque', 'linha': 1.5}
+        }
+
+    def gerar_ranking_mercado(self, mercado, competicao=None):
+        """Gera ranking completo para um mercado específico"""
+        with rastreador.span('alertas.ranking', mercado=mercado):
+            return memorizar(self.dados, 'alertas_ranking', competicao, mercado,
+                             lambda: self._gerar_ranking_mercado(mercado, competicao))
+
+    def _gerar_ranking_mercado(self, mercado, competicao):
+        """Ligas e equipes em uma única passada agrupada (mesmos resultados do cálculo por equipe)"""
+        dados = self.dados
+        mercado_ht = usa_ht(mercado)
+
+        # Para mercados HT, exigir pelo menos 3 jogos com dados HT válidos
+        min_jogos = 3 if mercado_ht else 5
+
+        # Para mercados HT, considerar apenas jogos com dados HT válidos
+        validos = dados['HT Válido'].to_numpy(dtype=bool) if mercado_ht else np.ones(len(dados), dtype=bool)
+
+        # Calcular estatísticas das ligas
+        acertos_liga = mercado_equipe(dados, mercado, np.ones(len(dados), dtype=bool))
+        if acertos_liga is None:
+            acertos_liga = np.zeros(len(dados), dtype=bool)
+
+        resumo_ligas = pd.DataFrame({
+            'Liga': dados['Competição'].to_numpy(),
+            'jogos': validos,
+            'acertos': acertos_liga & validos
+        }).groupby('Liga', sort=False).sum()
+
+        ranking_ligas = []
+        for liga, total_jogos_liga, acertos in zip(resumo_ligas.index, resumo_ligas['jogos'], resumo_ligas['acertos']):
+            total_jogos_liga, acertos = int(total_jogos_liga), int(acertos)
+            taxa_liga = (acertos / total_jogos_liga * 100) if total_jogos_liga > 0 else 0
+
+            if total_jogos_liga >= min_jogos:
+                ranking_ligas.append({
+                    'Liga': liga,
+                    'Taxa': taxa_liga,
+                    'Jogos': total_jogos_liga,
+                    '_taxa_num': taxa_liga
+                })
+
+        # Ordenar ligas por taxa
+        ranking_ligas.sort(key=lambda x: x['_taxa_num'], reverse=True)
+
+        # Uma linha por (equipe, jogo): mandante e visitante
+        codigos, equipes, fora_distinto = expandir_equipes(dados)
+        linhas = np.arange(len(dados))
+        posicoes = np.concatenate([linhas, linhas[fora_distinto]])
+        em_casa = np.concatenate([np.ones(len(dados), dtype=bool), np.zeros(fora_distinto.sum(), dtype=bool)])
+
+        # Dentro de cada equipe, ordem cronológica (data e, no mesmo dia, posição da linha)
+        manter = codigos >= 0
+        ordem = np.lexsort((posicoes[manter], _chave_cronologica(dados)[posicoes[manter]], codigos[manter]))
+        codigos = codigos[manter][ordem]
+        posicoes = posicoes[manter][ordem]
+        em_casa = em_casa[manter][ordem]
+        num_equipes = len(equipes)
+
+        acertos_jogo = mercado_equipe(dados, mercado, em_casa, posicoes)
+        if acertos_jogo is None:
+            return [], ranking_ligas
+        validos_jogo = validos[posicoes]
+
+        jogos_validos = np.bincount(codigos, weights=validos_jogo, minlength=num_equipes).astype(int)
+        acertos_equipe = np.bincount(codigos, weights=acertos_jogo & validos_jogo, minlength=num_equipes).astype(int)
+
+        # Últimos 5: os 5 jogos válidos mais recentes, do mais novo para o mais antigo
+        cod_validos = codigos[validos_jogo]
+        acertos_validos = acertos_jogo[validos_jogo]
+        fim_equipe = np.cumsum(np.bincount(cod_validos, minlength=num_equipes))
+        recencia = fim_equipe[cod_validos] - 1 - np.arange(len(cod_validos))
+        recentes = recencia < 5
+        ultimos_5 = np.full((num_equipes, 5), '⚫', dtype=object)
+        ultimos_5[cod_validos[recentes], recencia[recentes]] = np.where(acertos_validos[recentes], '🟢', '🔴')
+
+        # Liga da equipe: competição mais frequente entre todos os seus jogos (empate -> menor nome, como mode())
+        ligas_jogo = dados['Competição'].to_numpy()[posicoes]
+        contagem = pd.DataFrame({'codigo': codigos, 'Liga': ligas_jogo}).dropna()
+        contagem = contagem.groupby(['codigo', 'Liga']).size().reset_index(name='n')
+        contagem = contagem.sort_values(['codigo', 'n', 'Liga'], ascending=[True, False, True], kind='stable')
+        mais_frequente = contagem.drop_duplicates('codigo')
+        liga_equipe = dict(zip(mais_frequente['codigo'], mais_frequente['Liga']))
+
+        # Calcular estatísticas das equipes
+        resultados_equipes = []
+        for codigo, equipe in enumerate(equipes):
+            total_jogos = int(jogos_validos[codigo])
+
+            # MÍNIMO DE JOGOS ajustado para mercados HT
+            if total_jogos < min_jogos or codigo not in liga_equipe:
+                continue
+
+            taxa = int(acertos_equipe[codigo]) / total_jogos * 100
+            liga = liga_equipe[codigo]
+
+            # Se filtro por competição, filtrar equipes
+            if competicao and competicao != "Todas":
+                if liga != competicao:
+                    continue
+
+            resultados_equipes.append({
+                'Equipe': equipe,
+                'Liga': liga,
+                'Jogos': total_jogos,
+                'Acertos': int((taxa / 100) * total_jogos),
+                'Taxa': taxa,
+                'Últimos 5': ' '.join(ultimos_5[codigo]),
+                '_taxa_num': taxa
+            })
+
+        # Ordenar equipes por taxa
+        resultados_equipes.sort(key=lambda x: x['_taxa_num'], reverse=True)
+
+        return resultados_equipes, ranking_ligas
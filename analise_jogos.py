@@ -0,0 +1,139 @@
+import logging
+
+import pandas as pd
+
+from analisadores import MOTOR_PADRAO, AnalisadorPicoMaximo
+from base_historica import preparar_base_historica, preparar_jogos
+from rastreamento import cronometrar
+
+logger = logging.getLogger(__name__)
+
+# 🔥 ANÁLISE DOS JOGOS SEM DEPENDER DO STREAMLIT (USADA PELO APP E PELA CLI)
+
+# Semente do Monte Carlo (mesmos números a cada execução enquanto a base não mudar)
+SEMENTE_MONTE_CARLO = 2024
+
+# Colunas do Pico Máximo -> (chave do resultado do analisador, formato do texto exibido)
+FORMATOS_PICO_MAXIMO = {
+    'Casa Vence': ('Casa Vence', "{:.1f}%"),
+    'Empate': ('Empate', "{:.1f}%"),
+    'Fora Vence': ('Fora Vence', "{:.1f}%"),
+    'Gols HT': ('Gols Esperados HT', "{:.2f}"),
+    'Over 0.5 HT': ('Over 0.5 HT', "{:.1f}%"),
+    'Over 1.5 HT': ('Over 1.5 HT', "{:.1f}%"),
+    'Casa Marca HT': ('Casa Marca HT', "{:.1f}%"),
+    'Fora Marca HT': ('Fora Marca HT', "{:.1f}%"),
+    'Gols FT': ('Gols Esperados FT', "{:.2f}"),
+    'Over 0.5 FT': ('Over 0.5 FT', "{:.1f}%"),
+    'Over 1.5 FT': ('Over 1.5 FT', "{:.1f}%"),
+    'Over 2.5 FT': ('Over 2.5 FT', "{:.1f}%"),
+    'Over 3.5 FT': ('Over 3.5 FT', "{:.1f}%"),
+    'Over 4.5 FT': ('Over 4.5 FT', "{:.1f}%"),
+    'Casa Marca 1.5': ('Casa Marca 1.5', "{:.1f}%"),
+    'Fora Marca 1.5': ('Fora Marca 1.5', "{:.1f}%"),
+    'Btts FT': ('BTTS FT', "{:.1f}%"),
+    'Btts & Over 2.5': ('BTTS & Over 2.5', "{:.1f}%")
+}
+
+
+@cronometrar('base.preparar')
+def preparar_bases(df, referencia=None):
+    """Remove adiados (pp.), decodifica placares e datas e monta a base histórica. Retorna (df, base_historica)"""
+    df = preparar_jogos(df, referencia)
+    return df, preparar_base_historica(df)
+
+
+# 🔥 JANELA DE DIAS A PARTIR DE HOJE (COMPARAÇÃO DE DATAS, SEM MONTAR TEXTOS)
+def jogos_proximos_dias(df, dias, referencia=None):
+    """Jogos ainda não realizados (HT vazio) nos próximos `dias` dias, a partir de hoje"""
+    inicio = pd.Timestamp(referencia if referencia is not None else pd.Timestamp.now()).normalize()
+    df_jogos = df[df['HT'].isna() | (df['HT'] == '')]
+    data_jogo = df_jogos['Data Jogo']
+    return df_jogos[(data_jogo >= inicio) & (data_jogo < inicio + pd.Timedelta(days=dias))]
+
+
+# 🔥 FUNÇÃO PARA ADICIONAR ANÁLISE PICO MÁXIMO AOS JOGOS
+def adicionar_analise_pico_maximo(df_jogos, base_historica, motor=MOTOR_PADRAO, analisador=None,
+                                  semente=SEMENTE_MONTE_CARLO, progresso=None, processos=1):
+    """Adiciona as colunas de probabilidade do Pico Máximo (texto formatado) aos jogos com colunas Casa/Fora.
+
+    progresso(concluidos, total) é repassado para a simulação em lote; com processos > 1 o
+    Monte Carlo é dividido entre processos.
+    """
+    if df_jogos.empty or base_historica.empty:
+        return df_jogos
+
+    if analisador is None:
+        analisador = AnalisadorPicoMaximo(base_historica, motor=motor)
+    novas_colunas = []
+
+    if len(df_jogos) > 0:
+        # Todos os confrontos de uma vez (Monte Carlo em lote)
+        confrontos = list(zip(df_jogos['Casa'], df_jogos['Fora']))
+        try:
+            lote_probabilidades = analisador.calcular_probabilidades_lote(
+                confrontos, semente=semente, progresso=progresso, processos=processos)
+        except Exception:
+            logger.exception("Falha no cálculo em lote do Pico Máximo (%d processos)", processos)
+            lote_probabilidades = None
+
+        if lote_probabilidades is None and processos > 1:
+            # Pool quebrado (ex.: processo morto): refaz no próprio processo
+            try:
+                lote_probabilidades = analisador.calcular_probabilidades_lote(
+                    confrontos, semente=semente, progresso=progresso, processos=1)
+            except Exception:
+                logger.exception("Falha no cálculo em lote do Pico Máximo (1 processo)")
+
+        if lote_probabilidades is None:
+            # Dict vazio: cada jogo cai no tratamento de erro abaixo
+            lote_probabilidades = [{} for _ in confrontos]
+
+        for probabilidades in lote_probabilidades:
+            try:
+                if probabilidades is not None:
+                    resultado_jogo = {coluna: formato.format(probabilidades[chave])
+                                      for coluna, (chave, formato) in FORMATOS_PICO_MAXIMO.items()}
+                    novas_colunas.append(resultado_jogo)
+                else:
+                    novas_colunas.append(dict.fromkeys(FORMATOS_PICO_MAXIMO, "-"))
+
+            except Exception:
+                novas_colunas.append(dict.fromkeys(FORMATOS_PICO_MAXIMO, "Erro"))
+
+    if novas_colunas:
+        df_com_analise = df_jogos.copy()
+        for coluna in novas_colunas[0].keys():
+            df_com_analise[coluna] = [jogo[coluna] for jogo in novas_colunas]
+
+        return df_com_analise
+
+    return df_jogos
+
+
+# 🔥 DICAS ESTATÍSTICAS DOS JOGOS
+def gerar_dicas_jogos(df_jogos, analisador_dicas, mercado=None, probabilidade_minima=70, progresso=None):
+    """Dicas de cada jogo (colunas Time Casa/Time Visitante) acima da probabilidade mínima"""
+    jogos_com_dicas = []
+    total_jogos = len(df_jogos)
+
+    for posicao, (data, liga, casa, fora) in enumerate(zip(df_jogos['Data'], df_jogos['Competição'],
+                                                           df_jogos['Time Casa'], df_jogos['Time Visitante'])):
+        dicas = analisador_dicas.gerar_dicas_jogo(casa, fora, mercado if mercado != "Todos" else None)
+
+        # Filtrar por probabilidade mínima
+        dicas_filtradas = [dica for dica in dicas if dica['probabilidade'] >= probabilidade_minima]
+
+        if dicas_filtradas:
+            jogos_com_dicas.append({
+                'data': data,
+                'liga': liga,
+                'casa': casa,
+                'fora': fora,
+                'dicas': dicas_filtradas
+            })
+
+        if progresso:
+            progresso(posicao + 1, total_jogos)
+
+    return jogos_com_dicas
@@ -1,1029 +1,56 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import concurrent.futures
-from datetime import datetime, timedelta
-import re
 import numpy as np
-from scipy.stats import poisson
+import pandas as pd
+from datetime import datetime
+import os
+import time
 import warnings
+from armazenamento import (carregar_jogos, salvar_jogos, idade_dados_segundos, idades_coletas, registrar_verificacao,
+                           versao_dados)
+from snapshots import carregar_snapshot, snapshot_atual
+from cache_http import TTL_PADRAO, cache_html
+from rastreamento import rastreador
+from exportacao import csv_sob_demanda
+from coleta import extrair_competicoes_incrementais, extrair_todas_competicoes
+from base_historica import limpar_ht_coluna, rotulo_mes
+from analisadores import AnalisadorPicoMaximo, AnalisadorDicasEstatisticas, AnalisadorAlertasInteligentes
+from analise_jogos import (SEMENTE_MONTE_CARLO, adicionar_analise_pico_maximo, gerar_dicas_jogos, jogos_proximos_dias,
+                           preparar_bases)
 
 warnings.filterwarnings('ignore')
 
+# Tempo (em segundos) que a base local é servida sem nova coleta: o mesmo TTL das páginas em cache,
+# para uma página salva nunca vencer antes da base que veio dela
+TTL_BASE_LOCAL = TTL_PADRAO
 
-# 🔥 CLASSE ANALISADOR PICO MÁXIMO (INTEGRADA)
-class AnalisadorPicoMaximo:
-    def __init__(self, dados_historicos):
-        self.dados = dados_historicos
-        self.pesos_progressivos = [0.08, 0.12, 0.16, 0.20, 0.25, 0.35, 0.50, 0.65, 0.80, 0.95]
-
-    def calcular_estatisticas_avancadas(self, equipe, num_jogos=15):
-        colunas_necessarias = ['Casa', 'Fora', 'HT', 'FT']
-        colunas_existentes = [col for col in colunas_necessarias if col in self.dados.columns]
-
-        if len(colunas_existentes) < 4:
-            return None
-
-        jogos_equipe = self.dados[
-            (self.dados['Casa'] == equipe) | (self.dados['Fora'] == equipe)
-            ].tail(num_jogos)
-
-        if len(jogos_equipe) == 0:
-            return None
-
-        estatisticas = {
-            'gols_feitos_ht': [], 'gols_sofridos_ht': [], 'gols_feitos_ft': [], 'gols_sofridos_ft': [],
-            'over_05_ht': [], 'over_15_ht': [], 'over_05_ft': [], 'over_15_ft': [],
-            'over_25_ft': [], 'over_35_ft': [], 'btts': [], 'goals_1_5_plus': [], 'goals_2_5_plus': [],
-        }
-
-        for i, (idx, jogo) in enumerate(jogos_equipe.iterrows()):
-            peso = self.pesos_progressivos[i] if i < len(self.pesos_progressivos) else 0.1
-            is_casa = jogo['Casa'] == equipe
-
-            # Extrair gols do HT e FT
-            gols_casa_ht, gols_fora_ht = self.extrair_gols_ht(jogo['HT'])
-            gols_casa_ft, gols_fora_ft = self.extrair_gols_ft(jogo['FT'])
-
-            if is_casa:
-                gols_feitos_ht = gols_casa_ht
-                gols_sofridos_ht = gols_fora_ht
-                gols_feitos_ft = gols_casa_ft
-                gols_sofridos_ft = gols_fora_ft
-            else:
-                gols_feitos_ht = gols_fora_ht
-                gols_sofridos_ht = gols_casa_ht
-                gols_feitos_ft = gols_fora_ft
-                gols_sofridos_ft = gols_casa_ft
-
-            try:
-                gols_feitos_ht = float(gols_feitos_ht) if pd.notna(gols_feitos_ht) else 0
-                gols_sofridos_ht = float(gols_sofridos_ht) if pd.notna(gols_sofridos_ht) else 0
-                gols_feitos_ft = float(gols_feitos_ft) if pd.notna(gols_feitos_ft) else 0
-                gols_sofridos_ft = float(gols_sofridos_ft) if pd.notna(gols_sofridos_ft) else 0
-            except:
-                gols_feitos_ht, gols_sofridos_ht, gols_feitos_ft, gols_sofridos_ft = 0, 0, 0, 0
-
-            estatisticas['gols_feitos_ht'].append(gols_feitos_ht * peso)
-            estatisticas['gols_sofridos_ht'].append(gols_sofridos_ht * peso)
-            estatisticas['gols_feitos_ft'].append(gols_feitos_ft * peso)
-            estatisticas['gols_sofridos_ft'].append(gols_sofridos_ft * peso)
-
-            total_ht = gols_feitos_ht + gols_sofridos_ht
-            total_ft = gols_feitos_ft + gols_sofridos_ft
-
-            estatisticas['over_05_ht'].append(1 if total_ht > 0.5 else 0)
-            estatisticas['over_15_ht'].append(1 if total_ht > 1.5 else 0)
-            estatisticas['over_05_ft'].append(1 if total_ft > 0.5 else 0)
-            estatisticas['over_15_ft'].append(1 if total_ft > 1.5 else 0)
-            estatisticas['over_25_ft'].append(1 if total_ft > 2.5 else 0)
-            estatisticas['over_35_ft'].append(1 if total_ft > 3.5 else 0)
-            estatisticas['btts'].append(1 if gols_feitos_ft > 0 and gols_sofridos_ft > 0 else 0)
-            estatisticas['goals_1_5_plus'].append(1 if gols_feitos_ft >= 1.5 else 0)
-            estatisticas['goals_2_5_plus'].append(1 if gols_feitos_ft >= 2.5 else 0)
-
-        resultados = {}
-        for key, valores in estatisticas.items():
-            if valores:
-                resultados[key] = sum(valores) / sum(self.pesos_progressivos[:len(valores)])
-            else:
-                resultados[key] = 0
-
-        return resultados
-
-    def extrair_gols_ht(self, ht_value):
-        """Extrai gols do HT (formato: '1-0' ou '1-0 (0-0)')"""
-        try:
-            if pd.isna(ht_value) or ht_value == '':
-                return 0, 0
-
-            # Remove conteúdo entre parênteses se existir
-            ht_limpo = re.sub(r'\([^)]*\)', '', ht_value).strip()
-
-            if '-' in ht_limpo:
-                partes = ht_limpo.split('-')
-                if len(partes) == 2:
-                    return float(partes[0].strip()), float(partes[1].strip())
-            return 0, 0
-        except:
-            return 0, 0
-
-    def extrair_gols_ft(self, ft_value):
-        """Extrai gols do FT (formato: '1-0')"""
-        try:
-            if pd.isna(ft_value) or ft_value == '':
-                return 0, 0
-
-            if '-' in ft_value:
-                partes = ft_value.split('-')
-                if len(partes) == 2:
-                    return float(partes[0].strip()), float(partes[1].strip())
-            return 0, 0
-        except:
-            return 0, 0
-
-    def simular_jogo_monte_carlo(self, stats_casa, stats_fora, num_simulacoes=50000):
-        if not stats_casa or not stats_fora:
-            return None
-
-        lambda_casa_ft = max(0.1, (stats_casa['gols_feitos_ft'] * 0.6 + stats_fora['gols_sofridos_ft'] * 0.4))
-        lambda_fora_ft = max(0.1, (stats_fora['gols_feitos_ft'] * 0.6 + stats_casa['gols_sofridos_ft'] * 0.4))
-
-        fator_casa = 1.15
-        lambda_casa_ft *= fator_casa
-        lambda_fora_ft *= 0.85
-
-        try:
-            gols_casa_ft = poisson.rvs(mu=lambda_casa_ft, size=num_simulacoes)
-            gols_fora_ft = poisson.rvs(mu=lambda_fora_ft, size=num_simulacoes)
-
-            gols_ht_casa = np.random.binomial(gols_casa_ft, 0.4, size=num_simulacoes)
-            gols_ht_fora = np.random.binomial(gols_fora_ft, 0.4, size=num_simulacoes)
-
-            resultados = {
-                'gols_ht_casa': gols_ht_casa, 'gols_ht_fora': gols_ht_fora,
-                'gols_ft_casa': gols_casa_ft, 'gols_ft_fora': gols_fora_ft,
-                'total_ht': gols_ht_casa + gols_ht_fora, 'total_ft': gols_casa_ft + gols_fora_ft
-            }
-
-            return resultados
-        except:
-            return None
-
-    def calcular_probabilidades_pico_maximo(self, casa, fora):
-        stats_casa = self.calcular_estatisticas_avancadas(casa)
-        stats_fora = self.calcular_estatisticas_avancadas(fora)
-
-        if not stats_casa or not stats_fora:
-            return None
-
-        simulacao = self.simular_jogo_monte_carlo(stats_casa, stats_fora, 100000)
-
-        if not simulacao:
-            return None
-
-        prob = {}
-
-        try:
-            # MERCADOS HT
-            prob['Gols Esperados HT'] = np.mean(simulacao['total_ht'])
-            prob['Over 0.5 HT'] = max(60, min(95, np.mean(simulacao['total_ht'] > 0.5) * 100 * 1.08))
-            prob['Over 1.5 HT'] = max(40, min(85, np.mean(simulacao['total_ht'] > 1.5) * 100 * 1.06))
-            prob['Casa Marca HT'] = max(50, min(90, np.mean(simulacao['gols_ht_casa'] > 0) * 100 * 1.05))
-            prob['Fora Marca HT'] = max(45, min(85, np.mean(simulacao['gols_ht_fora'] > 0) * 100 * 1.05))
-
-            # MERCADOS FT
-            prob['Gols Esperados FT'] = np.mean(simulacao['total_ft'])
-            prob['Over 0.5 FT'] = max(85, min(99, np.mean(simulacao['total_ft'] > 0.5) * 100 * 1.02))
-            prob['Over 1.5 FT'] = max(70, min(95, np.mean(simulacao['total_ft'] > 1.5) * 100 * 1.04))
-            prob['Over 2.5 FT'] = max(50, min(90, np.mean(simulacao['total_ft'] > 2.5) * 100 * 1.05))
-            prob['Over 3.5 FT'] = max(25, min(75, np.mean(simulacao['total_ft'] > 3.5) * 100 * 1.06))
-            prob['Over 4.5 FT'] = max(10, min(50, np.mean(simulacao['total_ft'] > 4.5) * 100 * 1.08))
-
-            # BTTS
-            btts_prob = np.mean((simulacao['gols_ft_casa'] > 0) & (simulacao['gols_ft_fora'] > 0)) * 100
-            prob['BTTS FT'] = max(40, min(85, btts_prob * 1.07))
-
-            # BTTS & Over 2.5
-            btts_over25_prob = np.mean(
-                (simulacao['gols_ft_casa'] > 0) &
-                (simulacao['gols_ft_fora'] > 0) &
-                (simulacao['total_ft'] > 2.5)
-            ) * 100
-            prob['BTTS & Over 2.5'] = max(25, min(70, btts_over25_prob * 1.08))
-
-            # Equipe marca 1.5+
-            prob['Casa Marca 1.5'] = max(30, min(80, np.mean(simulacao['gols_ft_casa'] >= 1.5) * 100 * 1.09))
-            prob['Fora Marca 1.5'] = max(25, min(70, np.mean(simulacao['gols_ft_fora'] >= 1.5) * 100 * 1.09))
-
-            # Probabilidades básicas para vitória/empate
-            prob['Casa Vence'] = np.mean(simulacao['gols_ft_casa'] > simulacao['gols_ft_fora']) * 100
-            prob['Empate'] = np.mean(simulacao['gols_ft_casa'] == simulacao['gols_ft_fora']) * 100
-            prob['Fora Vence'] = np.mean(simulacao['gols_ft_casa'] < simulacao['gols_ft_fora']) * 100
-
-            return prob
-        except Exception as e:
-            return None
-
-
-# 🔥 CLASSE PARA DICAS ESTATÍSTICAS - ATUALIZADA
-class AnalisadorDicasEstatisticas:
-    def __init__(self, dados_historicos):
-        self.dados = dados_historicos
-        self.mercados_config = {
-            'Over 0.5 HT': {'nome': 'Over 0.5 HT', 'icone': '⚡', 'limite': 75, 'tipo': 'over_ht', 'linha': 0.5},
-            'Over 1.5 HT': {'nome': 'Over 1.5 HT', 'icone': '⚡', 'limite': 45, 'tipo': 'over_ht', 'linha': 1.5},
-            'Over 0.5 FT': {'nome': 'Over 0.5 FT', 'icone': '🎯', 'limite': 85, 'tipo': 'over_ft', 'linha': 0.5},
-            'Over 1.5 FT': {'nome': 'Over 1.5 FT', 'icone': '🎯', 'limite': 70, 'tipo': 'over_ft', 'linha': 1.5},
-            'Over 2.5 FT': {'nome': 'Over 2.5 FT', 'icone': '🎯', 'limite': 55, 'tipo': 'over_ft', 'linha': 2.5},
-            'Over 3.5 FT': {'nome': 'Over 3.5 FT', 'icone': '🎯', 'limite': 35, 'tipo': 'over_ft', 'linha': 3.5},
-            'BTTS FT': {'nome': 'BTTS FT', 'icone': '🔀', 'limite': 60, 'tipo': 'btts', 'linha': None},
-            'BTTS & Over 2.5': {'nome': 'BTTS & Over 2.5', 'icone': '🔥', 'limite': 45, 'tipo': 'combinado',
-                                'linha': None},
-            'Casa Marca 1.5': {'nome': 'Casa Marca 1.5+', 'icone': '🏠', 'limite': 50, 'tipo': 'equipe_ataque',
-                               'linha': 1.5},
-            'Fora Marca 1.5': {'nome': 'Fora Marca 1.5+', 'icone': '✈️', 'limite': 40, 'tipo': 'equipe_ataque',
-                               'linha': 1.5},
-            'Casa Vence': {'nome': 'Vitória Casa', 'icone': '🏠', 'limite': 65, 'tipo': 'resultado', 'linha': None},
-            'Fora Vence': {'nome': 'Vitória Fora', 'icone': '✈️', 'limite': 55, 'tipo': 'resultado', 'linha': None}
-        }
-
-    def gerar_dicas_jogo(self, casa, fora, mercado_filtro=None):
-        """Gera dicas estatísticas para um jogo específico com filtro por mercado"""
-        stats_casa = self.calcular_estatisticas_equipe(casa)
-        stats_fora = self.calcular_estatisticas_equipe(fora)
-
-        if not stats_casa or not stats_fora:
-            return []
-
-        dicas = []
-
-        # Filtrar mercados se especificado
-        mercados_para_analisar = self.mercados_config
-        if mercado_filtro and mercado_filtro != "Todos":
-            mercados_para_analisar = {k: v for k, v in self.mercados_config.items()
-                                      if v['nome'] == mercado_filtro}
-
-        # Calcular probabilidades combinadas
-        for mercado, config in mercados_para_analisar.items():
-            prob_casa = stats_casa.get(mercado, 0)
-            prob_fora = stats_fora.get(mercado, 0)
-
-            # Média ponderada considerando força das equipes
-            probabilidade_combinada = (prob_casa * 0.6 + prob_fora * 0.4)
-
-            if probabilidade_combinada >= config['limite']:
-                dicas.append({
-                    'mercado': config['nome'],
-                    'icone': config['icone'],
-                    'probabilidade': probabilidade_combinada,
-                    'casa_percent': prob_casa,
-                    'fora_percent': prob_fora,
-                    'tipo': config['tipo'],
-                    'linha': config['linha']
-                })
-
-        # 🔥 SELEÇÃO INTELIGENTE - Evitar mercados redundantes
-        dicas_filtradas = self._filtrar_mercados_redundantes(dicas)
-
-        # Ordenar por probabilidade (maior primeiro)
-        dicas_filtradas.sort(key=lambda x: x['probabilidade'], reverse=True)
-        return dicas_filtradas
-
-    def _filtrar_mercados_redundantes(self, dicas):
-        """Filtra mercados redundantes, mantendo apenas a linha mais alta"""
-        if not dicas:
-            return []
-
-        # Agrupar por tipo de mercado
-        mercados_por_tipo = {}
-        for dica in dicas:
-            tipo = dica['tipo']
-            if tipo not in mercados_por_tipo:
-                mercados_por_tipo[tipo] = []
-            mercados_por_tipo[tipo].append(dica)
-
-        dicas_finais = []
-
-        # Para cada tipo, manter apenas o mercado com linha mais alta
-        for tipo, mercados in mercados_por_tipo.items():
-            if tipo in ['over_ht', 'over_ft']:
-                # Para mercados Over, manter apenas o com linha mais alta
-                mercado_maior_linha = max(mercados, key=lambda x: x['linha'] if x['linha'] else 0)
-                dicas_finais.append(mercado_maior_linha)
-            else:
-                # Para outros tipos, manter todos
-                dicas_finais.extend(mercados)
-
-        return dicas_finais
-
-    def calcular_estatisticas_equipe(self, equipe, num_jogos=10):
-        """Calcula estatísticas recentes de uma equipe"""
-        jogos_equipe = self.dados[
-            (self.dados['Casa'] == equipe) | (self.dados['Fora'] == equipe)
-            ].tail(num_jogos)
-
-        if len(jogos_equipe) == 0:
-            return None
-
-        stats = {
-            'Casa Vence': 0, 'Fora Vence': 0,
-            'Over 0.5 HT': 0, 'Over 1.5 HT': 0,
-            'Over 0.5 FT': 0, 'Over 1.5 FT': 0, 'Over 2.5 FT': 0, 'Over 3.5 FT': 0,
-            'BTTS FT': 0, 'BTTS & Over 2.5': 0,
-            'Casa Marca 1.5': 0, 'Fora Marca 1.5': 0,
-            'total_jogos': len(jogos_equipe)
-        }
-
-        for idx, jogo in jogos_equipe.iterrows():
-            is_casa = jogo['Casa'] == equipe
-
-            # Extrair gols
-            gols_casa_ht, gols_fora_ht = self.extrair_gols_ht(jogo['HT'])
-            gols_casa_ft, gols_fora_ft = self.extrair_gols_ft(jogo['FT'])
-
-            if is_casa:
-                gols_feitos_ft = gols_casa_ft
-                gols_sofridos_ft = gols_fora_ft
-            else:
-                gols_feitos_ft = gols_fora_ft
-                gols_sofridos_ft = gols_casa_ft
-
-            # Calcular estatísticas
-            total_ht = gols_casa_ht + gols_fora_ht
-            total_ft = gols_casa_ft + gols_fora_ft
-
-            # Vitórias
-            if is_casa and gols_casa_ft > gols_fora_ft:
-                stats['Casa Vence'] += 1
-            elif not is_casa and gols_fora_ft > gols_casa_ft:
-                stats['Fora Vence'] += 1
-
-            # Mercados HT
-            if total_ht > 0.5: stats['Over 0.5 HT'] += 1
-            if total_ht > 1.5: stats['Over 1.5 HT'] += 1
-
-            # Mercados FT
-            if total_ft > 0.5: stats['Over 0.5 FT'] += 1
-            if total_ft > 1.5: stats['Over 1.5 FT'] += 1
-            if total_ft > 2.5: stats['Over 2.5 FT'] += 1
-            if total_ft > 3.5: stats['Over 3.5 FT'] += 1
-            if gols_casa_ft > 0 and gols_fora_ft > 0: stats['BTTS FT'] += 1
-            if (gols_casa_ft > 0 and gols_fora_ft > 0) and total_ft > 2.5: stats['BTTS & Over 2.5'] += 1
-            if gols_feitos_ft >= 1.5:
-                if is_casa:
-                    stats['Casa Marca 1.5'] += 1
-                else:
-                    stats['Fora Marca 1.5'] += 1
-
-        # Converter para percentuais
-        for key in stats:
-            if key != 'total_jogos' and stats['total_jogos'] > 0:
-                stats[key] = (stats[key] / stats['total_jogos']) * 100
-
-        return stats
-
-    def extrair_gols_ht(self, ht_value):
-        """Extrai gols do HT"""
-        try:
-            if pd.isna(ht_value) or ht_value == '':
-                return 0, 0
-            ht_limpo = re.sub(r'\([^)]*\)', '', ht_value).strip()
-            if '-' in ht_limpo:
-                partes = ht_limpo.split('-')
-                if len(partes) == 2:
-                    return float(partes[0].strip()), float(partes[1].strip())
-            return 0, 0
-        except:
-            return 0, 0
-
-    def extrair_gols_ft(self, ft_value):
-        """Extrai gols do FT"""
-        try:
-            if pd.isna(ft_value) or ft_value == '':
-                return 0, 0
-            if '-' in ft_value:
-                partes = ft_value.split('-')
-                if len(partes) == 2:
-                    return float(partes[0].strip()), float(partes[1].strip())
-            return 0, 0
-        except:
-            return 0, 0
-
-
-# 🔥 CLASSE PARA ALERTAS INTELIGENTES - COMPLETA E CORRIGIDA
-class AnalisadorAlertasInteligentes:
-    def __init__(self, dados_historicos):
-        self.dados = dados_historicos
-        self.mercados = {
-            'Vitorias': {'nome': 'Vitórias', 'icone': '✅', 'tipo': 'vitoria'},
-            'Derrotas': {'nome': 'Derrotas', 'icone': '❌', 'tipo': 'derrota'},
-            'Over 0.5 HT': {'nome': 'Over 0.5 HT', 'icone': '⚡', 'tipo': 'over_ht', 'linha': 0.5},
-            'Over 1.5 HT': {'nome': 'Over 1.5 HT', 'icone': '⚡', 'tipo': 'over_ht', 'linha': 1.5},
-            'BTTS HT': {'nome': 'BTTS HT', 'icone': '🔀', 'tipo': 'btts_ht'},
-            'Over 1.5 FT': {'nome': 'Over 1.5 FT', 'icone': '🎯', 'tipo': 'over_ft', 'linha': 1.5},
-            'Over 2.5 FT': {'nome': 'Over 2.5 FT', 'icone': '🎯', 'tipo': 'over_ft', 'linha': 2.5},
-            'Over 3.5 FT': {'nome': 'Over 3.5 FT', 'icone': '🎯', 'tipo': 'over_ft', 'linha': 3.5},
-            'BTTS FT': {'nome': 'BTTS FT', 'icone': '🔀', 'tipo': 'btts_ft'},
-            'Casa Marca 1.5': {'nome': 'Casa Marca 1.5+', 'icone': '🏠', 'tipo': 'equipe_ataque', 'linha': 1.5},
-            'Fora Marca 1.5': {'nome': 'Fora Marca 1.5+', 'icone': '✈️', 'tipo': 'equipe_ataque', 'linha': 1.5}
-        }
-
-    def extrair_gols_ht(self, ht_value):
-        """Extrai gols do HT - PEGAR DADOS DENTRO DOS PARÊNTESES"""
-        try:
-            if pd.isna(ht_value) or ht_value == '' or ht_value == '-':
-                return 0, 0
-
-            # Converter para string
-            ht_str = str(ht_value).strip()
-
-            # BUSCAR DADOS DENTRO DOS PARÊNTESES - gols reais do HT
-            padrao_parenteses = r'\((\d+)-(\d+)\)'
-            match = re.search(padrao_parenteses, ht_str)
-
-            if match:
-                # Encontrou dados entre parênteses - usar esses (são os gols reais do HT)
-                gols_casa = float(match.group(1))
-                gols_fora = float(match.group(2))
-                return gols_casa, gols_fora
-            else:
-                # Se não tem parênteses, tentar extrair do formato básico
-                if '-' in ht_str:
-                    partes = ht_str.split('-')
-                    if len(partes) == 2:
-                        gols_casa = re.sub(r'[^\d]', '', partes[0].strip())
-                        gols_fora = re.sub(r'[^\d]', '', partes[1].strip())
-
-                        gols_casa = float(gols_casa) if gols_casa.isdigit() else 0
-                        gols_fora = float(gols_fora) if gols_fora.isdigit() else 0
-
-                        return gols_casa, gols_fora
-
-            return 0, 0
-
-        except Exception as e:
-            return 0, 0
-
-    def extrair_gols_ft(self, ft_value):
-        """Extrai gols do FT - PEGAR DADOS FORA DOS PARÊNTESES"""
-        try:
-            if pd.isna(ft_value) or ft_value == '' or ft_value == '-':
-                return 0, 0
-
-            # Converter para string
-            ft_str = str(ft_value).strip()
-
-            # Para FT, usar os dados principais (fora dos parênteses)
-            # Remover conteúdo entre parênteses se existir
-            ft_limpo = re.sub(r'\([^)]*\)', '', ft_str).strip()
-
-            if '-' in ft_limpo:
-                partes = ft_limpo.split('-')
-                if len(partes) == 2:
-                    gols_casa = re.sub(r'[^\d]', '', partes[0].strip())
-                    gols_fora = re.sub(r'[^\d]', '', partes[1].strip())
-
-                    gols_casa = float(gols_casa) if gols_casa.isdigit() else 0
-                    gols_fora = float(gols_fora) if gols_fora.isdigit() else 0
-
-                    return gols_casa, gols_fora
-
-            return 0, 0
-
-        except Exception as e:
-            return 0, 0
-
-    def verificar_mercado_jogo_liga(self, jogo, mercado):
-        """Verifica se o mercado foi atendido no jogo para análise da liga"""
-        try:
-            # Extrair gols
-            gols_casa_ht, gols_fora_ht = self.extrair_gols_ht(jogo['HT'])
-            gols_casa_ft, gols_fora_ft = self.extrair_gols_ft(jogo['FT'])
-
-            # Verificar mercado
-            if mercado == 'Vitorias':
-                return gols_casa_ft > gols_fora_ft
-
-            elif mercado == 'Derrotas':
-                return gols_casa_ft < gols_fora_ft
-
-            elif mercado == 'Over 0.5 HT':
-                total_ht = gols_casa_ht + gols_fora_ht
-                return total_ht > 0.5
-
-            elif mercado == 'Over 1.5 HT':
-                total_ht = gols_casa_ht + gols_fora_ht
-                return total_ht > 1.5
-
-            elif mercado == 'BTTS HT':
-                return gols_casa_ht > 0 and gols_fora_ht > 0
-
-            elif mercado == 'Over 1.5 FT':
-                total_ft = gols_casa_ft + gols_fora_ft
-                return total_ft > 1.5
-
-            elif mercado == 'Over 2.5 FT':
-                total_ft = gols_casa_ft + gols_fora_ft
-                return total_ft > 2.5
-
-            elif mercado == 'Over 3.5 FT':
-                total_ft = gols_casa_ft + gols_fora_ft
-                return total_ft > 3.5
-
-            elif mercado == 'BTTS FT':
-                return gols_casa_ft > 0 and gols_fora_ft > 0
-
-            elif mercado == 'Casa Marca 1.5':
-                return gols_casa_ft >= 1.5
-
-            elif mercado == 'Fora Marca 1.5':
-                return gols_fora_ft >= 1.5
-
-            return False
-
-        except Exception as e:
-            return False
-
-    def verificar_mercado_jogo_equipe(self, jogo, equipe, mercado):
-        """Verifica se o mercado foi atendido no jogo para a equipe específica"""
-        try:
-            is_casa = jogo['Casa'] == equipe
-
-            # Extrair gols
-            gols_casa_ht, gols_fora_ht = self.extrair_gols_ht(jogo['HT'])
-            gols_casa_ft, gols_fora_ft = self.extrair_gols_ft(jogo['FT'])
-
-            if is_casa:
-                gols_feitos_ft = gols_casa_ft
-                gols_sofridos_ft = gols_fora_ft
-                gols_feitos_ht = gols_casa_ht
-                gols_sofridos_ht = gols_fora_ht
-            else:
-                gols_feitos_ft = gols_fora_ft
-                gols_sofridos_ft = gols_casa_ft
-                gols_feitos_ht = gols_fora_ht
-                gols_sofridos_ht = gols_casa_ht
-
-            # Verificar mercado
-            if mercado == 'Vitorias':
-                if is_casa:
-                    return gols_casa_ft > gols_fora_ft
-                else:
-                    return gols_fora_ft > gols_casa_ft
-
-            elif mercado == 'Derrotas':
-                if is_casa:
-                    return gols_casa_ft < gols_fora_ft
-                else:
-                    return gols_fora_ft < gols_casa_ft
-
-            elif mercado == 'Over 0.5 HT':
-                total_ht = gols_casa_ht + gols_fora_ht
-                return total_ht > 0.5
-
-            elif mercado == 'Over 1.5 HT':
-                total_ht = gols_casa_ht + gols_fora_ht
-                return total_ht > 1.5
-
-            elif mercado == 'BTTS HT':
-                return gols_casa_ht > 0 and gols_fora_ht > 0
-
-            elif mercado == 'Over 1.5 FT':
-                total_ft = gols_casa_ft + gols_fora_ft
-                return total_ft > 1.5
-
-            elif mercado == 'Over 2.5 FT':
-                total_ft = gols_casa_ft + gols_fora_ft
-                return total_ft > 2.5
-
-            elif mercado == 'Over 3.5 FT':
-                total_ft = gols_casa_ft + gols_fora_ft
-                return total_ft > 3.5
-
-            elif mercado == 'BTTS FT':
-                return gols_casa_ft > 0 and gols_fora_ft > 0
-
-            elif mercado == 'Casa Marca 1.5':
-                if is_casa:
-                    return gols_feitos_ft >= 1.5
-                else:
-                    return gols_sofridos_ft >= 1.5
-
-            elif mercado == 'Fora Marca 1.5':
-                if not is_casa:
-                    return gols_feitos_ft >= 1.5
-                else:
-                    return gols_sofridos_ft >= 1.5
-
-            return None
-
-        except Exception as e:
-            return None
-
-    def calcular_estatisticas_equipe_geral(self, equipe, mercado):
-        """Calcula estatísticas gerais de uma equipe para um mercado específico"""
-        jogos_equipe = self.dados[
-            (self.dados['Casa'] == equipe) | (self.dados['Fora'] == equipe)
-            ].copy()
-
-        if len(jogos_equipe) == 0:
-            return 0, 0, []
-
-        acertos = 0
-        total_jogos_validos = 0
-        ultimos_resultados = []
-
-        for idx, jogo in jogos_equipe.iterrows():
-            # Para mercados HT, verificar se tem dados válidos
-            if mercado in ['Over 0.5 HT', 'Over 1.5 HT', 'BTTS HT']:
-                gols_casa_ht, gols_fora_ht = self.extrair_gols_ht(jogo['HT'])
-                if gols_casa_ht == 0 and gols_fora_ht == 0:
-                    continue  # Pular jogo sem dados HT válidos
-
-            bateu_mercado = self.verificar_mercado_jogo_equipe(jogo, equipe, mercado)
-            if bateu_mercado is not None:
-                total_jogos_validos += 1
-                if bateu_mercado:
-                    acertos += 1
-                # Guardar últimos 5 resultados (mais recentes primeiro)
-                if len(ultimos_resultados) < 5:
-                    ultimos_resultados.append('🟢' if bateu_mercado else '🔴')
-
-        # Reverter para ter os mais recentes primeiro
-        ultimos_resultados = ultimos_resultados[::-1]
-
-        # Completar com ⚫ se não tiver 5 jogos
-        while len(ultimos_resultados) < 5:
-            ultimos_resultados.append('⚫')
-
-        taxa_acerto = (acertos / total_jogos_validos * 100) if total_jogos_validos > 0 else 0
-
-        return taxa_acerto, total_jogos_validos, ultimos_resultados
-
-    def calcular_estatisticas_liga_geral(self, liga, mercado):
-        """Calcula estatísticas gerais de uma liga para um mercado específico"""
-        dados_liga = self.dados[self.dados['Competição'] == liga].copy()
-
-        if dados_liga.empty:
-            return 0, 0
-
-        total_jogos = 0
-        acertos = 0
-        jogos_com_dados_ht = 0
-
-        for idx, jogo in dados_liga.iterrows():
-            # Verificar se tem dados HT válidos para mercados HT
-            if mercado in ['Over 0.5 HT', 'Over 1.5 HT', 'BTTS HT']:
-                gols_casa_ht, gols_fora_ht = self.extrair_gols_ht(jogo['HT'])
-                if gols_casa_ht == 0 and gols_fora_ht == 0:
-                    continue  # Pular jogo sem dados HT válidos
-                jogos_com_dados_ht += 1
-
-            total_jogos += 1
-            if self.verificar_mercado_jogo_liga(jogo, mercado):
-                acertos += 1
-
-        # Para mercados HT, usar apenas jogos com dados válidos
-        if mercado in ['Over 0.5 HT', 'Over 1.5 HT', 'BTTS HT']:
-            total_jogos = jogos_com_dados_ht
-
-        taxa_acerto = (acertos / total_jogos * 100) if total_jogos > 0 else 0
-
-        return taxa_acerto, total_jogos
-
-    def gerar_ranking_mercado(self, mercado, competicao=None):
-        """Gera ranking completo para um mercado específico"""
-        todas_equipes = list(set(self.dados['Casa'].unique()) | set(self.dados['Fora'].unique()))
-        todas_ligas = self.dados['Competição'].unique()
-
-        # Calcular estatísticas das ligas
-        ranking_ligas = []
-        for liga in todas_ligas:
-            taxa_liga, total_jogos_liga = self.calcular_estatisticas_liga_geral(liga, mercado)
-
-            # Para mercados HT, exigir pelo menos 3 jogos com dados HT válidos
-            min_jogos = 5
-            if mercado in ['Over 0.5 HT', 'Over 1.5 HT', 'BTTS HT']:
-                min_jogos = 3
-
-            if total_jogos_liga >= min_jogos:
-                ranking_ligas.append({
-                    'Liga': liga,
-                    'Taxa': taxa_liga,
-                    'Jogos': total_jogos_liga,
-                    '_taxa_num': taxa_liga
-                })
-
-        # Ordenar ligas por taxa
-        ranking_ligas.sort(key=lambda x: x['_taxa_num'], reverse=True)
-
-        # Calcular estatísticas das equipes
-        resultados_equipes = []
-        for equipe in todas_equipes:
-            taxa, total_jogos, ultimos_5 = self.calcular_estatisticas_equipe_geral(equipe, mercado)
-
-            # MÍNIMO DE JOGOS ajustado para mercados HT
-            min_jogos_equipe = 5
-            if mercado in ['Over 0.5 HT', 'Over 1.5 HT', 'BTTS HT']:
-                min_jogos_equipe = 3
-
-            if total_jogos >= min_jogos_equipe:
-                # Encontrar liga da equipe (mais frequente)
-                jogos_equipe = self.dados[
-                    (self.dados['Casa'] == equipe) | (self.dados['Fora'] == equipe)
-                    ]
-                if not jogos_equipe.empty:
-                    liga = jogos_equipe['Competição'].mode()[0]
-
-                    # Se filtro por competição, filtrar equipes
-                    if competicao and competicao != "Todas":
-                        if liga != competicao:
-                            continue
-
-                    resultados_equipes.append({
-                        'Equipe': equipe,
-                        'Liga': liga,
-                        'Jogos': total_jogos,
-                        'Acertos': int((taxa / 100) * total_jogos),
-                        'Taxa': taxa,
-                        'Últimos 5': ' '.join(ultimos_5),
-                        '_taxa_num': taxa
-                    })
-
-        # Ordenar equipes por taxa
-        resultados_equipes.sort(key=lambda x: x['_taxa_num'], reverse=True)
-
-        return resultados_equipes, ranking_ligas
-
-    def extrair_gols_ht(self, ht_value):
-        """Extrai gols do HT - CORRIGIDO"""
-        try:
-            if pd.isna(ht_value) or ht_value == '' or ht_value == '-':
-                return 0, 0
-
-            # Limpar string - remover parênteses e conteúdo dentro
-            ht_limpo = re.sub(r'\([^)]*\)', '', str(ht_value)).strip()
-
-            if '-' in ht_limpo:
-                partes = ht_limpo.split('-')
-                if len(partes) == 2:
-                    gols_casa = float(partes[0].strip()) if partes[0].strip().isdigit() else 0
-                    gols_fora = float(partes[1].strip()) if partes[1].strip().isdigit() else 0
-                    return gols_casa, gols_fora
-
-            return 0, 0
-
-        except Exception as e:
-            return 0, 0
-
-    def extrair_gols_ft(self, ft_value):
-        """Extrai gols do FT - CORRIGIDO"""
-        try:
-            if pd.isna(ft_value) or ft_value == '' or ft_value == '-':
-                return 0, 0
-
-            if '-' in str(ft_value):
-                partes = str(ft_value).split('-')
-                if len(partes) == 2:
-                    gols_casa = float(partes[0].strip()) if partes[0].strip().isdigit() else 0
-                    gols_fora = float(partes[1].strip()) if partes[1].strip().isdigit() else 0
-                    return gols_casa, gols_fora
-
-            return 0, 0
-
-        except Exception as e:
-            return 0, 0
-
-
-# 🔥 FUNÇÃO PARA ADICIONAR ANÁLISE PICO MÁXIMO AOS JOGOS
-def adicionar_analise_pico_maximo(df_jogos, base_historica):
-    if df_jogos.empty or base_historica.empty:
-        return df_jogos
-
-    analisador = AnalisadorPicoMaximo(base_historica)
-    novas_colunas = []
-
-    if len(df_jogos) > 0:
-        progress_bar = st.progress(0)
-        total_jogos = len(df_jogos)
-
-        for idx, jogo in df_jogos.iterrows():
-            progresso = min((idx + 1) / total_jogos, 1.0)
-            progress_bar.progress(progresso)
-
-            try:
-                probabilidades = analisador.calcular_probabilidades_pico_maximo(jogo['Casa'], jogo['Fora'])
-
-                if probabilidades:
-                    resultado_jogo = {
-                        'Casa Vence': f"{probabilidades['Casa Vence']:.1f}%",
-                        'Empate': f"{probabilidades['Empate']:.1f}%",
-                        'Fora Vence': f"{probabilidades['Fora Vence']:.1f}%",
-                        'Gols HT': f"{probabilidades['Gols Esperados HT']:.2f}",
-                        'Over 0.5 HT': f"{probabilidades['Over 0.5 HT']:.1f}%",
-                        'Over 1.5 HT': f"{probabilidades['Over 1.5 HT']:.1f}%",
-                        'Casa Marca HT': f"{probabilidades['Casa Marca HT']:.1f}%",
-                        'Fora Marca HT': f"{probabilidades['Fora Marca HT']:.1f}%",
-                        'Gols FT': f"{probabilidades['Gols Esperados FT']:.2f}",
-                        'Over 0.5 FT': f"{probabilidades['Over 0.5 FT']:.1f}%",
-                        'Over 1.5 FT': f"{probabilidades['Over 1.5 FT']:.1f}%",
-                        'Over 2.5 FT': f"{probabilidades['Over 2.5 FT']:.1f}%",
-                        'Over 3.5 FT': f"{probabilidades['Over 3.5 FT']:.1f}%",
-                        'Over 4.5 FT': f"{probabilidades['Over 4.5 FT']:.1f}%",
-                        'Casa Marca 1.5': f"{probabilidades['Casa Marca 1.5']:.1f}%",
-                        'Fora Marca 1.5': f"{probabilidades['Fora Marca 1.5']:.1f}%",
-                        'Btts FT': f"{probabilidades['BTTS FT']:.1f}%",
-                        'Btts & Over 2.5': f"{probabilidades['BTTS & Over 2.5']:.1f}%"
-                    }
-                    novas_colunas.append(resultado_jogo)
-                else:
-                    valores_padrao = {
-                        'Casa Vence': "-", 'Empate': "-", 'Fora Vence': "-",
-                        'Gols HT': "-", 'Over 0.5 HT': "-", 'Over 1.5 HT': "-",
-                        'Casa Marca HT': "-", 'Fora Marca HT': "-", 'Gols FT': "-",
-                        'Over 0.5 FT': "-", 'Over 1.5 FT': "-", 'Over 2.5 FT': "-",
-                        'Over 3.5 FT': "-", 'Over 4.5 FT': "-", 'Casa Marca 1.5': "-",
-                        'Fora Marca 1.5': "-", 'Btts FT': "-", 'Btts & Over 2.5': "-"
-                    }
-                    novas_colunas.append(valores_padrao)
-
-            except Exception as e:
-                valores_erro = {f"Erro": "Erro" for _ in range(18)}
-                novas_colunas.append(valores_erro)
-
-        progress_bar.empty()
-
-    if novas_colunas:
-        df_com_analise = df_jogos.copy()
-        for coluna in novas_colunas[0].keys():
-            df_com_analise[coluna] = [jogo[coluna] for jogo in novas_colunas]
-
-        return df_com_analise
+# Coleta automática (base vencida) só das competições que podem ter resultados novos;
+# o botão "Atualizar dados" sempre coleta todas
+COLETA_INCREMENTAL = os.environ.get('FUTALGORITHM_COLETA_INCREMENTAL', '1') == '1'
 
-    return df_jogos
+# Versões de base vindas do atualizador em segundo plano (atualizador.py)
+PREFIXO_SNAPSHOT = 'snapshot:'
 
+# Painel "Tempos por etapa" no fim da página (também com ?debug=1 na URL)
+MOSTRAR_DEPURACAO = os.environ.get('FUTALGORITHM_DEPURACAO', '0') == '1'
 
-# 🔥 FUNÇÕES ORIGINAIS DO SEU CÓDIGO (MANTIDAS)
-def traduzir_data(data_ingles):
-    dias_semana = {
-        'Mon': 'Seg', 'Tue': 'Ter', 'Wed': 'Qua', 'Thu': 'Qui',
-        'Fri': 'Sex', 'Sat': 'Sáb', 'Sun': 'Dom'
-    }
-    meses = {
-        'Jan': 'Jan', 'Feb': 'Fev', 'Mar': 'Mar', 'Apr': 'Abr',
-        'May': 'Mai', 'Jun': 'Jun', 'Jul': 'Jul', 'Aug': 'Ago',
-        'Sep': 'Set', 'Oct': 'Out', 'Nov': 'Nov', 'Dec': 'Dez'
-    }
-    try:
-        data_ingles = data_ingles.replace('Percentages', '').strip()
-        partes = data_ingles.split()
-        if len(partes) == 3:
-            dia_semana_eng = partes[0]
-            dia_mes = partes[1]
-            mes_eng = partes[2]
-            dia_semana_pt = dias_semana.get(dia_semana_eng, dia_semana_eng)
-            mes_pt = meses.get(mes_eng, mes_eng)
-            return f"{dia_semana_pt} {dia_mes} {mes_pt}"
-        else:
-            return data_ingles
-    except:
-        return data_ingles
+# Processos do Monte Carlo do Pico Máximo (padrão: 1, sem pool; com mais de 1 o pool sobe num
+# servidor próprio na primeira análise, ver analisadores.simular_lote_paralelo)
+PROCESSOS_PICO_MAXIMO = int(os.environ.get('FUTALGORITHM_PROCESSOS', '1'))
 
+# Ordenações da aba Base de Dados: rótulo -> colunas (a primeira ordena, as demais desempatam)
+ORDENACOES_BASE_DADOS = {
+    "Data": ['Data Jogo', 'Competição'],
+    "Competição": ['Competição', 'Data Jogo'],
+    "Casa": ['Time Casa', 'Data Jogo'],
+    "Fora": ['Time Visitante', 'Data Jogo']
+}
+TAMANHOS_PAGINA_BASE_DADOS = [50, 100, 250, 500]
 
-def limpar_ht(ht_value):
-    if pd.isna(ht_value) or ht_value == '':
-        return ht_value
-    ht_limpo = re.sub(r'\([^)]*\)', '', ht_value).strip()
-    return ht_limpo if ht_limpo != '' else ht_value
-
-
-def extrair_dados_competicao(url, nome_competicao):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        linhas = soup.find_all('tr', class_='odd')
-        dados_competicao = []
-        for linha in linhas:
-            celulas = linha.find_all('td')
-            if len(celulas) >= 7:
-                data_ingles = celulas[0].get_text(strip=True)
-                data_portugues = traduzir_data(data_ingles)
-                ft_result = celulas[2].get_text(strip=True)
-                if (any(dia in data_portugues for dia in ['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom'])
-                        and any(caractere.isdigit() for caractere in data_portugues)
-                        and 'pp.' not in ft_result):
-                    jogo = {
-                        'Data': data_portugues,
-                        'Time Casa': celulas[1].get_text(strip=True),
-                        'Time Visitante': celulas[3].get_text(strip=True),
-                        'HT': celulas[5].get_text(strip=True) if len(celulas) > 5 else '',
-                        'FT': ft_result,
-                        'Competição': nome_competicao
-                    }
-                    dados_competicao.append(jogo)
-        return dados_competicao
-    except Exception as e:
-        st.warning(f"⚠️ Erro em {nome_competicao}: {str(e)}")
-        return []
-
-
-def extrair_todas_competicoes():
-    COMPETICOES = {
-        "Brasil Série A": "https://www.soccerstats.com/results.asp?league=brazil&pmtype=bydate",
-        "Brasil Série B": "https://www.soccerstats.com/results.asp?league=brazil2&pmtype=bydate",
-        "Áustria": "https://www.soccerstats.com/results.asp?league=austria&pmtype=bydate",
-        "Argentina": "https://www.soccerstats.com/results.asp?league=argentina&pmtype=bydate",
-        "Argentina D2": "https://www.soccerstats.com/results.asp?league=argentina2&pmtype=bydate",
-        "Bélgica": "https://www.soccerstats.com/results.asp?league=belgium&pmtype=bydate",
-        "Austrália": "https://www.soccerstats.com/results.asp?league=australia&pmtype=bydate",
-        "Suíça": "https://www.soccerstats.com/results.asp?league=switzerland&pmtype=bydate",
-        "República Tcheca": "https://www.soccerstats.com/results.asp?league=czechrepublic&pmtype=bydate",
-        "Alemanha": "https://www.soccerstats.com/results.asp?league=germany&pmtype=bydate",
-        "Alemanha D2": "https://www.soccerstats.com/results.asp?league=germany2&pmtype=bydate",
-        "Alemanha D3": "https://www.soccerstats.com/results.asp?league=germany3&pmtype=bydate",
-        "Dinamarca": "https://www.soccerstats.com/results.asp?league=denmark&pmtype=bydate",
-        "Inglaterra": "https://www.soccerstats.com/results.asp?league=england&pmtype=bydate",
-        "Inglaterra D2": "https://www.soccerstats.com/results.asp?league=england2&pmtype=bydate",
-        "Inglaterra D3": "https://www.soccerstats.com/results.asp?league=england3&pmtype=bydate",
-        "Inglaterra D4": "https://www.soccerstats.com/results.asp?league=england4&pmtype=bydate",
-        "Inglaterra D5": "https://www.soccerstats.com/results.asp?league=england5&pmtype=bydate",
-        "Inglaterra D15": "https://www.soccerstats.com/results.asp?league=england15&pmtype=bydate",
-        "Espanha": "https://www.soccerstats.com/results.asp?league=spain&pmtype=bydate",
-        "Espanha D2": "https://www.soccerstats.com/results.asp?league=spain2&pmtype=bydate",
-        "França": "https://www.soccerstats.com/results.asp?league=france&pmtype=bydate",
-        "França D2": "https://www.soccerstats.com/results.asp?league=france2&pmtype=bydate",
-        "Grécia": "https://www.soccerstats.com/results.asp?league=greece&pmtype=bydate",
-        "Holanda": "https://www.soccerstats.com/results.asp?league=netherlands&pmtype=bydate",
-        "Holanda D2": "https://www.soccerstats.com/results.asp?league=netherlands2&pmtype=bydate",
-        "Itália": "https://www.soccerstats.com/results.asp?league=italy&pmtype=bydate",
-        "Itália D2": "https://www.soccerstats.com/results.asp?league=italy2&pmtype=bydate",
-        "Japão": "https://www.soccerstats.com/results.asp?league=japan&pmtype=bydate",
-        "Noruega": "https://www.soccerstats.com/results.asp?league=norway&pmtype=bydate",
-        "Polônia": "https://www.soccerstats.com/results.asp?league=poland&pmtype=bydate",
-        "Portugal": "https://www.soccerstats.com/results.asp?league=portugal&pmtype=bydate",
-        "Portugal D2": "https://www.soccerstats.com/results.asp?league=portugal2&pmtype=bydate",
-        "Escócia": "https://www.soccerstats.com/results.asp?league=scotland&pmtype=bydate",
-        "Escócia D2": "https://www.soccerstats.com/results.asp?league=scotland2&pmtype=bydate",
-        "Suécia": "https://www.soccerstats.com/results.asp?league=sweden&pmtype=bydate",
-        "Turquia": "https://www.soccerstats.com/results.asp?league=turkey&pmtype=bydate",
-        "EUA MLS": "https://www.soccerstats.com/results.asp?league=usa&pmtype=bydate",
-        "EUA D2": "https://www.soccerstats.com/results.asp?league=usa2&pmtype=bydate",
-        "Canadá": "https://www.soccerstats.com/results.asp?league=canada&pmtype=bydate",
-        "Chile": "https://www.soccerstats.com/results.asp?league=chile&pmtype=bydate"
-    }
-    todos_dados = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {
-            executor.submit(extrair_dados_competicao, url, nome): nome
-            for nome, url in COMPETICOES.items()
-        }
-        for future in concurrent.futures.as_completed(futures):
-            dados = future.result()
-            if dados:
-                todos_dados.extend(dados)
-    return todos_dados
-
-
-def obter_data_por_dias(dias):
-    data_alvo = datetime.now() + timedelta(days=dias)
-    dias_semana_pt = {
-        0: 'Seg', 1: 'Ter', 2: 'Qua', 3: 'Qui',
-        4: 'Sex', 5: 'Sáb', 6: 'Dom'
-    }
-    meses_pt = {
-        1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr',
-        5: 'Mai', 6: 'Jun', 7: 'Jul', 8: 'Ago',
-        9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
-    }
-    dia_semana = dias_semana_pt[data_alvo.weekday()]
-    dia_mes = data_alvo.day
-    mes = meses_pt[data_alvo.month]
-    return f"{dia_semana} {dia_mes} {mes}"
-
-
-def extrair_mes_ano(data_str):
-    try:
-        partes = data_str.split()
-        if len(partes) >= 3:
-            mes_pt = partes[2]
-            ano = datetime.now().year
-            meses_para_numero = {
-                'Jan': 1, 'Fev': 2, 'Mar': 3, 'Abr': 4,
-                'Mai': 5, 'Jun': 6, 'Jul': 7, 'Ago': 8,
-                'Set': 9, 'Out': 10, 'Nov': 11, 'Dez': 12
-            }
-            mes_numero = meses_para_numero.get(mes_pt, 0)
-            if mes_numero == 1 and datetime.now().month == 12:
-                ano += 1
-            elif mes_numero == 12 and datetime.now().month == 1:
-                ano -= 1
-            return f"{mes_pt} {ano}"
-        return "Desconhecido"
-    except:
-        return "Desconhecido"
-
-
-def ordenar_meses(mes_ano_str):
-    try:
-        if mes_ano_str == "Desconhecido":
-            return (0, 0)
-        mes, ano = mes_ano_str.split()
-        meses_para_numero = {
-            'Jan': 1, 'Fev': 2, 'Mar': 3, 'Abr': 4,
-            'Mai': 5, 'Jun': 6, 'Jul': 7, 'Ago': 8,
-            'Set': 9, 'Out': 10, 'Nov': 11, 'Dez': 12
-        }
-        mes_numero = meses_para_numero.get(mes, 0)
-        ano_numero = int(ano)
-        return (ano_numero, mes_numero)
-    except:
-        return (0, 0)
+# Opções de motor do Pico Máximo exibidas na aba Buscar Jogos
+OPCOES_MOTOR_PICO_MAXIMO = {
+    "Monte Carlo": 'monte_carlo',
+    "Analítico (exato)": 'analitico'
+}
 
 
 # 🔥 CONFIGURAÇÃO DA PÁGINA STREAMLIT
@@ -1217,23 +244,127 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# 🔥 CAMADA DE CACHE (COMPARTILHADA ENTRE RERUNS E SESSÕES)
+def coletar_e_salvar(incremental=False):
+    """Coleta as competições (incremental: só as que podem ter resultados novos), grava no banco e mostra o
+    resultado do cache HTML. Retorna o número de jogos gravados"""
+    if incremental:
+        with st.spinner("🔄 Conferindo competições com resultados novos..."):
+            cache_html.zerar_estatisticas()
+            dados_todos, conferidas = extrair_competicoes_incrementais(carregar_jogos(), idades_coletas())
+        salvar_jogos(dados_todos)
+        registrar_verificacao(conferidas)
+    else:
+        with st.spinner("🔄 Coletando dados de 40 competições em tempo real..."):
+            cache_html.zerar_estatisticas()
+            dados_todos = extrair_todas_competicoes()
+        salvar_jogos(dados_todos)
+    stats_cache = cache_html.estatisticas()
+    st.caption(f"🗂️ Cache HTML: {stats_cache['hits']} hits | {stats_cache['revalidados']} revalidados (304) | "
+               f"{stats_cache['misses']} downloads")
+    return len(dados_todos)
+
+
+@st.cache_resource(ttl=TTL_BASE_LOCAL, show_spinner=False, max_entries=2)
+def carregar_bases(versao_base):
+    """DataFrame completo e base histórica da versão (objetos compartilhados: não alterar)"""
+    if versao_base.startswith(PREFIXO_SNAPSHOT):
+        df = carregar_snapshot(versao_base[len(PREFIXO_SNAPSHOT):])
+    else:
+        df = carregar_jogos()
+
+    # Base histórica (e o índice por equipe) montada uma vez e compartilhada pelas abas
+    return preparar_bases(df)
+
+
+@st.cache_resource(ttl=TTL_BASE_LOCAL, show_spinner=False, max_entries=2)
+def obter_analisadores(versao_base):
+    """Analisadores de Alertas e Dicas construídos sobre a base em cache"""
+    _, base_historica = carregar_bases(versao_base)
+    return AnalisadorAlertasInteligentes(base_historica), AnalisadorDicasEstatisticas(base_historica)
+
+
+@st.cache_resource(ttl=TTL_BASE_LOCAL, show_spinner=False, max_entries=4)
+def obter_analisador_pico_maximo(versao_base, motor):
+    _, base_historica = carregar_bases(versao_base)
+    return AnalisadorPicoMaximo(base_historica, motor=motor)
+
+
+@st.cache_resource(ttl=TTL_BASE_LOCAL, show_spinner=False, max_entries=2)
+def obter_base_dados(versao_base):
+    """Jogos realizados da versão, posições já ordenadas por (ordenação, crescente) e opções dos filtros"""
+    df, _ = carregar_bases(versao_base)
+    base_dados = df[df['HT'].str.contains('(', regex=False, na=False)]
+
+    # Equipes e competições em ordem alfabética (os códigos das categorias seguem a ordem dos ids)
+    chaves = pd.DataFrame({'Data Jogo': base_dados['Data Jogo'].to_numpy()})
+    for coluna in ['Competição', 'Time Casa', 'Time Visitante']:
+        categorias = base_dados[coluna].cat.categories
+        chaves[coluna] = base_dados[coluna].cat.reorder_categories(sorted(categorias)).to_numpy()
+    ordens = {
+        (rotulo, crescente): chaves.sort_values(colunas, ascending=crescente, kind='stable').index.to_numpy()
+        for rotulo, colunas in ORDENACOES_BASE_DADOS.items() for crescente in (True, False)
+    }
+
+    opcoes = {
+        'competicoes': sorted(base_dados['Competição'].unique()),
+        'times': sorted(pd.unique(base_dados[['Time Casa', 'Time Visitante']].values.ravel('K'))),
+        # Chave AAAAMM calculada na ingestão: ordenar as chaves já é a ordem cronológica
+        'meses': {rotulo_mes(chave): chave for chave in sorted(base_dados['Mês'].unique())}
+    }
+    return base_dados, ordens, opcoes
+
+
+def montar_tabela_base_dados(base_dados, posicoes):
+    """Linhas (posições) da base no formato exibido: HT limpo e colunas Casa/Fora"""
+    tabela = base_dados.iloc[posicoes][['Data', 'Competição', 'Time Casa', 'Time Visitante', 'HT', 'FT']]
+    tabela['HT'] = limpar_ht_coluna(tabela['HT'])
+    return tabela.rename(columns={'Time Casa': 'Casa', 'Time Visitante': 'Fora'})
+
+
+def limpar_caches():
+    carregar_bases.clear()
+    obter_analisadores.clear()
+    obter_analisador_pico_maximo.clear()
+    obter_base_dados.clear()
+
+
 # 🔥 EXECUÇÃO PRINCIPAL MODIFICADA - NOVA SEQUÊNCIA DE ABAS
-with st.spinner("🔄 Coletando dados de 40 competições em tempo real..."):
-    dados_todos = extrair_todas_competicoes()
+col_atualizacao, col_botao_atualizar = st.columns([4, 1])
+
+with col_botao_atualizar:
+    forcar_coleta = st.button("🔄 Atualizar dados", key="btn_atualizar_dados", use_container_width=True)
+
+manifesto_snapshot = snapshot_atual()
+if manifesto_snapshot:
+    # Atualizador em segundo plano ativo: a página só lê o último snapshot, nunca espera pela rede
+    if forcar_coleta:
+        limpar_caches()
+    idade_base = max(0.0, time.time() - manifesto_snapshot['criado_em'])
+    versao_base = PREFIXO_SNAPSHOT + manifesto_snapshot['versao']
+else:
+    # Só coleta novamente se a base local estiver vazia, desatualizada ou se o usuário pedir
+    idade_base = idade_dados_segundos()
+    if forcar_coleta or idade_base is None or idade_base > TTL_BASE_LOCAL:
+        if coletar_e_salvar(incremental=COLETA_INCREMENTAL and not forcar_coleta and idade_base is not None):
+            limpar_caches()
+        idade_base = idade_dados_segundos()
+    versao_base = versao_dados()
 
-if dados_todos:
-    df = pd.DataFrame(dados_todos)
+with col_atualizacao:
+    if idade_base is not None:
+        st.caption(f"🕒 Dados atualizados há {int(idade_base // 60)} min")
 
-    # VERIFICAÇÃO FINAL - Garantir que não há "pp." na coluna FT
-    jogos_com_pp = df[df['FT'].str.contains('pp.', na=False)]
-    if not jogos_com_pp.empty:
-        df = df[~df['FT'].str.contains('pp.', na=False)]
+with rastreador.span('app.carregar_bases'):
+    df, df_base_historica_limpo = carregar_bases(versao_base)
+
+if not df.empty:
 
     # 🔥 NOVA SEQUÊNCIA DE ABAS
     tab1, tab2, tab3, tab4 = st.tabs(
         ["🔍 BUSCAR JOGOS", "🎯 ALERTAS INTELIGENTES", "📊 DICAS ESTATÍSTICAS", "🗃️ BASE DE DADOS"])
 
-    with tab1:
+    with tab1, rastreador.span('aba.buscar_jogos'):
         # Aba "Buscar Jogos" - Partidas com coluna "HT" vazia
         df_jogos = df[df['HT'].isna() | (df['HT'] == '')]
 
@@ -1251,11 +382,10 @@ if dados_todos:
                                                       key="time_jogos")
 
             with col3:
-                df_jogos_copy = df_jogos.copy()
-                df_jogos_copy.loc[:, 'Mes_Ano'] = df_jogos_copy['Data'].apply(extrair_mes_ano)
-                meses_jogos = ["Todos os Meses"] + sorted(df_jogos_copy['Mes_Ano'].unique(),
-                                                          key=ordenar_meses)
-                mes_selecionado_jogos = st.selectbox("Filtrar por mês:", meses_jogos, key="mes_jogos")
+                # Chave AAAAMM calculada na ingestão: ordenar as chaves já é a ordem cronológica
+                meses_jogos = {rotulo_mes(chave): chave for chave in sorted(df_jogos['Mês'].unique())}
+                mes_selecionado_jogos = st.selectbox("Filtrar por mês:", ["Todos os Meses"] + list(meses_jogos),
+                                                     key="mes_jogos")
 
             # Aplicar filtros - ABA BUSCAR JOGOS
             df_jogos_filtrado = df_jogos.copy()
@@ -1270,9 +400,7 @@ if dados_todos:
                     ]
 
             if mes_selecionado_jogos != "Todos os Meses":
-                df_jogos_filtrado_copy = df_jogos_filtrado.copy()
-                df_jogos_filtrado_copy.loc[:, 'Mes_Ano'] = df_jogos_filtrado_copy['Data'].apply(extrair_mes_ano)
-                df_jogos_filtrado = df_jogos_filtrado_copy[df_jogos_filtrado_copy['Mes_Ano'] == mes_selecionado_jogos]
+                df_jogos_filtrado = df_jogos_filtrado[df_jogos_filtrado['Mês'] == meses_jogos[mes_selecionado_jogos]]
 
             # 🔥 SELEÇÃO DE PERÍODO
             st.markdown("---")
@@ -1298,37 +426,36 @@ if dados_todos:
 
             # Aplicar filtro de período
             opcoes_periodo = {
-                "Próximos 3 Dias": [0, 1, 2],
-                "Próximos 7 Dias": [0, 1, 2, 3, 4, 5, 6]
+                "Próximos 3 Dias": 3,
+                "Próximos 7 Dias": 7
             }
 
-            dias = opcoes_periodo[periodo_selecionado]
-            datas_alvo = [obter_data_por_dias(dia) for dia in dias]
-            df_jogos_filtrado_periodo = df_jogos_filtrado[df_jogos_filtrado['Data'].isin(datas_alvo)]
+            df_jogos_filtrado_periodo = jogos_proximos_dias(df_jogos_filtrado, opcoes_periodo[periodo_selecionado])
 
             # 🔥 APLICAR ANÁLISE PICO MÁXIMO
             if not df_jogos_filtrado_periodo.empty:
-                st.info("🎯 Aplicando análise Pico Máximo... Isso pode levar alguns minutos")
-
-                # Preparar base histórica para análise
-                df_base_historica = df[df['HT'].str.contains('(', regex=False, na=False)].copy()
-                df_base_historica_limpo = df_base_historica.copy()
-                df_base_historica_limpo.loc[:, 'HT'] = df_base_historica_limpo['HT'].apply(limpar_ht)
+                motor_selecionado = st.radio("Motor de probabilidades:", list(OPCOES_MOTOR_PICO_MAXIMO.keys()),
+                                             horizontal=True, key="motor_pico_maximo")
+                motor_pico_maximo = OPCOES_MOTOR_PICO_MAXIMO[motor_selecionado]
 
-                # Renomear colunas para compatibilidade
-                df_base_historica_limpo = df_base_historica_limpo.rename(columns={
-                    'Time Casa': 'Casa',
-                    'Time Visitante': 'Fora'
-                })
+                if motor_pico_maximo == 'monte_carlo':
+                    st.info("🎯 Aplicando análise Pico Máximo... Isso pode levar alguns minutos")
 
                 # Aplicar análise Pico Máximo
+                progress_bar = st.progress(0)
                 df_jogos_com_analise = adicionar_analise_pico_maximo(
                     df_jogos_filtrado_periodo.rename(columns={
                         'Time Casa': 'Casa',
                         'Time Visitante': 'Fora'
                     }),
-                    df_base_historica_limpo
+                    df_base_historica_limpo,
+                    motor=motor_pico_maximo,
+                    analisador=obter_analisador_pico_maximo(versao_base, motor_pico_maximo),
+                    semente=SEMENTE_MONTE_CARLO,
+                    processos=PROCESSOS_PICO_MAXIMO,
+                    progresso=lambda concluidos, total: progress_bar.progress(concluidos / total if total else 1.0)
                 )
+                progress_bar.empty()
 
                 # Selecionar e ordenar colunas
                 colunas_ordenadas = [
@@ -1345,8 +472,9 @@ if dados_todos:
                 colunas_existentes = [col for col in colunas_ordenadas if col in df_jogos_com_analise.columns]
                 df_jogos_final = df_jogos_com_analise[colunas_existentes]
 
-                # Ordenar por Competição
-                df_jogos_ordenado = df_jogos_final.sort_values(['Competição', 'Casa'])
+                # Ordenar por Competição (alfabética: os códigos das categorias seguem a ordem dos ids)
+                df_jogos_ordenado = df_jogos_final.sort_values(['Competição', 'Casa'],
+                                                               key=lambda coluna: coluna.astype(str))
 
                 # Exibir dataframe
                 st.dataframe(
@@ -1357,7 +485,10 @@ if dados_todos:
                 )
 
                 # Download específico para Jogos com Pico Máximo
-                csv_jogos = df_jogos_ordenado.to_csv(index=False, encoding='utf-8-sig')
+                # CSV gerado só no clique e guardado por estado dos filtros (jogos_proximos_dias depende do dia)
+                csv_jogos = csv_sob_demanda(df_jogos_ordenado, (
+                    'pico_maximo', versao_base, datetime.now().date(), competicao_selecionada_jogos,
+                    time_selecionado_jogos, mes_selecionado_jogos, periodo_selecionado, motor_pico_maximo))
                 st.download_button(
                     label=f"📥 Download Jogos Pico Máximo ({len(df_jogos_filtrado_periodo)} jogos)",
                     data=csv_jogos,
@@ -1370,7 +501,7 @@ if dados_todos:
         else:
             st.warning("Nenhum jogo futuro encontrado")
 
-    with tab2:
+    with tab2, rastreador.span('aba.alertas'):
         # 🔥 ABA: ALERTAS INTELIGENTES - CORRIGIDA E MELHORADA
         st.markdown("### 🎯 ALERTAS INTELIGENTES")
         st.markdown("**Rankings por Mercado - Baseado em Dados Históricos da Temporada**")
@@ -1378,17 +509,9 @@ if dados_todos:
         if st.button("🔄 Atualizar Alertas", key="reload_alertas", use_container_width=True):
             st.rerun()
 
-        # Preparar base histórica
-        df_base_historica = df[df['HT'].str.contains('(', regex=False, na=False)].copy()
-        df_base_historica_limpo = df_base_historica.copy()
-        df_base_historica_limpo.loc[:, 'HT'] = df_base_historica_limpo['HT'].apply(limpar_ht)
-        df_base_historica_limpo = df_base_historica_limpo.rename(columns={
-            'Time Casa': 'Casa', 'Time Visitante': 'Fora'
-        })
-
         if not df_base_historica_limpo.empty:
             # Inicializar analisador
-            analisador_alertas = AnalisadorAlertasInteligentes(df_base_historica_limpo)
+            analisador_alertas, _ = obter_analisadores(versao_base)
 
             # 🔥 FILTROS SIMPLIFICADOS
             col1, col2 = st.columns(2)
@@ -1490,7 +613,8 @@ if dados_todos:
                         st.metric("🔥 Acima de 70%", f"{acima_70} equipes")
 
                     # Download
-                    csv_alertas = pd.DataFrame(ranking_equipes).to_csv(index=False, encoding='utf-8-sig')
+                    csv_alertas = csv_sob_demanda(lambda: pd.DataFrame(ranking_equipes), (
+                        'alertas', versao_base, mercado_selecionado, competicao_selecionada))
                     st.download_button(
                         label=f"📥 Download Ranking Completo ({len(ranking_equipes)} equipes)",
                         data=csv_alertas,
@@ -1505,7 +629,7 @@ if dados_todos:
         else:
             st.error("❌ Base histórica vazia para cálculo de alertas")
 
-    with tab3:
+    with tab3, rastreador.span('aba.dicas'):
         # 🔥 ABA: DICAS ESTATÍSTICAS - CORRIGIDA
         st.markdown("### 📊 DICAS ESTATÍSTICAS - PRÓXIMOS 7 DIAS")
 
@@ -1513,21 +637,11 @@ if dados_todos:
             st.rerun()
 
         # Filtrar jogos dos próximos 7 dias
-        datas_7_dias = [obter_data_por_dias(dia) for dia in range(7)]
-        df_jogos_7_dias = df[df['HT'].isna() | (df['HT'] == '')]
-        df_jogos_7_dias = df_jogos_7_dias[df_jogos_7_dias['Data'].isin(datas_7_dias)]
+        df_jogos_7_dias = jogos_proximos_dias(df, 7)
 
         if not df_jogos_7_dias.empty:
-            # Preparar base histórica
-            df_base_historica = df[df['HT'].str.contains('(', regex=False, na=False)].copy()
-            df_base_historica_limpo = df_base_historica.copy()
-            df_base_historica_limpo.loc[:, 'HT'] = df_base_historica_limpo['HT'].apply(limpar_ht)
-            df_base_historica_limpo = df_base_historica_limpo.rename(columns={
-                'Time Casa': 'Casa', 'Time Visitante': 'Fora'
-            })
-
             # Inicializar analisador
-            analisador_dicas = AnalisadorDicasEstatisticas(df_base_historica_limpo)
+            _, analisador_dicas = obter_analisadores(versao_base)
 
             # 🔥 FILTROS PARA DICAS
             col1, col2, col3 = st.columns(3)
@@ -1561,27 +675,10 @@ if dados_todos:
 
             if len(df_jogos_analise) > 0:
                 progress_bar = st.progress(0)
-                total_jogos = len(df_jogos_analise)
-
-                for idx, jogo in df_jogos_analise.iterrows():
-                    progresso = min((idx + 1) / total_jogos, 1.0)
-                    progress_bar.progress(progresso)
-
-                    dicas = analisador_dicas.gerar_dicas_jogo(jogo['Time Casa'], jogo['Time Visitante'],
-                                                              mercado_selecionado_dicas if mercado_selecionado_dicas != "Todos" else None)
-
-                    # Filtrar por probabilidade mínima
-                    dicas_filtradas = [dica for dica in dicas if dica['probabilidade'] >= probabilidade_minima]
-
-                    if dicas_filtradas:
-                        jogos_com_dicas.append({
-                            'data': jogo['Data'],
-                            'liga': jogo['Competição'],
-                            'casa': jogo['Time Casa'],
-                            'fora': jogo['Time Visitante'],
-                            'dicas': dicas_filtradas
-                        })
-
+                jogos_com_dicas = gerar_dicas_jogos(
+                    df_jogos_analise, analisador_dicas, mercado_selecionado_dicas, probabilidade_minima,
+                    progresso=lambda concluidos, total: progress_bar.progress(concluidos / total if total else 1.0)
+                )
                 progress_bar.empty()
 
             # Exibir dicas
@@ -1627,97 +724,111 @@ if dados_todos:
         else:
             st.warning("Nenhum jogo encontrado para os próximos 7 dias")
 
-    with tab4:
+    with tab4, rastreador.span('aba.base_dados'):
         # 🔥 ABA BASE DE DADOS - CORRIGIDA
         st.markdown("### 🗃️ BASE DE DADOS HISTÓRICOS")
 
-        # Filtrar jogos com dados HT completos (jogos já realizados)
-        df_base_dados = df[df['HT'].str.contains('(', regex=False, na=False)]
+        # Jogos já realizados, ordenações e opções dos filtros calculados uma vez por versão da base
+        base_dados, ordens_base_dados, opcoes_bd = obter_base_dados(versao_base)
 
-        if not df_base_dados.empty:
+        if not base_dados.empty:
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                competicoes_bd = ["Todas"] + sorted(df_base_dados['Competição'].unique())
+                competicoes_bd = ["Todas"] + opcoes_bd['competicoes']
                 competicao_selecionada_bd = st.selectbox("Filtrar por competição:", competicoes_bd, key="comp_bd")
 
             with col2:
-                todos_times_bd = pd.unique(df_base_dados[['Time Casa', 'Time Visitante']].values.ravel('K'))
-                time_selecionado_bd = st.selectbox("Filtrar por time:", ["Todos"] + sorted(todos_times_bd),
+                time_selecionado_bd = st.selectbox("Filtrar por time:", ["Todos"] + opcoes_bd['times'],
                                                    key="time_bd")
 
             with col3:
-                df_base_dados_copy = df_base_dados.copy()
-                df_base_dados_copy.loc[:, 'Mes_Ano'] = df_base_dados_copy['Data'].apply(extrair_mes_ano)
-                meses_bd = ["Todos os Meses"] + sorted(df_base_dados_copy['Mes_Ano'].unique(),
-                                                       key=ordenar_meses)
-                mes_selecionado_bd = st.selectbox("Filtrar por mês:", meses_bd, key="mes_bd")
+                meses_bd = opcoes_bd['meses']
+                mes_selecionado_bd = st.selectbox("Filtrar por mês:", ["Todos os Meses"] + list(meses_bd),
+                                                  key="mes_bd")
 
-            # Aplicar filtros - ABA BASE DE DADOS
-            df_base_dados_filtrado = df_base_dados.copy()
+            col_ordem, col_direcao, col_tamanho = st.columns(3)
 
-            if competicao_selecionada_bd != "Todas":
-                df_base_dados_filtrado = df_base_dados_filtrado[
-                    df_base_dados_filtrado['Competição'] == competicao_selecionada_bd]
+            with col_ordem:
+                ordem_bd = st.selectbox("Ordenar por:", list(ORDENACOES_BASE_DADOS), key="ordem_bd")
 
-            if time_selecionado_bd != "Todos":
-                df_base_dados_filtrado = df_base_dados_filtrado[
-                    (df_base_dados_filtrado['Time Casa'] == time_selecionado_bd) |
-                    (df_base_dados_filtrado['Time Visitante'] == time_selecionado_bd)
-                    ]
+            with col_direcao:
+                direcao_bd = st.radio("Direção:", ["Crescente", "Decrescente"], horizontal=True, key="direcao_bd")
 
-            if mes_selecionado_bd != "Todos os Meses":
-                df_base_dados_filtrado_copy = df_base_dados_filtrado.copy()
-                df_base_dados_filtrado_copy.loc[:, 'Mes_Ano'] = df_base_dados_filtrado_copy['Data'].apply(
-                    extrair_mes_ano)
-                df_base_dados_filtrado = df_base_dados_filtrado_copy[
-                    df_base_dados_filtrado_copy['Mes_Ano'] == mes_selecionado_bd]
+            with col_tamanho:
+                tamanho_pagina_bd = st.selectbox("Jogos por página:", TAMANHOS_PAGINA_BASE_DADOS, index=1,
+                                                 key="tamanho_pagina_bd")
 
-            # Aplicar limpeza na coluna HT
-            df_base_dados_limpo = df_base_dados_filtrado.copy()
-            df_base_dados_limpo.loc[:, 'HT'] = df_base_dados_limpo['HT'].apply(limpar_ht)
+            # Aplicar filtros - ABA BASE DE DADOS (máscara sobre a base, sem copiar os jogos)
+            mascara_bd = np.ones(len(base_dados), dtype=bool)
 
-            # Selecionar e renomear colunas específicas
-            colunas_selecionadas = ['Data', 'Competição', 'Time Casa', 'Time Visitante', 'HT', 'FT']
-            df_base_dados_selecionado = df_base_dados_limpo[colunas_selecionadas].copy()
+            if competicao_selecionada_bd != "Todas":
+                mascara_bd &= (base_dados['Competição'] == competicao_selecionada_bd).to_numpy()
 
-            # Renomear as colunas
-            df_base_dados_selecionado = df_base_dados_selecionado.rename(columns={
-                'Time Casa': 'Casa',
-                'Time Visitante': 'Fora'
-            })
+            if time_selecionado_bd != "Todos":
+                mascara_bd &= ((base_dados['Time Casa'] == time_selecionado_bd) |
+                               (base_dados['Time Visitante'] == time_selecionado_bd)).to_numpy()
 
-            # Ordenar por Data e Competição
-            df_base_dados_ordenado = df_base_dados_selecionado.sort_values(['Data', 'Competição'])
+            if mes_selecionado_bd != "Todos os Meses":
+                mascara_bd &= (base_dados['Mês'] == meses_bd[mes_selecionado_bd]).to_numpy()
+
+            # Ordem pré-calculada restrita aos jogos filtrados
+            posicoes_bd = ordens_base_dados[(ordem_bd, direcao_bd == "Crescente")]
+            posicoes_bd = posicoes_bd[mascara_bd[posicoes_bd]]
+            total_bd = len(posicoes_bd)
+            total_paginas_bd = max(1, -(-total_bd // tamanho_pagina_bd))
+
+            # Filtro, ordenação ou tamanho novos voltam para a primeira página
+            estado_bd = (competicao_selecionada_bd, time_selecionado_bd, mes_selecionado_bd, ordem_bd, direcao_bd,
+                         tamanho_pagina_bd)
+            if st.session_state.get('estado_bd') != estado_bd:
+                st.session_state.estado_bd = estado_bd
+                st.session_state.pagina_bd = 1
+            st.session_state.pagina_bd = min(st.session_state.pagina_bd, total_paginas_bd)
+
+            pagina_bd = st.number_input(f"Página (de {total_paginas_bd}):", min_value=1, max_value=total_paginas_bd,
+                                        step=1, key="pagina_bd")
+
+            # Só a página visível é montada e enviada ao navegador
+            inicio_pagina_bd = (pagina_bd - 1) * tamanho_pagina_bd
+            df_pagina_bd = montar_tabela_base_dados(
+                base_dados, posicoes_bd[inicio_pagina_bd:inicio_pagina_bd + tamanho_pagina_bd])
 
             # Exibir dataframe
             st.dataframe(
-                df_base_dados_ordenado,
+                df_pagina_bd,
                 use_container_width=True,
                 hide_index=True,
                 height=600
             )
-
-            # Download específico para Base de Dados
-            csv_base_dados = df_base_dados_ordenado.to_csv(index=False, encoding='utf-8-sig')
+            if total_bd:
+                st.caption(f"Jogos {inicio_pagina_bd + 1}–{inicio_pagina_bd + len(df_pagina_bd)} de {total_bd} "
+                           f"· página {pagina_bd} de {total_paginas_bd}")
+
+            # Download específico para Base de Dados (todos os jogos filtrados, na ordem escolhida)
+            csv_base_dados = csv_sob_demanda(lambda: montar_tabela_base_dados(base_dados, posicoes_bd), (
+                'base_dados', versao_base, competicao_selecionada_bd, time_selecionado_bd, mes_selecionado_bd,
+                ordem_bd, direcao_bd))
             st.download_button(
-                label=f"📥 Download Base de Dados ({len(df_base_dados_filtrado)} jogos)",
+                label=f"📥 Download Base de Dados ({total_bd} jogos)",
                 data=csv_base_dados,
                 file_name=f"base_dados_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                 mime="text/csv",
                 key="download_base_dados"
             )
 
-            # Estatísticas da base
+            # Estatísticas da base (pelos códigos das categorias; Casa e Fora têm as mesmas categorias)
             st.markdown("---")
             col_stats1, col_stats2, col_stats3 = st.columns(3)
             with col_stats1:
-                st.metric("Total de Jogos", len(df_base_dados_filtrado))
+                st.metric("Total de Jogos", total_bd)
             with col_stats2:
-                st.metric("Competições", df_base_dados_filtrado['Competição'].nunique())
+                st.metric("Competições", np.unique(base_dados['Competição'].cat.codes.to_numpy()[mascara_bd]).size)
             with col_stats3:
-                st.metric("Times Únicos",
-                          pd.unique(df_base_dados_filtrado[['Time Casa', 'Time Visitante']].values.ravel('K')).size)
+                st.metric("Times Únicos", np.unique(np.concatenate([
+                    base_dados['Time Casa'].cat.codes.to_numpy()[mascara_bd],
+                    base_dados['Time Visitante'].cat.codes.to_numpy()[mascara_bd]
+                ])).size)
 
         else:
             st.warning("Nenhum jogo histórico encontrado na base de dados")
@@ -1725,4 +836,22 @@ if dados_todos:
 else:
     st.error("❌ Não foi possível extrair os dados. Verifique sua conexão.")
     if st.button("🔄 Tentar Novamente"):
-        st.rerun()
\ No newline at end of file
+        st.rerun()
+# 🔥 PAINEL DE DEPURAÇÃO: TEMPOS POR ETAPA (SPANS DE TODAS AS SESSÕES DESTE PROCESSO)
+if MOSTRAR_DEPURACAO or st.query_params.get('debug') == '1':
+    with st.expander("🐞 Tempos por etapa"):
+        resumo_etapas = rastreador.resumo()
+        if resumo_etapas:
+            st.dataframe(pd.DataFrame(resumo_etapas), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma etapa registrada ainda")
+
+        col_trace, col_zerar = st.columns([3, 1])
+        with col_trace:
+            st.download_button("⬇️ Baixar trace (JSON)", data=rastreador.exportar_json(),
+                               file_name=f"trace_futalgorithm_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                               mime="application/json", key="btn_trace_json")
+        with col_zerar:
+            if st.button("🧹 Zerar medições", key="btn_zerar_medicoes"):
+                rastreador.limpar()
+                st.rerun()
@@ -0,0 +1,261 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+# 🔥 ARMAZENAMENTO LOCAL DOS JOGOS (TABELA "jogos" DO dados_futebol.db)
+CAMINHO_BANCO = os.environ.get(
+    'FUTALGORITHM_BANCO',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados_futebol.db')
+)
+
+# Colunas do DataFrame do app -> colunas da tabela
+COLUNAS_TABELA = {
+    'Data': 'data',
+    'Time Casa': 'time_casa',
+    'Time Visitante': 'time_visitante',
+    'HT': 'ht',
+    'FT': 'ft',
+    'Competição': 'liga'
+}
+
+# Colunas carregadas como category, com ids estáveis da tabela nomes_ids (coluna -> tipo do nome)
+COLUNAS_CATEGORICAS = {
+    'Time Casa': 'equipe',
+    'Time Visitante': 'equipe',
+    'Competição': 'competicao'
+}
+
+# Origem dos nomes de cada tipo, com a ordem em que apareceram na tabela jogos
+ORIGENS_NOMES = {
+    'equipe': "SELECT time_casa AS nome, id * 2 AS ordem FROM jogos "
+              "UNION ALL SELECT time_visitante, id * 2 + 1 FROM jogos",
+    'competicao': "SELECT liga AS nome, id AS ordem FROM jogos"
+}
+
+
+def conectar(caminho=CAMINHO_BANCO):
+    """Abre conexão com o banco e garante a estrutura da tabela"""
+    conn = sqlite3.connect(caminho, timeout=30)
+    inicializar_banco(conn)
+    return conn
+
+
+def inicializar_banco(conn):
+    """Cria a tabela jogos (se preciso) e a chave única usada no upsert"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jogos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            liga TEXT NOT NULL,
+            data TEXT NOT NULL,
+            time_casa TEXT NOT NULL,
+            time_visitante TEXT NOT NULL,
+            ht TEXT,
+            ft TEXT,
+            data_extração TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    indice_existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_jogos_partida'"
+    ).fetchone()
+
+    if not indice_existe:
+        # Remover duplicados antigos antes de criar o índice único
+        conn.execute("""
+            DELETE FROM jogos WHERE id NOT IN (
+                SELECT MAX(id) FROM jogos GROUP BY liga, data, time_casa, time_visitante
+            )
+        """)
+        conn.execute("""
+            CREATE UNIQUE INDEX idx_jogos_partida
+            ON jogos (liga, data, time_casa, time_visitante)
+        """)
+
+    tabela_nomes_existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'nomes_ids'"
+    ).fetchone()
+
+    if not tabela_nomes_existe:
+        conn.execute("""
+            CREATE TABLE nomes_ids (
+                tipo TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                PRIMARY KEY (tipo, nome)
+            )
+        """)
+        # Bancos antigos: ids para os nomes que já estão na tabela jogos
+        sincronizar_nomes(conn)
+
+    # Última vez que cada competição foi conferida (coleta incremental: também as que não precisaram de coleta)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS verificacoes (
+            liga TEXT PRIMARY KEY,
+            verificado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Uma linha por coleta gravada, mesmo vazia ou com falha (a idade da base conta a partir da tentativa)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS coletas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            realizada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            competicoes INTEGER NOT NULL,
+            jogos INTEGER NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+def sincronizar_nomes(conn):
+    """Dá id aos nomes de equipes/competições ainda sem id, na ordem em que apareceram (ids nunca mudam)"""
+    for tipo, origem in ORIGENS_NOMES.items():
+        conn.execute(f"""
+            INSERT INTO nomes_ids (tipo, nome, id)
+            SELECT ?, nome, (SELECT COALESCE(MAX(id), -1) FROM nomes_ids WHERE tipo = ?)
+                            + ROW_NUMBER() OVER (ORDER BY primeira_ordem)
+            FROM (SELECT nome, MIN(ordem) AS primeira_ordem FROM ({origem}) GROUP BY nome)
+            WHERE nome NOT IN (SELECT nome FROM nomes_ids WHERE tipo = ?)
+        """, (tipo, tipo, tipo))
+
+
+def carregar_dicionario(conn):
+    """tipo -> nomes na ordem dos ids (posição na lista == id)"""
+    dicionario = {tipo: [] for tipo in ORIGENS_NOMES}
+    for tipo, nome in conn.execute('SELECT tipo, nome FROM nomes_ids ORDER BY tipo, id'):
+        dicionario[tipo].append(nome)
+    return dicionario
+
+
+def salvar_jogos(dados_jogos, caminho=CAMINHO_BANCO):
+    """Insere ou atualiza (upsert) os jogos coletados e registra a coleta. Retorna o número de linhas gravadas.
+
+    dados_jogos é a página completa de cada competição presente: jogos sem resultado dessas competições
+    que não vieram nela (remarcados ou adiados e retirados do site) são removidos. A coleta é registrada
+    mesmo vazia, e a versão dos dados (versao_dados) avança sempre que a tabela jogos muda.
+    """
+    registros = [
+        (jogo['Competição'], jogo['Data'], jogo['Time Casa'], jogo['Time Visitante'],
+         jogo.get('HT', ''), jogo.get('FT', ''))
+        for jogo in dados_jogos
+    ]
+
+    conn = conectar(caminho)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO coletas (competicoes, jogos) VALUES (?, ?)",
+                (len({registro[0] for registro in registros}), len(registros))
+            )
+            if registros:
+                conn.executemany("""
+                    INSERT INTO jogos (liga, data, time_casa, time_visitante, ht, ft)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (liga, data, time_casa, time_visitante) DO UPDATE SET
+                        ht = excluded.ht,
+                        ft = excluded.ft,
+                        data_extração = CURRENT_TIMESTAMP
+                """, registros)
+                remover_pendentes_ausentes(conn, registros)
+                sincronizar_nomes(conn)
+                # Dentro da transação da gravação: duas gravações nunca ficam com a mesma versão
+                versao = conn.execute('PRAGMA user_version').fetchone()[0]
+                conn.execute(f'PRAGMA user_version = {versao + 1}')
+    finally:
+        conn.close()
+
+    return len(registros)
+
+
+def remover_pendentes_ausentes(conn, registros):
+    """Remove os jogos sem resultado das competições coletadas que não estão mais na página"""
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS coletados (
+            liga TEXT, data TEXT, time_casa TEXT, time_visitante TEXT,
+            PRIMARY KEY (liga, data, time_casa, time_visitante)
+        )
+    """)
+    conn.execute("DELETE FROM coletados")
+    conn.executemany("INSERT OR IGNORE INTO coletados VALUES (?, ?, ?, ?)",
+                     [registro[:4] for registro in registros])
+    conn.execute("""
+        DELETE FROM jogos
+        WHERE COALESCE(ht, '') = ''
+          AND liga IN (SELECT DISTINCT liga FROM coletados)
+          AND NOT EXISTS (
+              SELECT 1 FROM coletados c
+              WHERE c.liga = jogos.liga AND c.data = jogos.data
+                AND c.time_casa = jogos.time_casa AND c.time_visitante = jogos.time_visitante
+          )
+    """)
+
+
+def carregar_jogos(caminho=CAMINHO_BANCO):
+    """Carrega os jogos salvos no formato da coleta; equipes e competições como category (código == id estável)"""
+    conn = conectar(caminho)
+    try:
+        colunas_sql = ', '.join(f'{coluna} AS "{nome}"' for nome, coluna in COLUNAS_TABELA.items())
+        df = pd.read_sql_query(f"SELECT {colunas_sql} FROM jogos ORDER BY id", conn)
+        dicionario = carregar_dicionario(conn)
+    finally:
+        conn.close()
+
+    df['HT'] = df['HT'].fillna('')
+    df['FT'] = df['FT'].fillna('')
+    for coluna, tipo in COLUNAS_CATEGORICAS.items():
+        df[coluna] = pd.Categorical(df[coluna], categories=dicionario[tipo])
+    return df
+
+
+def registrar_verificacao(ligas, caminho=CAMINHO_BANCO):
+    """Marca as competições como conferidas agora (coletadas ou sem resultado novo possível)"""
+    conn = conectar(caminho)
+    try:
+        with conn:
+            conn.executemany("""
+                INSERT INTO verificacoes (liga) VALUES (?)
+                ON CONFLICT (liga) DO UPDATE SET verificado_em = CURRENT_TIMESTAMP
+            """, [(liga,) for liga in ligas])
+    finally:
+        conn.close()
+
+
+def idades_coletas(caminho=CAMINHO_BANCO):
+    """Competição -> segundos desde a última coleta gravada (o upsert renova data_extração)"""
+    conn = conectar(caminho)
+    try:
+        linhas = conn.execute(
+            'SELECT liga, (julianday(\'now\') - julianday(MAX("data_extração"))) * 86400 FROM jogos GROUP BY liga'
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return dict(linhas)
+
+
+def idade_dados_segundos(caminho=CAMINHO_BANCO):
+    """Segundos desde a última coleta (mesmo vazia ou com falha) ou conferência da base (None se nunca houve)"""
+    conn = conectar(caminho)
+    try:
+        idade = conn.execute("""
+            SELECT (julianday('now') - julianday(MAX(ultima))) * 86400 FROM (
+                SELECT MAX("data_extração") AS ultima FROM jogos
+                UNION ALL SELECT MAX(realizada_em) FROM coletas
+                UNION ALL SELECT MAX(verificado_em) FROM verificacoes
+            )
+        """).fetchone()[0]
+    finally:
+        conn.close()
+
+    return idade
+
+
+def versao_dados(caminho=CAMINHO_BANCO):
+    """Identifica o conteúdo atual do banco (contador que avança a cada gravação); usado como chave de cache"""
+    conn = conectar(caminho)
+    try:
+        versao = conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+    return str(versao)
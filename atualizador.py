@@ -0,0 +1,87 @@
+import argparse
+import logging
+import time
+from functools import partial
+
+from armazenamento import CAMINHO_BANCO, carregar_jogos, idades_coletas, registrar_verificacao, salvar_jogos
+from cache_http import cache_html
+from coleta import MAX_WORKERS, extrair_competicoes_incrementais, extrair_todas_competicoes
+from coleta_async import extrair_todas_competicoes_async
+from snapshots import DIRETORIO_SNAPSHOTS, publicar_snapshot
+
+logger = logging.getLogger(__name__)
+
+# 🔥 ATUALIZADOR EM SEGUNDO PLANO: COLETA PERIÓDICA + SNAPSHOT ATÔMICO
+# Uso: python atualizador.py [--intervalo SEGUNDOS] [--uma-vez] [--motor-coleta threads|async] [--incremental]
+INTERVALO_PADRAO = 30 * 60
+
+
+def executar_atualizacao(motor_coleta='threads', max_workers=MAX_WORKERS, caminho_banco=CAMINHO_BANCO,
+                         diretorio=DIRETORIO_SNAPSHOTS, incremental=False):
+    """Uma rodada: coleta, grava no banco e publica um snapshot. Retorna a versão publicada (None se nada foi coletado).
+
+    Com incremental=True só coleta as competições que podem ter resultados novos (ver planejar_coleta_incremental).
+    """
+    inicio = time.monotonic()
+    cache_html.zerar_estatisticas()
+
+    if motor_coleta == 'async':
+        extrair = extrair_todas_competicoes_async
+    else:
+        extrair = partial(extrair_todas_competicoes, max_workers=max_workers)
+
+    if incremental:
+        dados_todos, conferidas = extrair_competicoes_incrementais(
+            carregar_jogos(caminho_banco), idades_coletas(caminho_banco), extrair=extrair)
+        salvar_jogos(dados_todos, caminho_banco)
+        registrar_verificacao(conferidas, caminho_banco)
+        if not dados_todos:
+            logger.info("Nenhuma competição com resultado novo; o último snapshot publicado continua valendo")
+            return None
+    else:
+        dados_todos = extrair()
+        # Grava mesmo vazia: a tentativa fica registrada
+        salvar_jogos(dados_todos, caminho_banco)
+        if not dados_todos:
+            logger.warning("Nenhum jogo coletado; o último snapshot publicado continua valendo")
+            return None
+
+    versao = publicar_snapshot(carregar_jogos(caminho_banco), diretorio)
+
+    stats_cache = cache_html.estatisticas()
+    logger.info("Snapshot %s publicado: %d jogos coletados em %.1fs (cache: %d hits, %d revalidados, %d downloads)",
+                versao, len(dados_todos), time.monotonic() - inicio,
+                stats_cache['hits'], stats_cache['revalidados'], stats_cache['misses'])
+    return versao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coleta os jogos periodicamente e publica snapshots para o app")
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_PADRAO,
+                        help="segundos entre o início de duas coletas (padrão: %(default)s)")
+    parser.add_argument('--uma-vez', action='store_true', help="executa uma única coleta e sai")
+    parser.add_argument('--motor-coleta', choices=['threads', 'async'], default='threads')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="threads de coleta (motor threads)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="coleta só as competições com jogos que já deveriam ter terminado")
+    parser.add_argument('--banco', default=CAMINHO_BANCO)
+    parser.add_argument('--snapshots', default=DIRETORIO_SNAPSHOTS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    while True:
+        inicio = time.monotonic()
+        try:
+            executar_atualizacao(args.motor_coleta, args.workers, args.banco, args.snapshots, args.incremental)
+        except Exception:
+            # Falha na rodada não derruba o processo: o app segue com o último snapshot bom
+            logger.exception("Falha na atualização; o último snapshot publicado continua valendo")
+
+        if args.uma_vez:
+            break
+        time.sleep(max(0.0, args.intervalo - (time.monotonic() - inicio)))
+
+
+if __name__ == '__main__':
+    main()
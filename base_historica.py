@@ -0,0 +1,346 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from mercados import garantir_mercados
+
+# 🔥 CODEC DE PLACARES (HT/FT -> COLUNAS INTEIRAS, CALCULADO UMA VEZ NA INGESTÃO)
+COLUNAS_GOLS = ['Gols Casa HT', 'Gols Fora HT', 'Gols Casa FT', 'Gols Fora FT']
+
+# HT real fica entre parênteses "(1-0)"; sem parênteses aceita o formato simples "1-0"
+PADRAO_HT_PARENTESES = r'\(\s*(\d+)\s*-\s*(\d+)\s*\)'
+PADRAO_PLACAR_SIMPLES = r'^\s*(\d+)\s*-\s*(\d+)\s*$'
+PADRAO_PARENTESES = r'\([^)]*\)'
+
+
+def _extrair_placar(serie, padrao):
+    """Extrai (gols_casa, gols_fora, valido) de uma coluna de texto"""
+    partes = serie.str.extract(padrao)
+    valido = partes[0].notna() & partes[1].notna()
+    gols_casa = pd.to_numeric(partes[0], errors='coerce').fillna(0).clip(0, 127).astype(np.int8)
+    gols_fora = pd.to_numeric(partes[1], errors='coerce').fillna(0).clip(0, 127).astype(np.int8)
+    return gols_casa, gols_fora, valido.to_numpy(dtype=bool)
+
+
+def decodificar_placares(df):
+    """Adiciona as colunas int8 de gols (HT/FT) e as máscaras 'HT Válido' / 'FT Válido'.
+
+    Placares ausentes ou inválidos ficam com 0 gols e máscara False.
+    """
+    df = df.copy()
+    ht = df['HT'].fillna('').astype(str)
+    ft = df['FT'].fillna('').astype(str)
+
+    # HT: primeiro o conteúdo entre parênteses, depois o formato simples
+    casa_ht, fora_ht, valido_ht = _extrair_placar(ht, PADRAO_HT_PARENTESES)
+    casa_ht_simples, fora_ht_simples, valido_ht_simples = _extrair_placar(ht, PADRAO_PLACAR_SIMPLES)
+    usar_simples = ~valido_ht & valido_ht_simples
+    casa_ht = casa_ht.where(~usar_simples, casa_ht_simples)
+    fora_ht = fora_ht.where(~usar_simples, fora_ht_simples)
+
+    # FT: placar principal, fora dos parênteses
+    ft_limpo = ft.str.replace(PADRAO_PARENTESES, '', regex=True)
+    casa_ft, fora_ft, valido_ft = _extrair_placar(ft_limpo, PADRAO_PLACAR_SIMPLES)
+
+    df['Gols Casa HT'] = casa_ht.astype(np.int8)
+    df['Gols Fora HT'] = fora_ht.astype(np.int8)
+    df['Gols Casa FT'] = casa_ft
+    df['Gols Fora FT'] = fora_ft
+    df['HT Válido'] = valido_ht | valido_ht_simples
+    df['FT Válido'] = valido_ft
+    return df
+
+
+def garantir_placares(df):
+    """Decodifica os placares apenas se as colunas ainda não existirem"""
+    if all(coluna in df.columns for coluna in COLUNAS_GOLS + ['HT Válido', 'FT Válido']):
+        return df
+    return decodificar_placares(df)
+
+
+# 🔥 EQUIPES E COMPETIÇÕES COMO CATEGORY (MESMAS CATEGORIAS EM CASA E FORA)
+def codificar_categorias(df):
+    """Converte 'Time Casa'/'Time Visitante' (categorias compartilhadas) e 'Competição' em category.
+
+    Colunas que já chegam categóricas (carregar_jogos, com ids estáveis do banco) ficam como estão;
+    nas demais as categorias seguem a ordem de primeira aparição.
+    """
+    casa, fora = df['Time Casa'], df['Time Visitante']
+    categoricas = isinstance(casa.dtype, pd.CategoricalDtype) and casa.dtype == fora.dtype
+    if categoricas and isinstance(df['Competição'].dtype, pd.CategoricalDtype):
+        return df
+
+    df = df.copy()
+    if not categoricas:
+        codigos, equipes = pd.factorize(pd.concat([casa, fora], ignore_index=True))
+        df['Time Casa'] = pd.Categorical.from_codes(codigos[:len(df)], categories=equipes)
+        df['Time Visitante'] = pd.Categorical.from_codes(codigos[len(df):], categories=equipes)
+    if not isinstance(df['Competição'].dtype, pd.CategoricalDtype):
+        codigos, competicoes = pd.factorize(df['Competição'])
+        df['Competição'] = pd.Categorical.from_codes(codigos, categories=competicoes)
+    return df
+
+
+# 🔥 DATAS ("Sáb 5 Out", SEM ANO) -> DATETIME COM O ANO INFERIDO PELA ORDEM DA TEMPORADA
+MESES_PT = {
+    'Jan': 1, 'Fev': 2, 'Mar': 3, 'Abr': 4,
+    'Mai': 5, 'Jun': 6, 'Jul': 7, 'Ago': 8,
+    'Set': 9, 'Out': 10, 'Nov': 11, 'Dez': 12
+}
+NOMES_MESES_PT = {numero: nome for nome, numero in MESES_PT.items()}
+
+PADRAO_DIA_MES = r'(\d{1,2})\s+(\w{3})'
+
+# Entre linhas seguidas de uma competição, queda maior que isso no mês é virada de ano
+SALTO_VIRADA_ANO = 6
+
+
+def decodificar_datas(df, referencia=None):
+    """Adiciona 'Data Jogo' (datetime64) e 'Mês' (chave int AAAAMM, 0 se a data for ilegível ou inexistente).
+
+    Cada competição vem em ordem cronológica (como na página): queda de mais de SALTO_VIRADA_ANO
+    meses entre linhas seguidas é virada de ano (e subida, volta de ano). O ano absoluto vem do
+    último jogo realizado da competição, que não pode estar depois da referência (padrão: hoje);
+    sem jogos realizados, do primeiro jogo, que não pode estar antes dela.
+    """
+    df = df.copy()
+    referencia = pd.Timestamp(referencia if referencia is not None else pd.Timestamp.now()).normalize()
+    dia_mes_referencia = referencia.month * 100 + referencia.day
+
+    partes = df['Data'].fillna('').astype(str).str.extract(PADRAO_DIA_MES)
+    dia = pd.to_numeric(partes[0], errors='coerce').to_numpy()
+    mes = partes[1].map(MESES_PT).to_numpy(dtype=float)
+    valido = ~np.isnan(dia) & ~np.isnan(mes)
+
+    datas = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+    chave_mes = np.zeros(len(df), dtype=np.int32)
+
+    if valido.any():
+        linhas = pd.DataFrame({
+            'competicao': pd.factorize(df['Competição'].to_numpy()[valido])[0],
+            'mes': mes[valido].astype(np.int64),
+            'dia': dia[valido].astype(np.int64),
+            'realizado': df['HT'].str.contains('(', regex=False, na=False).to_numpy()[valido]
+        })
+        por_competicao = linhas.groupby('competicao', sort=False)
+        salto = por_competicao['mes'].diff().fillna(0).to_numpy()
+        linhas['deslocamento'] = (salto < -SALTO_VIRADA_ANO).astype(np.int64) - (salto > SALTO_VIRADA_ANO)
+        linhas['deslocamento'] = linhas.groupby('competicao', sort=False)['deslocamento'].cumsum()
+        dia_mes = linhas['mes'] * 100 + linhas['dia']
+
+        # Ano da linha de deslocamento 0 de cada competição, a partir da âncora
+        primeiro = por_competicao.head(1)
+        ano_base = (referencia.year + (dia_mes[primeiro.index] < dia_mes_referencia)
+                    - primeiro['deslocamento']).set_axis(primeiro['competicao'])
+        ultimo_realizado = linhas[linhas['realizado']].groupby('competicao', sort=False).tail(1)
+        ano_base.loc[ultimo_realizado['competicao'].to_numpy()] = (
+            referencia.year - (dia_mes[ultimo_realizado.index] > dia_mes_referencia)
+            - ultimo_realizado['deslocamento']).to_numpy()
+
+        ano = ano_base.loc[linhas['competicao']].to_numpy() + linhas['deslocamento'].to_numpy()
+        datas[valido] = pd.to_datetime(pd.DataFrame({'year': ano, 'month': linhas['mes'], 'day': linhas['dia']}),
+                                       errors='coerce').to_numpy()
+        # Dia inexistente no ano inferido (ex.: 29 Fev em ano não bissexto): sem data, também sem mês
+        chave_mes[valido] = np.where(np.isnat(datas[valido]), 0, ano * 100 + linhas['mes'].to_numpy())
+
+    df['Data Jogo'] = datas
+    df['Mês'] = chave_mes
+    return df
+
+
+def garantir_datas(df, referencia=None):
+    """Decodifica as datas apenas se as colunas ainda não existirem"""
+    if 'Data Jogo' in df.columns and 'Mês' in df.columns:
+        return df
+    return decodificar_datas(df, referencia)
+
+
+def rotulo_mes(chave_mes):
+    """Chave AAAAMM -> "Out 2025" ("Desconhecido" para 0)"""
+    ano, mes = divmod(int(chave_mes), 100)
+    return f"{NOMES_MESES_PT[mes]} {ano}" if mes in NOMES_MESES_PT else "Desconhecido"
+
+
+def limpar_ht_coluna(serie):
+    """Versão vetorizada do antigo limpar_ht: remove o trecho entre parênteses (se sobrar algo).
+
+    A regex roda uma vez por valor distinto (há poucos placares diferentes) e é espalhada pelos códigos.
+    """
+    codigos, distintos = pd.factorize(serie)
+    distintos = pd.Series(distintos, dtype=serie.dtype)
+    limpo = distintos.str.replace(PADRAO_PARENTESES, '', regex=True).str.strip()
+    limpo = limpo.where(limpo.fillna('') != '', distintos)
+    return pd.Series(limpo.array.take(codigos, allow_fill=True), index=serie.index, name=serie.name,
+                     dtype=serie.dtype)
+
+
+# 🔥 BASE HISTÓRICA USADA PELOS ANALISADORES
+def preparar_jogos(df, referencia=None):
+    """Remove adiados (pp.) e decodifica placares, datas e categorias (só o que ainda não estiver decodificado)"""
+    # VERIFICAÇÃO FINAL - Garantir que não há "pp." na coluna FT
+    adiados = df['FT'].str.contains('pp.', na=False)
+    if adiados.any():
+        df = df[~adiados]
+
+    # Placares HT/FT (int8), resultado de cada mercado (bool), data com ano inferido (datetime64 + chave
+    # de mês) e equipes/competições como category decodificados uma única vez
+    return garantir_datas(garantir_mercados(garantir_placares(codificar_categorias(df))), referencia)
+
+
+def preparar_base_historica(df):
+    """Jogos já realizados (HT com parênteses), com HT limpo e colunas Casa/Fora"""
+    df_base_historica = df[df['HT'].str.contains('(', regex=False, na=False)]
+    df_base_historica = garantir_placares(df_base_historica)
+    df_base_historica.loc[:, 'HT'] = limpar_ht_coluna(df_base_historica['HT'])
+    return df_base_historica.rename(columns={
+        'Time Casa': 'Casa',
+        'Time Visitante': 'Fora'
+    })
+
+
+# 🔥 (EQUIPE, JOGO): MANDANTES E DEPOIS VISITANTES, COM CÓDIGO INTEIRO POR EQUIPE
+def expandir_equipes(dados, coluna_casa='Casa', coluna_fora='Fora'):
+    """Códigos das equipes de cada linha como mandante e depois como visitante (sem repetir casa == fora).
+
+    Retorna (codigos, nomes, fora_distinto): códigos na ordem de primeira aparição (-1 = equipe ausente).
+    Com as colunas categóricas da ingestão a comparação e a fatoração usam os ids inteiros.
+    """
+    casa, fora = dados[coluna_casa], dados[coluna_fora]
+    if not (isinstance(casa.dtype, pd.CategoricalDtype) and casa.dtype == fora.dtype):
+        casa, fora = casa.to_numpy(), fora.to_numpy()
+        fora_distinto = fora != casa
+        codigos, nomes = pd.factorize(np.concatenate([casa, fora[fora_distinto]]))
+        return codigos, nomes, fora_distinto
+
+    ids_casa, ids_fora = casa.cat.codes.to_numpy(), fora.cat.codes.to_numpy()
+    fora_distinto = ids_fora != ids_casa
+    codigos, ids = pd.factorize(np.concatenate([ids_casa, ids_fora[fora_distinto]]))
+    ausente = np.flatnonzero(ids < 0)
+    if len(ausente):
+        codigos = np.where(codigos == ausente[0], -1, codigos - (codigos > ausente[0]))
+        ids = np.delete(ids, ausente[0])
+    return codigos, casa.cat.categories[ids], fora_distinto
+
+
+# 🔥 ÍNDICE EQUIPE -> POSIÇÕES DOS JOGOS (MONTADO UMA VEZ POR BASE)
+class IndiceEquipes:
+    """Posições (iloc) dos jogos de cada equipe, na ordem cronológica das linhas da base"""
+
+    def __init__(self, dados, coluna_casa='Casa', coluna_fora='Fora'):
+        # Cada jogo entra uma vez para o mandante e uma vez para o visitante
+        codigos, nomes, fora_distinto = expandir_equipes(dados, coluna_casa, coluna_fora)
+        linhas = np.arange(len(dados))
+        posicoes = np.concatenate([linhas, linhas[fora_distinto]])
+
+        validos = codigos >= 0
+        codigos, posicoes = codigos[validos], posicoes[validos]
+
+        # Ordena por equipe e, dentro da equipe, pela posição da linha
+        ordem = np.lexsort((posicoes, codigos))
+        cortes = np.flatnonzero(np.diff(codigos[ordem])) + 1
+        grupos = np.split(posicoes[ordem], cortes) if len(ordem) else []
+        self._posicoes = dict(zip(nomes, grupos))
+
+    def posicoes(self, equipe, ultimos=None):
+        """Posições dos jogos da equipe (apenas os últimos N se informado)"""
+        posicoes = self._posicoes.get(equipe)
+        if posicoes is None:
+            return np.empty(0, dtype=np.int64)
+        if ultimos is None:
+            return posicoes
+        return posicoes[max(len(posicoes) - ultimos, 0):]
+
+
+_indices = {}
+_impressoes = {}
+_lock_objetos = threading.RLock()
+
+
+def derivado_por_objeto(cache, dados, construir):
+    """Valor derivado do DataFrame, calculado uma vez por objeto e descartado junto com ele"""
+    chave = id(dados)
+    with _lock_objetos:
+        valor = cache.get(chave)
+        if valor is None:
+            valor = construir(dados)
+            cache[chave] = valor
+            # Descarta o valor quando o DataFrame deixar de existir
+            weakref.finalize(dados, cache.pop, chave, None)
+        return valor
+
+
+def obter_indice_equipes(dados):
+    """Índice da base, compartilhado por todos os analisadores que usam o mesmo DataFrame"""
+    return derivado_por_objeto(_indices, dados, IndiceEquipes)
+
+
+# 🔥 CACHE COMPARTILHADO DE ESTATÍSTICAS (CHAVE: TIPO, EQUIPE, JANELA E VERSÃO DA BASE)
+MAX_ITENS_CACHE_ESTATISTICAS = 20000
+
+
+def _calcular_impressao(dados):
+    hashes = pd.util.hash_pandas_object(dados, index=False).to_numpy()
+    resumo = hashlib.blake2b(digest_size=16)
+    resumo.update(repr(list(dados.columns)).encode('utf-8'))
+    resumo.update(hashes.tobytes())
+    return resumo.hexdigest()
+
+
+def impressao_digital(dados):
+    """Hash do conteúdo da base: muda apenas quando o histórico muda de fato"""
+    return derivado_por_objeto(_impressoes, dados, _calcular_impressao)
+
+
+class CacheEstatisticas:
+    """LRU thread-safe. A chave já contém a versão da base, então nada precisa ser invalidado:
+    entradas de bases antigas simplesmente deixam de ser usadas e saem pelo LRU"""
+
+    def __init__(self, max_itens=MAX_ITENS_CACHE_ESTATISTICAS):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self._contadores = {'hits': 0, 'misses': 0}
+
+    def obter(self, chave, calcular):
+        """Valor salvo para a chave ou o resultado de calcular() (que passa a ser salvo)"""
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self._contadores['hits'] += 1
+                return self._itens[chave]
+
+        valor = calcular()
+
+        with self._lock:
+            self._contadores['misses'] += 1
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+        return valor
+
+    def estatisticas(self):
+        with self._lock:
+            return dict(self._contadores, itens=len(self._itens))
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            for tipo in self._contadores:
+                self._contadores[tipo] = 0
+
+
+# Instância compartilhada por todos os analisadores (sobrevive aos reruns do Streamlit)
+cache_estatisticas = CacheEstatisticas()
+
+
+def memorizar(dados, tipo, equipe, janela, calcular):
+    """Resultado de calcular() para (tipo, equipe, janela) na versão atual da base.
+
+    O valor devolvido é compartilhado entre chamadas e não deve ser alterado.
+    """
+    return cache_estatisticas.obter((impressao_digital(dados), tipo, equipe, janela), calcular)
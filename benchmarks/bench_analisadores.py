@@ -0,0 +1,147 @@
+"""Benchmark dos analisadores em bases sintéticas de várias escalas.
+
+Para cada escala (jogos realizados) gera uma base com benchmarks.gerador e
+mede, a frio (caches de estatísticas e índices vazios a cada repetição):
+ingestão (preparar_bases), Pico Máximo nos dois motores (e o Monte Carlo
+dividido entre processos), Dicas de todos os
+jogos futuros, ranking dos Alertas em todos os mercados e o parsing de
+páginas HTML com o mesmo número de jogos. Reporta o tempo mediano, a vazão
+e o pico de memória (tracemalloc, numa execução separada da cronometrada;
+buffers alocados pelo pyarrow fora do Python não entram na conta).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_analisadores
+    python -m benchmarks.bench_analisadores --escalas 1000,10000 --repeticoes 5 --simulacoes 20000
+    python -m benchmarks.bench_analisadores --etapas "pico máximo monte carlo,pico máximo monte carlo (processos)" --processos 8
+"""
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+from analisadores import NUM_SIMULACOES, AnalisadorAlertasInteligentes, AnalisadorDicasEstatisticas, \
+    AnalisadorPicoMaximo, simular_lote_paralelo
+from analise_jogos import preparar_bases
+from base_historica import cache_estatisticas
+from benchmarks.bench_parser import gerar_pagina_resultados
+from benchmarks.gerador import confrontos_futuros, gerar_base_sintetica
+from coleta import extrair_jogos_html
+
+ESCALAS_PADRAO = (1_000, 10_000, 100_000)
+JOGOS_POR_PAGINA = 380
+
+
+def _pico_maximo(motor, num_simulacoes, processos=1):
+    def executar(contexto):
+        analisador = AnalisadorPicoMaximo(contexto['base'], motor=motor)
+        return analisador.calcular_probabilidades_lote(contexto['confrontos'], num_simulacoes=num_simulacoes,
+                                                       semente=0, processos=processos)
+    return executar
+
+
+def _dicas(contexto):
+    analisador = AnalisadorDicasEstatisticas(contexto['base'])
+    return [analisador.gerar_dicas_jogo(casa, fora) for casa, fora in contexto['confrontos']]
+
+
+def _alertas(contexto):
+    analisador = AnalisadorAlertasInteligentes(contexto['base'])
+    return [analisador.gerar_ranking_mercado(mercado) for mercado in analisador.mercados]
+
+
+def _parsing(contexto):
+    return [extrair_jogos_html(pagina, 'Liga') for pagina in contexto['paginas']]
+
+
+def etapas(num_simulacoes, processos=1):
+    """nome -> (função(contexto), unidade, chave do contexto com os itens processados)"""
+    return {
+        'ingestão': (lambda contexto: preparar_bases(contexto['bruto']), 'jogos', 'bruto'),
+        'pico máximo analítico': (_pico_maximo('analitico', num_simulacoes), 'confrontos', 'confrontos'),
+        'pico máximo monte carlo': (_pico_maximo('monte_carlo', num_simulacoes), 'confrontos', 'confrontos'),
+        'pico máximo monte carlo (processos)': (_pico_maximo('monte_carlo', num_simulacoes, processos), 'confrontos',
+                                                'confrontos'),
+        'dicas': (_dicas, 'confrontos', 'confrontos'),
+        'alertas (todos os mercados)': (_alertas, 'jogos', 'base'),
+        'parsing html': (_parsing, 'jogos', 'jogos_html'),
+    }
+
+
+def montar_contexto(escala, semente=0):
+    bruto = gerar_base_sintetica(escala, semente=semente)
+    _, base = preparar_bases(bruto)
+    num_paginas = -(-escala // JOGOS_POR_PAGINA)
+    return {
+        'bruto': bruto,
+        'base': base,
+        'confrontos': confrontos_futuros(bruto),
+        'paginas': [gerar_pagina_resultados(JOGOS_POR_PAGINA, seed=i) for i in range(num_paginas)],
+        'jogos_html': range(num_paginas * JOGOS_POR_PAGINA),
+    }
+
+
+def _a_frio(contexto):
+    """Zera o cache de estatísticas e troca a base por uma cópia (índices são refeitos)"""
+    cache_estatisticas.limpar()
+    return dict(contexto, base=contexto['base'].copy())
+
+
+def medir(funcao, contexto, repeticoes=3, memoria=True):
+    """(tempo mediano em s, pico de memória em MB ou None) de funcao(contexto), sempre a frio"""
+    amostras = []
+    for _ in range(repeticoes):
+        contexto_frio = _a_frio(contexto)
+        inicio = time.perf_counter()
+        funcao(contexto_frio)
+        amostras.append(time.perf_counter() - inicio)
+    if not memoria:
+        return statistics.median(amostras), None
+
+    contexto_frio = _a_frio(contexto)
+    tracemalloc.start()
+    try:
+        funcao(contexto_frio)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(amostras), pico / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', default=','.join(map(str, ESCALAS_PADRAO)),
+                        help='Jogos realizados por base, separados por vírgula')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--simulacoes', type=int, default=NUM_SIMULACOES, help='Simulações do Monte Carlo por jogo')
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1,
+                        help='Processos da etapa de Monte Carlo em paralelo (padrão: um por núcleo)')
+    parser.add_argument('--etapas', help='Etapas a medir, separadas por vírgula (padrão: todas)')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--sem-memoria', action='store_true',
+                        help='Pula a execução com tracemalloc (bem mais lenta nas etapas em Python puro)')
+    args = parser.parse_args()
+
+    todas = etapas(args.simulacoes, args.processos)
+    selecionadas = [nome.strip() for nome in args.etapas.split(',')] if args.etapas else list(todas)
+    desconhecidas = [nome for nome in selecionadas if nome not in todas]
+    if desconhecidas:
+        parser.error(f"etapas desconhecidas: {', '.join(desconhecidas)} (disponíveis: {', '.join(todas)})")
+
+    # Processos do pool (spawn) iniciados fora da medição: a subida é paga uma vez por execução do app
+    if 'pico máximo monte carlo (processos)' in selecionadas:
+        simular_lote_paralelo([], [], processos=args.processos)
+
+    print(f"{'escala':>8}  {'etapa':<36} {'tempo':>10} {'vazão':>25} {'memória':>11}")
+    for escala in (int(valor) for valor in args.escalas.split(',')):
+        contexto = montar_contexto(escala, args.semente)
+        for nome in selecionadas:
+            funcao, unidade, chave = todas[nome]
+            tempo, pico_mb = medir(funcao, contexto, args.repeticoes, memoria=not args.sem_memoria)
+            vazao = len(contexto[chave]) / tempo if tempo > 0 else float('inf')
+            memoria = f"{pico_mb:8.1f} MB" if pico_mb is not None else f"{'-':>11}"
+            print(f"{escala:>8}  {nome:<36} {tempo * 1000:8.1f}ms {vazao:>12,.0f} {unidade + '/s':<12} {memoria}")
+
+
+if __name__ == '__main__':
+    main()
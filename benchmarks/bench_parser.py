@@ -0,0 +1,122 @@
+"""Benchmark do parsing das páginas de resultados.
+
+Compara, por página, o BeautifulSoup com árvore completa, o BeautifulSoup
+restrito por SoupStrainer e o extrator em streaming (extrair_jogos_html),
+conferindo que os três devolvem exatamente os mesmos jogos.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_parser
+    python -m benchmarks.bench_parser --paginas .cache_html --repeticoes 10
+"""
+import argparse
+import glob
+import gzip
+import os
+import random
+import statistics
+import time
+
+from coleta import extrair_jogos_html, extrair_jogos_html_bs4
+
+DIAS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+MESES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def gerar_pagina_resultados(num_jogos=380, num_times=20, seed=0):
+    """Página sintética no formato results.asp?pmtype=bydate do soccerstats"""
+    rng = random.Random(seed)
+    times = [f"Team {i}" for i in range(num_times)]
+    linhas = []
+    for i in range(num_jogos):
+        if i % 10 == 0:
+            linhas.append(f'<tr class="even"><td colspan="7" class="rodada"><b>Round {i // 10 + 1}</b></td></tr>')
+        casa, fora = rng.sample(times, 2)
+        data = f"{rng.choice(DIAS)} {rng.randint(1, 28)} {rng.choice(MESES)}"
+        if i < num_jogos * 0.85:
+            gols_ht = (rng.randint(0, 2), rng.randint(0, 2))
+            ft = f"{gols_ht[0] + rng.randint(0, 2)} - {gols_ht[1] + rng.randint(0, 2)}"
+            ht = f"({gols_ht[0]}-{gols_ht[1]})"
+        else:
+            ft, ht = f"{rng.randint(12, 21)}:{rng.choice(['00', '30', '45'])}", ''
+        linhas.append(f"""<tr class="odd" height="32">
+  <td align="right" style="font-size:13px;">{data}</td>
+  <td align="right"><a href="teamstats.asp?league=x&amp;stats={casa}">{casa}</a></td>
+  <td align="center"><b><font color="blue">{ft}</font></b></td>
+  <td align="left"><a href="teamstats.asp?league=x&amp;stats={fora}">{fora}</a></td>
+  <td><img src="images/spacer.gif" width="5"><br></td>
+  <td align="center"><font size="1" color="gray">{ht}</font></td>
+  <td><a class="button" href="pmatch.asp?league=x&amp;id={i}">stats</a></td>
+</tr>""")
+
+    menu = '\n'.join(f'<li><a href="latest.asp?league=l{i}">League {i}</a> <span class="flag"></span></li>'
+                     for i in range(600))
+    return f"""<!DOCTYPE html><html><head><title>Results</title>
+<script>var x = "<tr class='odd'>";</script><style>td {{ padding: 2px; }}</style></head>
+<body><ul id="menu">{menu}</ul><!-- resultados -->
+<table id="btable" width="100%">{''.join(linhas)}</table>
+<div class="footer">&copy; soccerstats</div></body></html>""".encode('utf-8')
+
+
+def carregar_paginas(diretorio):
+    """Páginas gravadas (.html ou .html.gz, como no .cache_html)"""
+    paginas = []
+    for caminho in sorted(glob.glob(os.path.join(diretorio, '*.html')) + glob.glob(os.path.join(diretorio, '*.html.gz'))):
+        abrir = gzip.open if caminho.endswith('.gz') else open
+        with abrir(caminho, 'rb') as arquivo:
+            paginas.append((os.path.basename(caminho), arquivo.read()))
+    return paginas
+
+
+METODOS = {
+    'bs4 (árvore completa)': lambda conteudo: extrair_jogos_html_bs4(conteudo, 'Liga'),
+    'bs4 + SoupStrainer': lambda conteudo: extrair_jogos_html_bs4(conteudo, 'Liga', somente_linhas=True),
+    'extrator streaming': lambda conteudo: extrair_jogos_html(conteudo, 'Liga'),
+}
+
+
+def medir(paginas, repeticoes=5):
+    """Tempo mediano por página (ms) de cada método, conferindo resultados idênticos"""
+    tempos = {nome: [] for nome in METODOS}
+    for nome_pagina, conteudo in paginas:
+        referencia = None
+        for nome, metodo in METODOS.items():
+            amostras = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                jogos = metodo(conteudo)
+                amostras.append(time.perf_counter() - inicio)
+            if referencia is None:
+                referencia = jogos
+            elif jogos != referencia:
+                raise AssertionError(f"{nome} divergiu do BeautifulSoup em {nome_pagina}")
+            tempos[nome].append(statistics.median(amostras) * 1000)
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paginas', help='Diretório com páginas gravadas (.html / .html.gz)')
+    parser.add_argument('--sinteticas', type=int, default=5, help='Número de páginas sintéticas')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.paginas:
+        paginas = carregar_paginas(args.paginas)
+    else:
+        paginas = [(f"sintetica_{i}", gerar_pagina_resultados(seed=i)) for i in range(args.sinteticas)]
+
+    if not paginas:
+        parser.error('nenhuma página encontrada')
+
+    tamanho_medio = statistics.mean(len(conteudo) for _, conteudo in paginas) / 1024
+    print(f"{len(paginas)} páginas, {tamanho_medio:.0f} KB em média, {args.repeticoes} repetições")
+
+    tempos = medir(paginas, args.repeticoes)
+    base = statistics.mean(tempos['bs4 (árvore completa)'])
+    for nome, valores in tempos.items():
+        media = statistics.mean(valores)
+        print(f"{nome:<24} {media:8.2f} ms/página   {base / media:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Gerador de bases sintéticas no formato da tabela jogos.
+
+Cada liga tem equipes com força de ataque/defesa próprias; os placares FT
+saem de uma Poisson (com vantagem de mandante) e o HT é uma fração binomial
+do FT. As rodadas vão de trás para frente a partir de ontem, uma por semana,
+com pausa entre temporadas, e cada liga termina com uma rodada de jogos
+futuros (HT vazio, FT com o horário), como nas páginas coletadas.
+
+Uso:
+    from benchmarks.gerador import gerar_base_sintetica
+    df = gerar_base_sintetica(10_000, num_ligas=10)
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+DIAS_SEMANA = np.array(['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom'])
+MESES = np.array(['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez'])
+
+MEDIA_GOLS_CASA = 1.5
+MEDIA_GOLS_FORA = 1.15
+PROPORCAO_GOLS_HT = 0.45
+SEMANAS_ENTRE_TEMPORADAS = 10
+
+
+def ligas_para_escala(num_jogos):
+    """Número de ligas de uma escala: ~1 temporada por liga em 1k, várias temporadas acima disso"""
+    return int(np.clip(num_jogos // 2000, 3, 50))
+
+
+def _formatar_datas(datas):
+    datas = pd.DatetimeIndex(datas)
+    return (pd.Index(DIAS_SEMANA[datas.dayofweek]) + ' ' + datas.day.astype(str) + ' '
+            + pd.Index(MESES[datas.month - 1])).to_numpy()
+
+
+def _placares(rng, gols_casa, gols_fora, formatos_variados):
+    """Textos HT "(1-0)" e FT "2 - 1"; com formatos_variados mistura espaços e variações aceitas pela coleta"""
+    ht_casa = rng.binomial(gols_casa, PROPORCAO_GOLS_HT)
+    ht_fora = rng.binomial(gols_fora, PROPORCAO_GOLS_HT)
+    ht = '(' + pd.Index(ht_casa.astype(str)) + '-' + pd.Index(ht_fora.astype(str)) + ')'
+    ft = pd.Index(gols_casa.astype(str)) + ' - ' + pd.Index(gols_fora.astype(str))
+    if formatos_variados:
+        sorteio = rng.random(len(gols_casa))
+        ht = ht.where(sorteio >= 0.05, '( ' + pd.Index(ht_casa.astype(str)) + ' - ' + pd.Index(ht_fora.astype(str)) + ' )')
+        ft = ft.where((sorteio < 0.05) | (sorteio >= 0.10),
+                      pd.Index(gols_casa.astype(str)) + '-' + pd.Index(gols_fora.astype(str)))
+    return ht.to_numpy(), ft.to_numpy()
+
+
+def gerar_liga(rng, nome, num_jogos, times_por_liga=20, rodadas_por_temporada=None, jogos_futuros=None,
+               hoje=None, formatos_variados=True):
+    """Jogos de uma liga em ordem cronológica (realizados e depois os futuros)"""
+    hoje = hoje or date.today()
+    times = np.array([f"{nome} FC {i}" for i in range(times_por_liga)])
+    jogos_por_rodada = times_por_liga // 2
+    rodadas_por_temporada = rodadas_por_temporada or 2 * (times_por_liga - 1)
+    jogos_futuros = jogos_por_rodada if jogos_futuros is None else jogos_futuros
+
+    ataque = rng.lognormal(0, 0.25, times_por_liga)
+    defesa = rng.lognormal(0, 0.2, times_por_liga)
+
+    num_rodadas = -(-num_jogos // jogos_por_rodada) + (1 if jogos_futuros else 0)
+    ordem = np.argsort(rng.random((num_rodadas, times_por_liga)), axis=1)
+    casa = ordem[:, 0:2 * jogos_por_rodada:2].ravel()
+    fora = ordem[:, 1:2 * jogos_por_rodada:2].ravel()
+    rodada = np.repeat(np.arange(num_rodadas), jogos_por_rodada)
+
+    # Rodada 0 é a mais antiga; a última realizada é a de ontem (e a futura, entre hoje e 3 dias)
+    realizadas = num_rodadas - (1 if jogos_futuros else 0)
+    semanas_atras = (realizadas - 1 - rodada) + ((realizadas - 1 - rodada) // rodadas_por_temporada
+                                                 * SEMANAS_ENTRE_TEMPORADAS)
+    dias = np.where(rodada < realizadas, -1 - 7 * semanas_atras, rng.integers(0, 3, len(rodada)))
+    datas = np.datetime64(hoje) + dias.astype('timedelta64[D]')
+
+    passado = np.flatnonzero(rodada < realizadas)[-num_jogos:] if num_jogos else np.empty(0, dtype=np.int64)
+    futuro = np.flatnonzero(rodada >= realizadas)[:jogos_futuros]
+    selecao = np.concatenate([passado, futuro])
+
+    gols_casa = rng.poisson(MEDIA_GOLS_CASA * ataque[casa[passado]] * defesa[fora[passado]])
+    gols_fora = rng.poisson(MEDIA_GOLS_FORA * ataque[fora[passado]] * defesa[casa[passado]])
+    ht, ft = _placares(rng, gols_casa, gols_fora, formatos_variados)
+    horarios = rng.choice(['13:00', '15:30', '18:00', '20:45'], len(futuro))
+
+    return pd.DataFrame({
+        'Data': _formatar_datas(datas[selecao]),
+        'Time Casa': times[casa[selecao]],
+        'Time Visitante': times[fora[selecao]],
+        'HT': np.concatenate([ht, np.full(len(futuro), '', dtype=object)]),
+        'FT': np.concatenate([ft, horarios]),
+        'Competição': nome
+    })
+
+
+def gerar_base_sintetica(num_jogos=10_000, num_ligas=None, times_por_liga=20, rodadas_por_temporada=None,
+                         jogos_futuros=None, hoje=None, semente=0, formatos_variados=True):
+    """DataFrame com as colunas de carregar_jogos: num_jogos realizados divididos entre as ligas + jogos futuros.
+
+    rodadas_por_temporada (padrão: turno e returno) define onde entram as pausas entre temporadas;
+    jogos_futuros é por liga (padrão: uma rodada).
+    """
+    rng = np.random.default_rng(semente)
+    num_ligas = num_ligas or ligas_para_escala(num_jogos)
+    jogos_por_liga = np.full(num_ligas, num_jogos // num_ligas)
+    jogos_por_liga[:num_jogos % num_ligas] += 1
+
+    ligas = [gerar_liga(rng, f"Liga {i:02d}", int(quantidade), times_por_liga, rodadas_por_temporada,
+                        jogos_futuros, hoje, formatos_variados)
+             for i, quantidade in enumerate(jogos_por_liga)]
+    return pd.concat(ligas, ignore_index=True)
+
+
+def confrontos_futuros(df):
+    """(casa, fora) dos jogos ainda não realizados da base"""
+    futuros = df[df['HT'] == '']
+    return list(zip(futuros['Time Casa'], futuros['Time Visitante']))
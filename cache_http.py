@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+# 🔥 CACHE EM DISCO DAS PÁGINAS HTML (COM TTL POR LIGA E REVALIDAÇÃO)
+DIRETORIO_CACHE = os.environ.get(
+    'FUTALGORITHM_CACHE_HTML',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_html')
+)
+
+# Tempo (em segundos) em que uma página salva é usada sem nenhuma requisição.
+# Também é o tempo em que o app serve a base local sem coletar (app.TTL_BASE_LOCAL)
+TTL_PADRAO = 30 * 60
+
+# TTL específico por competição, ex.: {"Japão": 2 * 60 * 60}
+TTL_POR_LIGA = {}
+
+
+class CacheHTTP:
+    def __init__(self, diretorio=DIRETORIO_CACHE, ttl_padrao=TTL_PADRAO, ttl_por_liga=None):
+        self.diretorio = diretorio
+        self.ttl_padrao = ttl_padrao
+        self.ttl_por_liga = dict(TTL_POR_LIGA if ttl_por_liga is None else ttl_por_liga)
+        self._lock = threading.Lock()
+        self._contadores = {'hits': 0, 'revalidados': 0, 'misses': 0}
+
+    def ttl(self, liga):
+        """TTL da competição (ou o padrão)"""
+        return self.ttl_por_liga.get(liga, self.ttl_padrao)
+
+    def _caminhos(self, url):
+        chave = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return (os.path.join(self.diretorio, f"{chave}.html.gz"),
+                os.path.join(self.diretorio, f"{chave}.json"))
+
+    def _contar(self, tipo):
+        with self._lock:
+            self._contadores[tipo] += 1
+
+    def _gravar_atomico(self, caminho, conteudo):
+        os.makedirs(self.diretorio, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as arquivo:
+                arquivo.write(conteudo)
+            os.replace(temporario, caminho)
+        except Exception:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def ler(self, url):
+        """Retorna (conteudo, metadados) salvos para a URL, ou (None, None)"""
+        caminho_html, caminho_meta = self._caminhos(url)
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as arquivo:
+                meta = json.load(arquivo)
+            with gzip.open(caminho_html, 'rb') as arquivo:
+                conteudo = arquivo.read()
+            return conteudo, meta
+        except (OSError, ValueError):
+            return None, None
+
+    def salvar(self, url, conteudo, etag=None, last_modified=None):
+        """Salva o HTML comprimido e os metadados usados na revalidação"""
+        caminho_html, caminho_meta = self._caminhos(url)
+        meta = {'url': url, 'salvo_em': time.time(), 'etag': etag, 'last_modified': last_modified}
+        self._gravar_atomico(caminho_html, gzip.compress(conteudo))
+        self._gravar_atomico(caminho_meta, json.dumps(meta).encode('utf-8'))
+
+    def consultar(self, url, liga=None):
+        """Retorna (conteudo, metadados, fresco) da URL; conta um hit quando a entrada ainda vale"""
+        conteudo, meta = self.ler(url)
+        fresco = conteudo is not None and time.time() - meta.get('salvo_em', 0) < self.ttl(liga)
+        if fresco:
+            self._contar('hits')
+        return conteudo, meta, fresco
+
+    @staticmethod
+    def headers_condicionais(meta, headers=None):
+        """Headers da requisição com If-None-Match / If-Modified-Since da entrada salva"""
+        headers_requisicao = dict(headers or {})
+        if meta:
+            if meta.get('etag'):
+                headers_requisicao['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers_requisicao['If-Modified-Since'] = meta['last_modified']
+        return headers_requisicao
+
+    def registrar_revalidacao(self, url, meta):
+        """Resposta 304: a página salva continua válida por mais um TTL"""
+        _, caminho_meta = self._caminhos(url)
+        meta = dict(meta, salvo_em=time.time())
+        self._gravar_atomico(caminho_meta, json.dumps(meta).encode('utf-8'))
+        self._contar('revalidados')
+
+    def registrar_download(self, url, conteudo, etag=None, last_modified=None):
+        """Resposta 200: salva a nova versão da página"""
+        self.salvar(url, conteudo, etag=etag, last_modified=last_modified)
+        self._contar('misses')
+
+    def buscar(self, url, liga=None, headers=None, timeout=10, sessao=None):
+        """Retorna o HTML da URL usando o cache; revalida com ETag/If-Modified-Since quando expirado"""
+        conteudo, meta, fresco = self.consultar(url, liga)
+        if fresco:
+            return conteudo
+
+        headers_requisicao = self.headers_condicionais(meta if conteudo is not None else None, headers)
+        response = (sessao or requests).get(url, headers=headers_requisicao, timeout=timeout)
+
+        if response.status_code == 304 and conteudo is not None:
+            self.registrar_revalidacao(url, meta)
+            return conteudo
+
+        response.raise_for_status()
+        self.registrar_download(url, response.content,
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified'))
+        return response.content
+
+    def estatisticas(self):
+        """Contadores de acertos (hits), revalidações 304 e downloads completos (misses)"""
+        with self._lock:
+            return dict(self._contadores)
+
+    def zerar_estatisticas(self):
+        with self._lock:
+            for tipo in self._contadores:
+                self._contadores[tipo] = 0
+
+
+# Instância compartilhada (sobrevive aos reruns do Streamlit)
+cache_html = CacheHTTP()
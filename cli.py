@@ -0,0 +1,176 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+
+from analisadores import MOTORES_PICO_MAXIMO, AnalisadorAlertasInteligentes, AnalisadorDicasEstatisticas
+from analise_jogos import SEMENTE_MONTE_CARLO, adicionar_analise_pico_maximo, gerar_dicas_jogos, jogos_proximos_dias, \
+    preparar_bases
+from armazenamento import CAMINHO_BANCO, carregar_jogos, idades_coletas, registrar_verificacao, salvar_jogos
+from coleta import COMPETICOES, MAX_WORKERS, extrair_competicoes_incrementais, extrair_todas_competicoes
+from coleta_async import extrair_todas_competicoes_async
+from rastreamento import rastreador
+from snapshots import DIRETORIO_SNAPSHOTS, carregar_snapshot, snapshot_atual
+
+logger = logging.getLogger(__name__)
+
+# 🔥 CLI: COLETA -> ANÁLISE -> EXPORTAÇÃO (SEM STREAMLIT)
+# Ex.: python cli.py --coletar --ligas "Inglaterra,Espanha" --dias 3 --motor analitico --formato json
+ANALISES = ('pico', 'dicas', 'alertas')
+
+COLUNAS_PICO_MAXIMO = [
+    'Data', 'Competição', 'Casa', 'Fora',
+    'Casa Vence', 'Empate', 'Fora Vence',
+    'Gols HT', 'Over 0.5 HT', 'Over 1.5 HT',
+    'Casa Marca HT', 'Fora Marca HT',
+    'Gols FT', 'Over 0.5 FT', 'Over 1.5 FT', 'Over 2.5 FT',
+    'Over 3.5 FT', 'Over 4.5 FT',
+    'Casa Marca 1.5', 'Fora Marca 1.5', 'Btts FT', 'Btts & Over 2.5'
+]
+
+
+def _lista(texto):
+    return [item.strip() for item in texto.split(',') if item.strip()] if texto else []
+
+
+def carregar_dados(args, ligas):
+    """Coleta (se pedido) e carrega a base: snapshot publicado, senão o banco local"""
+    if args.coletar:
+        competicoes = {nome: url for nome, url in COMPETICOES.items() if not ligas or nome in ligas}
+        inicio = time.monotonic()
+        if args.motor_coleta == 'async':
+            extrair = extrair_todas_competicoes_async
+        else:
+            def extrair(selecionadas):
+                return extrair_todas_competicoes(selecionadas, max_workers=args.workers)
+
+        if args.incremental:
+            dados, conferidas = extrair_competicoes_incrementais(
+                carregar_jogos(args.banco), idades_coletas(args.banco), competicoes, extrair=extrair)
+        else:
+            dados = extrair(competicoes)
+        logger.info("%d jogos coletados de %d competições em %.1fs", len(dados), len(competicoes),
+                    time.monotonic() - inicio)
+        salvar_jogos(dados, args.banco)
+        if args.incremental:
+            registrar_verificacao(conferidas, args.banco)
+        return carregar_jogos(args.banco)
+
+    manifesto = snapshot_atual(args.snapshots)
+    if manifesto:
+        logger.info("Usando o snapshot %s", manifesto['versao'])
+        return carregar_snapshot(manifesto['versao'], args.snapshots)
+    return carregar_jogos(args.banco)
+
+
+def exportar(df, nome, args):
+    """Grava o DataFrame em CSV e/ou JSON no diretório de saída"""
+    caminhos = []
+    if args.formato in ('csv', 'ambos'):
+        caminhos.append(os.path.join(args.saida, f"{nome}.csv"))
+        df.to_csv(caminhos[-1], index=False, encoding='utf-8')
+    if args.formato in ('json', 'ambos'):
+        caminhos.append(os.path.join(args.saida, f"{nome}.json"))
+        df.to_json(caminhos[-1], orient='records', force_ascii=False, indent=2)
+    logger.info("%s: %d linhas -> %s", nome, len(df), ', '.join(caminhos))
+
+
+def executar(args):
+    ligas = _lista(args.ligas)
+    desconhecidas = [liga for liga in ligas if liga not in COMPETICOES]
+    if args.coletar and desconhecidas:
+        raise SystemExit(f"Competições desconhecidas: {', '.join(desconhecidas)}")
+
+    analises = _lista(args.analises) or list(ANALISES)
+    os.makedirs(args.saida, exist_ok=True)
+
+    df, base_historica = preparar_bases(carregar_dados(args, ligas))
+    if df.empty:
+        logger.warning("Base vazia: nada para analisar")
+        return 1
+
+    df_jogos = jogos_proximos_dias(df, args.dias)
+    if ligas:
+        df_jogos = df_jogos[df_jogos['Competição'].isin(ligas)]
+    logger.info("%d jogos nos próximos %d dias", len(df_jogos), args.dias)
+
+    if 'pico' in analises:
+        inicio = time.monotonic()
+        df_pico = adicionar_analise_pico_maximo(
+            df_jogos.rename(columns={'Time Casa': 'Casa', 'Time Visitante': 'Fora'}),
+            base_historica, motor=args.motor, semente=args.semente, processos=args.processos)
+        logger.info("Pico Máximo (%s, %d processos) em %.2fs", args.motor, args.processos, time.monotonic() - inicio)
+        exportar(df_pico[[coluna for coluna in COLUNAS_PICO_MAXIMO if coluna in df_pico.columns]],
+                 'pico_maximo', args)
+
+    if 'dicas' in analises:
+        jogos_com_dicas = gerar_dicas_jogos(df_jogos, AnalisadorDicasEstatisticas(base_historica),
+                                            args.mercado_dicas, args.probabilidade_minima)
+        linhas = [{
+            'Data': jogo['data'], 'Competição': jogo['liga'], 'Casa': jogo['casa'], 'Fora': jogo['fora'],
+            'Mercado': dica['mercado'], 'Probabilidade': round(dica['probabilidade'], 1),
+            'Casa %': round(dica['casa_percent'], 1), 'Fora %': round(dica['fora_percent'], 1)
+        } for jogo in jogos_com_dicas for dica in jogo['dicas']]
+        exportar(pd.DataFrame(linhas, columns=['Data', 'Competição', 'Casa', 'Fora', 'Mercado', 'Probabilidade',
+                                               'Casa %', 'Fora %']), 'dicas', args)
+
+    if 'alertas' in analises:
+        analisador_alertas = AnalisadorAlertasInteligentes(base_historica)
+        mercados = _lista(args.mercados) or list(analisador_alertas.mercados.keys())
+        equipes, ligas_ranking = [], []
+        for mercado in mercados:
+            ranking_equipes, ranking_ligas = analisador_alertas.gerar_ranking_mercado(mercado, args.competicao)
+            equipes += [dict(item, Mercado=mercado) for item in ranking_equipes]
+            ligas_ranking += [dict(item, Mercado=mercado) for item in ranking_ligas]
+        exportar(pd.DataFrame(equipes, columns=['Mercado', 'Equipe', 'Liga', 'Jogos', 'Acertos', 'Taxa', 'Últimos 5']),
+                 'alertas_equipes', args)
+        exportar(pd.DataFrame(ligas_ranking, columns=['Mercado', 'Liga', 'Taxa', 'Jogos']), 'alertas_ligas', args)
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coleta, analisa (Pico Máximo, Dicas, Alertas) e exporta CSV/JSON")
+    parser.add_argument('--coletar', action='store_true',
+                        help="coleta antes de analisar (sem isso usa o último snapshot ou o banco local)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="com --coletar, coleta só as competições com jogos que já deveriam ter terminado")
+    parser.add_argument('--ligas', help="competições separadas por vírgula (padrão: todas)")
+    parser.add_argument('--dias', type=int, default=3, help="janela de jogos futuros, em dias (padrão: %(default)s)")
+    parser.add_argument('--analises', help=f"análises separadas por vírgula: {', '.join(ANALISES)} (padrão: todas)")
+    parser.add_argument('--motor', choices=MOTORES_PICO_MAXIMO, default='analitico',
+                        help="motor de probabilidades do Pico Máximo (padrão: %(default)s)")
+    parser.add_argument('--semente', type=int, default=SEMENTE_MONTE_CARLO, help="semente do Monte Carlo")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="processos do Monte Carlo (padrão: %(default)s; 0 = um por núcleo)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="threads de coleta (motor threads)")
+    parser.add_argument('--motor-coleta', choices=['threads', 'async'], default='threads')
+    parser.add_argument('--mercados', help="mercados dos Alertas separados por vírgula (padrão: todos)")
+    parser.add_argument('--competicao', help="filtra o ranking de equipes dos Alertas por competição")
+    parser.add_argument('--mercado-dicas', help="nome do mercado das Dicas (ex.: 'Over 2.5 FT'; padrão: todos)")
+    parser.add_argument('--probabilidade-minima', type=float, default=70)
+    parser.add_argument('--formato', choices=['csv', 'json', 'ambos'], default='csv')
+    parser.add_argument('--saida', default='saida', help="diretório dos arquivos gerados (padrão: %(default)s)")
+    parser.add_argument('--banco', default=CAMINHO_BANCO)
+    parser.add_argument('--snapshots', default=DIRETORIO_SNAPSHOTS)
+    parser.add_argument('--trace', help="grava os tempos por etapa (trace JSON) neste arquivo")
+    args = parser.parse_args(argv)
+
+    args.processos = args.processos or os.cpu_count() or 1
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        return executar(args)
+    finally:
+        if args.trace:
+            rastreador.exportar_json(args.trace)
+            for linha in rastreador.resumo():
+                logger.info("%-24s %5d chamadas  total %9.1f ms  p50 %8.2f ms  p95 %8.2f ms", linha['Etapa'],
+                            linha['Chamadas'], linha['Total (ms)'], linha['p50 (ms)'], linha['p95 (ms)'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,438 @@
+import concurrent.futures
+import logging
+import random
+import re
+import threading
+import time
+from html.parser import HTMLParser
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from bs4.dammit import EntitySubstitution
+from requests.adapters import HTTPAdapter
+
+from base_historica import decodificar_datas
+from cache_http import cache_html
+from rastreamento import cronometrar, rastreador
+
+logger = logging.getLogger(__name__)
+
+# 🔥 COMPETIÇÕES MONITORADAS
+COMPETICOES = {
+    "Brasil Série A": "https://www.soccerstats.com/results.asp?league=brazil&pmtype=bydate",
+    "Brasil Série B": "https://www.soccerstats.com/results.asp?league=brazil2&pmtype=bydate",
+    "Áustria": "https://www.soccerstats.com/results.asp?league=austria&pmtype=bydate",
+    "Argentina": "https://www.soccerstats.com/results.asp?league=argentina&pmtype=bydate",
+    "Argentina D2": "https://www.soccerstats.com/results.asp?league=argentina2&pmtype=bydate",
+    "Bélgica": "https://www.soccerstats.com/results.asp?league=belgium&pmtype=bydate",
+    "Austrália": "https://www.soccerstats.com/results.asp?league=australia&pmtype=bydate",
+    "Suíça": "https://www.soccerstats.com/results.asp?league=switzerland&pmtype=bydate",
+    "República Tcheca": "https://www.soccerstats.com/results.asp?league=czechrepublic&pmtype=bydate",
+    "Alemanha": "https://www.soccerstats.com/results.asp?league=germany&pmtype=bydate",
+    "Alemanha D2": "https://www.soccerstats.com/results.asp?league=germany2&pmtype=bydate",
+    "Alemanha D3": "https://www.soccerstats.com/results.asp?league=germany3&pmtype=bydate",
+    "Dinamarca": "https://www.soccerstats.com/results.asp?league=denmark&pmtype=bydate",
+    "Inglaterra": "https://www.soccerstats.com/results.asp?league=england&pmtype=bydate",
+    "Inglaterra D2": "https://www.soccerstats.com/results.asp?league=england2&pmtype=bydate",
+    "Inglaterra D3": "https://www.soccerstats.com/results.asp?league=england3&pmtype=bydate",
+    "Inglaterra D4": "https://www.soccerstats.com/results.asp?league=england4&pmtype=bydate",
+    "Inglaterra D5": "https://www.soccerstats.com/results.asp?league=england5&pmtype=bydate",
+    "Inglaterra D15": "https://www.soccerstats.com/results.asp?league=england15&pmtype=bydate",
+    "Espanha": "https://www.soccerstats.com/results.asp?league=spain&pmtype=bydate",
+    "Espanha D2": "https://www.soccerstats.com/results.asp?league=spain2&pmtype=bydate",
+    "França": "https://www.soccerstats.com/results.asp?league=france&pmtype=bydate",
+    "França D2": "https://www.soccerstats.com/results.asp?league=france2&pmtype=bydate",
+    "Grécia": "https://www.soccerstats.com/results.asp?league=greece&pmtype=bydate",
+    "Holanda": "https://www.soccerstats.com/results.asp?league=netherlands&pmtype=bydate",
+    "Holanda D2": "https://www.soccerstats.com/results.asp?league=netherlands2&pmtype=bydate",
+    "Itália": "https://www.soccerstats.com/results.asp?league=italy&pmtype=bydate",
+    "Itália D2": "https://www.soccerstats.com/results.asp?league=italy2&pmtype=bydate",
+    "Japão": "https://www.soccerstats.com/results.asp?league=japan&pmtype=bydate",
+    "Noruega": "https://www.soccerstats.com/results.asp?league=norway&pmtype=bydate",
+    "Polônia": "https://www.soccerstats.com/results.asp?league=poland&pmtype=bydate",
+    "Portugal": "https://www.soccerstats.com/results.asp?league=portugal&pmtype=bydate",
+    "Portugal D2": "https://www.soccerstats.com/results.asp?league=portugal2&pmtype=bydate",
+    "Escócia": "https://www.soccerstats.com/results.asp?league=scotland&pmtype=bydate",
+    "Escócia D2": "https://www.soccerstats.com/results.asp?league=scotland2&pmtype=bydate",
+    "Suécia": "https://www.soccerstats.com/results.asp?league=sweden&pmtype=bydate",
+    "Turquia": "https://www.soccerstats.com/results.asp?league=turkey&pmtype=bydate",
+    "EUA MLS": "https://www.soccerstats.com/results.asp?league=usa&pmtype=bydate",
+    "EUA D2": "https://www.soccerstats.com/results.asp?league=usa2&pmtype=bydate",
+    "Canadá": "https://www.soccerstats.com/results.asp?league=canada&pmtype=bydate",
+    "Chile": "https://www.soccerstats.com/results.asp?league=chile&pmtype=bydate"
+}
+
+# 🔥 CONFIGURAÇÃO DA COLETA
+MAX_WORKERS = 10
+TIMEOUT_REQUISICAO = 10
+MAX_TENTATIVAS = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAXIMO = 8.0
+STATUS_RETENTATIVA = {429, 500, 502, 503, 504}
+
+HEADERS_PADRAO = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+
+def calcular_espera(tentativa, retry_after=None, backoff_base=BACKOFF_BASE, backoff_maximo=BACKOFF_MAXIMO):
+    """Backoff exponencial com jitter (respeita Retry-After quando informado)"""
+    if retry_after and str(retry_after).isdigit():
+        return min(backoff_maximo, float(retry_after))
+    limite = min(backoff_maximo, backoff_base * (2 ** tentativa))
+    return random.uniform(limite / 2, limite)
+
+
+# 🔥 SESSÃO HTTP COMPARTILHADA (KEEP-ALIVE + RETENTATIVAS)
+class SessaoHTTP:
+    def __init__(self, max_conexoes=MAX_WORKERS, max_tentativas=MAX_TENTATIVAS,
+                 backoff_base=BACKOFF_BASE, backoff_maximo=BACKOFF_MAXIMO):
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+
+        # Um único pool de conexões por host, dimensionado para o número de workers
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes, max_retries=0)
+        self.sessao.mount('https://', adaptador)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.headers.update(HEADERS_PADRAO)
+
+    def _espera(self, tentativa, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        return calcular_espera(tentativa, retry_after, self.backoff_base, self.backoff_maximo)
+
+    def get(self, url, headers=None, timeout=TIMEOUT_REQUISICAO):
+        """GET com retentativas para erros de conexão, timeouts e status transitórios"""
+        for tentativa in range(self.max_tentativas):
+            ultima = tentativa == self.max_tentativas - 1
+            try:
+                response = self.sessao.get(url, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if ultima:
+                    raise
+                espera = self._espera(tentativa)
+                logger.info("Falha de conexão em %s (%s), nova tentativa em %.1fs", url, e, espera)
+                time.sleep(espera)
+                continue
+
+            if response.status_code in STATUS_RETENTATIVA and not ultima:
+                espera = self._espera(tentativa, response)
+                logger.info("Status %s em %s, nova tentativa em %.1fs", response.status_code, url, espera)
+                response.close()
+                time.sleep(espera)
+                continue
+
+            return response
+
+    def close(self):
+        self.sessao.close()
+
+
+_sessao_padrao = None
+_lock_sessao = threading.Lock()
+
+
+def obter_sessao():
+    """Sessão compartilhada entre todas as threads da coleta"""
+    global _sessao_padrao
+    with _lock_sessao:
+        if _sessao_padrao is None:
+            _sessao_padrao = SessaoHTTP()
+        return _sessao_padrao
+
+
+def traduzir_data(data_ingles):
+    dias_semana = {
+        'Mon': 'Seg', 'Tue': 'Ter', 'Wed': 'Qua', 'Thu': 'Qui',
+        'Fri': 'Sex', 'Sat': 'Sáb', 'Sun': 'Dom'
+    }
+    meses = {
+        'Jan': 'Jan', 'Feb': 'Fev', 'Mar': 'Mar', 'Apr': 'Abr',
+        'May': 'Mai', 'Jun': 'Jun', 'Jul': 'Jul', 'Aug': 'Ago',
+        'Sep': 'Set', 'Oct': 'Out', 'Nov': 'Nov', 'Dec': 'Dez'
+    }
+    try:
+        data_ingles = data_ingles.replace('Percentages', '').strip()
+        partes = data_ingles.split()
+        if len(partes) == 3:
+            dia_semana_eng = partes[0]
+            dia_mes = partes[1]
+            mes_eng = partes[2]
+            dia_semana_pt = dias_semana.get(dia_semana_eng, dia_semana_eng)
+            mes_pt = meses.get(mes_eng, mes_eng)
+            return f"{dia_semana_pt} {dia_mes} {mes_pt}"
+        else:
+            return data_ingles
+    except:
+        return data_ingles
+
+
+# 🔥 EXTRATOR RÁPIDO DAS LINHAS DE RESULTADOS (SEM ÁRVORE COMPLETA)
+# Tags sem conteúdo e tags cujo texto o BeautifulSoup não devolve no get_text()
+TAGS_VAZIAS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer',
+    'track', 'wbr'
+])
+TAGS_TEXTO_IGNORADO = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+
+class ExtratorLinhasOdd(HTMLParser):
+    """Lê em streaming apenas as células (td) das linhas tr.odd.
+
+    Segue as mesmas regras do BeautifulSoup com 'html.parser' (fechamento de tags,
+    entidades, comentários), de forma que cada célula tenha o mesmo texto de
+    celula.get_text(strip=True), mas sem construir a árvore do documento.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.linhas = []
+        self._pilha = []
+        self._linhas_abertas = []
+        self._celulas_abertas = []
+        self._vazias_fechadas = []
+        self._ignorando = 0
+        self._texto = []
+
+    def _fechar_texto(self):
+        if self._texto:
+            texto = ''.join(self._texto).strip()
+            self._texto = []
+            if texto:
+                for celula in self._celulas_abertas:
+                    celula.append(texto)
+
+    def _fechar_ate(self, tag):
+        for posicao in range(len(self._pilha) - 1, -1, -1):
+            if self._pilha[posicao][0] == tag:
+                break
+        else:
+            return
+
+        while len(self._pilha) > posicao:
+            nome, item = self._pilha.pop()
+            if item is not None:
+                if nome == 'tr':
+                    self._linhas_abertas.pop()
+                else:
+                    self._celulas_abertas.pop()
+            elif nome in TAGS_TEXTO_IGNORADO:
+                self._ignorando -= 1
+
+    def handle_starttag(self, tag, attrs, fechar_vazia=True):
+        self._fechar_texto()
+        item = None
+        if tag == 'tr':
+            classes = (dict(attrs).get('class') or '').split()
+            if 'odd' in classes:
+                item = []
+                self.linhas.append(item)
+                self._linhas_abertas.append(item)
+        elif tag == 'td' and self._linhas_abertas:
+            item = []
+            for linha in self._linhas_abertas:
+                linha.append(item)
+            self._celulas_abertas.append(item)
+        elif tag in TAGS_TEXTO_IGNORADO:
+            self._ignorando += 1
+        self._pilha.append((tag, item))
+
+        if fechar_vazia and tag in TAGS_VAZIAS:
+            self._fechar_ate(tag)
+            self._vazias_fechadas.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, fechar_vazia=False)
+        self.handle_endtag(tag, verificar_vazias=False)
+
+    def handle_endtag(self, tag, verificar_vazias=True):
+        if verificar_vazias and tag in self._vazias_fechadas:
+            # Fechamento redundante de tag vazia (<br>...</br>): não encerra o texto atual
+            self._vazias_fechadas.remove(tag)
+            return
+        self._fechar_texto()
+        self._fechar_ate(tag)
+
+    def handle_data(self, data):
+        if self._celulas_abertas and not self._ignorando:
+            self._texto.append(data)
+
+    def handle_entityref(self, name):
+        caractere = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(caractere if caractere is not None else f"&{name}")
+
+    def handle_charref(self, name):
+        base, numero = (16, name[1:]) if name[:1] in ('x', 'X') else (10, name)
+        resto = ''
+        try:
+            codigo = int(numero, base)
+        except ValueError:
+            # Referência sem ';' seguida de texto: usa só a parte numérica
+            match = re.match(r'([0-9a-f]+)(.*)' if base == 16 else r'([0-9]+)(.*)', numero)
+            if match is None:
+                self.handle_data(numero)
+                return
+            codigo, resto = int(match.group(1), base), match.group(2)
+        caractere, _ = UnicodeDammit.numeric_character_reference(codigo)
+        self.handle_data(caractere)
+        self.handle_data(resto)
+
+    def handle_comment(self, data):
+        self._fechar_texto()
+
+    def handle_decl(self, decl):
+        self._fechar_texto()
+
+    def handle_pi(self, data):
+        self._fechar_texto()
+
+    def unknown_decl(self, data):
+        self._fechar_texto()
+        if data.upper().startswith('CDATA['):
+            texto = data[len('CDATA['):].strip()
+            if texto:
+                for celula in self._celulas_abertas:
+                    celula.append(texto)
+
+    def close(self):
+        super().close()
+        self._fechar_texto()
+
+
+def _montar_jogo(textos_celulas, nome_competicao):
+    """Converte os textos das células de uma linha no dict do jogo (ou None se a linha não serve)"""
+    if len(textos_celulas) < 7:
+        return None
+    data_portugues = traduzir_data(textos_celulas[0])
+    ft_result = textos_celulas[2]
+    if (any(dia in data_portugues for dia in ['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom'])
+            and any(caractere.isdigit() for caractere in data_portugues)
+            and 'pp.' not in ft_result):
+        return {
+            'Data': data_portugues,
+            'Time Casa': textos_celulas[1],
+            'Time Visitante': textos_celulas[3],
+            'HT': textos_celulas[5] if len(textos_celulas) > 5 else '',
+            'FT': ft_result,
+            'Competição': nome_competicao
+        }
+    return None
+
+
+def extrair_jogos_html(conteudo, nome_competicao):
+    """Extrai os jogos (linhas tr.odd) de uma página de resultados"""
+    with rastreador.span('coleta.parsing', competicao=nome_competicao):
+        if isinstance(conteudo, bytes):
+            conteudo = UnicodeDammit(conteudo, is_html=True).unicode_markup
+        extrator = ExtratorLinhasOdd()
+        extrator.feed(conteudo)
+        extrator.close()
+
+        dados_competicao = []
+        for linha in extrator.linhas:
+            jogo = _montar_jogo([''.join(partes) for partes in linha], nome_competicao)
+            if jogo:
+                dados_competicao.append(jogo)
+        return dados_competicao
+
+
+def extrair_jogos_html_bs4(conteudo, nome_competicao, somente_linhas=False):
+    """Versão de referência com BeautifulSoup (árvore completa ou restrita por SoupStrainer)"""
+    parse_only = SoupStrainer('tr', class_='odd') if somente_linhas else None
+    soup = BeautifulSoup(conteudo, 'html.parser', parse_only=parse_only)
+    dados_competicao = []
+    for linha in soup.find_all('tr', class_='odd'):
+        jogo = _montar_jogo([celula.get_text(strip=True) for celula in linha.find_all('td')], nome_competicao)
+        if jogo:
+            dados_competicao.append(jogo)
+    return dados_competicao
+
+
+def extrair_dados_competicao(url, nome_competicao, sessao=None):
+    try:
+        with rastreador.span('coleta.download', competicao=nome_competicao):
+            conteudo = cache_html.buscar(url, nome_competicao, timeout=TIMEOUT_REQUISICAO,
+                                         sessao=sessao or obter_sessao())
+        return extrair_jogos_html(conteudo, nome_competicao)
+    except Exception as e:
+        # Roda dentro das threads do pool, fora do contexto do Streamlit: registrar no log
+        logger.warning("⚠️ Erro em %s: %s", nome_competicao, e)
+        return []
+
+
+def extrair_todas_competicoes(competicoes=None, max_workers=MAX_WORKERS):
+    competicoes = COMPETICOES if competicoes is None else competicoes
+    sessao = obter_sessao()
+    todos_dados = []
+    with rastreador.span('coleta.total', competicoes=len(competicoes)), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(extrair_dados_competicao, url, nome, sessao): nome
+            for nome, url in competicoes.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            dados = future.result()
+            if dados:
+                todos_dados.extend(dados)
+    return todos_dados
+
+
+# 🔥 COLETA INCREMENTAL: SÓ AS COMPETIÇÕES QUE PODEM TER RESULTADOS NOVOS
+# Tempo entre o horário de início (FT dos jogos futuros, "15:30") e o resultado publicado
+DURACAO_JOGO = pd.Timedelta(hours=2, minutes=15)
+
+# Jogo sem resultado há mais tempo que isso é tratado como adiado (não força nova coleta)
+JANELA_PENDENTES = pd.Timedelta(days=3)
+
+# Toda competição é coletada de novo pelo menos uma vez nesse intervalo, em segundos (jogos novos, remarcações)
+IDADE_MAXIMA_COMPETICAO = 24 * 60 * 60
+
+PADRAO_HORARIO = r'^\s*(\d{1,2}):(\d{2})\s*$'
+
+
+@cronometrar('coleta.planejamento')
+def planejar_coleta_incremental(df, idades, competicoes=None, agora=None):
+    """Competições (nome -> url) que precisam ser coletadas de novo.
+
+    df são os jogos guardados (formato de carregar_jogos) e idades, competição -> segundos desde a
+    última coleta. Entram as competições sem coleta guardada, coletadas há mais de
+    IDADE_MAXIMA_COMPETICAO ou com jogo sem resultado (HT vazio) cujo fim previsto (data + horário +
+    DURACAO_JOGO) já passou, dentro de JANELA_PENDENTES.
+    """
+    competicoes = COMPETICOES if competicoes is None else competicoes
+    agora = pd.Timestamp(agora if agora is not None else pd.Timestamp.now())
+
+    com_resultado_novo = set()
+    if not df.empty:
+        jogos = decodificar_datas(df[['Data', 'HT', 'FT', 'Competição']], agora)
+        pendente = (jogos['HT'].fillna('').str.strip() == '').to_numpy()
+        horario = jogos['FT'].fillna('').astype(str).str.extract(PADRAO_HORARIO).astype(float).fillna(0)
+        inicio = jogos['Data Jogo'] + pd.to_timedelta(horario[0] * 60 + horario[1], unit='min')
+        terminou = pendente & (inicio + DURACAO_JOGO <= agora) & (inicio >= agora - JANELA_PENDENTES)
+        com_resultado_novo = set(jogos.loc[terminou.to_numpy(), 'Competição'])
+
+    return {
+        nome: url for nome, url in competicoes.items()
+        if nome in com_resultado_novo or idades.get(nome) is None or idades[nome] > IDADE_MAXIMA_COMPETICAO
+    }
+
+
+def extrair_competicoes_incrementais(df, idades, competicoes=None, extrair=extrair_todas_competicoes, agora=None):
+    """Coleta só as competições de planejar_coleta_incremental com extrair(competicoes).
+
+    Retorna (dados, conferidas): conferidas são as competições com a base em dia, ou seja, as que
+    não precisavam de coleta e as coletadas com sucesso (para registrar_verificacao).
+    """
+    competicoes = COMPETICOES if competicoes is None else competicoes
+    selecionadas = planejar_coleta_incremental(df, idades, competicoes, agora)
+    dados = extrair(selecionadas) if selecionadas else []
+
+    falharam = set(selecionadas) - {jogo['Competição'] for jogo in dados}
+    logger.info("Coleta incremental: %d de %d competições (%d sem resposta)", len(selecionadas), len(competicoes),
+                len(falharam))
+    return dados, [nome for nome in competicoes if nome not in falharam]
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from cache_http import cache_html
+from coleta import (COMPETICOES, HEADERS_PADRAO, MAX_TENTATIVAS, STATUS_RETENTATIVA, TIMEOUT_REQUISICAO,
+                    calcular_espera, extrair_jogos_html)
+from rastreamento import rastreador
+
+logger = logging.getLogger(__name__)
+
+# 🔥 CONFIGURAÇÃO DO MOTOR ASSÍNCRONO
+LIMITE_GLOBAL = 50
+LIMITE_POR_HOST = 8
+REQUISICOES_POR_SEGUNDO = 5.0
+RAJADA_MAXIMA = 10
+
+
+# 🔥 LIMITADOR DE TAXA (TOKEN BUCKET)
+class LimitadorTaxa:
+    def __init__(self, taxa, capacidade=None):
+        self.taxa = taxa
+        self.capacidade = capacidade if capacidade is not None else max(1.0, taxa)
+        self.tokens = self.capacidade
+        self.atualizado = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def adquirir(self):
+        """Aguarda até existir um token disponível e o consome"""
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self.tokens = min(self.capacidade, self.tokens + (agora - self.atualizado) * self.taxa)
+                self.atualizado = agora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.taxa)
+
+
+# 🔥 MOTOR DE COLETA ASSÍNCRONO
+class MotorColetaAsync:
+    def __init__(self, limite_global=LIMITE_GLOBAL, limite_por_host=LIMITE_POR_HOST,
+                 requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO, rajada=RAJADA_MAXIMA,
+                 max_tentativas=MAX_TENTATIVAS, timeout=TIMEOUT_REQUISICAO, cache=cache_html):
+        self.limite_global = limite_global
+        self.limite_por_host = limite_por_host
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.rajada = rajada
+        self.max_tentativas = max_tentativas
+        self.timeout = timeout
+        self.cache = cache
+
+        # Criados dentro do loop em executar()
+        self._semaforo_global = None
+        self._semaforos_host = {}
+        self._limitadores_host = {}
+
+    def _controles_host(self, host):
+        if host not in self._semaforos_host:
+            self._semaforos_host[host] = asyncio.Semaphore(self.limite_por_host)
+            self._limitadores_host[host] = LimitadorTaxa(self.requisicoes_por_segundo, self.rajada)
+        return self._semaforos_host[host], self._limitadores_host[host]
+
+    async def _requisitar(self, sessao, url, headers):
+        """GET com limite de concorrência, taxa por host e retentativas. Retorna (status, conteudo, headers)"""
+        semaforo_host, limitador = self._controles_host(urlsplit(url).netloc)
+
+        for tentativa in range(self.max_tentativas):
+            ultima = tentativa == self.max_tentativas - 1
+            # A espera pelo token segura só a vaga do host: a vaga global fica apenas com a requisição
+            async with semaforo_host:
+                await limitador.adquirir()
+                try:
+                    async with self._semaforo_global, sessao.get(url, headers=headers) as response:
+                        conteudo = await response.read()
+                        status, headers_resposta = response.status, response.headers
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if ultima:
+                        raise
+                    espera = calcular_espera(tentativa)
+                    logger.info("Falha de conexão em %s (%s), nova tentativa em %.1fs", url, e, espera)
+                    status = None
+
+            if status is None:
+                await asyncio.sleep(espera)
+                continue
+
+            if status in STATUS_RETENTATIVA and not ultima:
+                espera = calcular_espera(tentativa, headers_resposta.get('Retry-After'))
+                logger.info("Status %s em %s, nova tentativa em %.1fs", status, url, espera)
+                await asyncio.sleep(espera)
+                continue
+
+            return status, conteudo, headers_resposta
+
+    async def _buscar_html(self, sessao, url, nome_competicao):
+        """Mesmo fluxo do cache_html.buscar (TTL + revalidação), com requisição assíncrona"""
+        # Leitura e gravação do cache (gzip + disco) rodam fora do loop, como o parsing
+        loop = asyncio.get_running_loop()
+        conteudo, meta, fresco = await loop.run_in_executor(None, self.cache.consultar, url, nome_competicao)
+        if fresco:
+            return conteudo
+
+        headers = self.cache.headers_condicionais(meta if conteudo is not None else None)
+        status, conteudo_novo, headers_resposta = await self._requisitar(sessao, url, headers)
+
+        if status == 304 and conteudo is not None:
+            await loop.run_in_executor(None, self.cache.registrar_revalidacao, url, meta)
+            return conteudo
+
+        if status >= 400:
+            raise aiohttp.ClientError(f"HTTP {status} em {url}")
+
+        await loop.run_in_executor(None, partial(self.cache.registrar_download, url, conteudo_novo,
+                                                 etag=headers_resposta.get('ETag'),
+                                                 last_modified=headers_resposta.get('Last-Modified')))
+        return conteudo_novo
+
+    async def _extrair_competicao(self, sessao, url, nome_competicao):
+        try:
+            with rastreador.span('coleta.download', competicao=nome_competicao):
+                conteudo = await self._buscar_html(sessao, url, nome_competicao)
+            # Parsing é CPU: roda fora do loop para não travar os downloads em andamento
+            return await asyncio.get_running_loop().run_in_executor(
+                None, extrair_jogos_html, conteudo, nome_competicao)
+        except Exception as e:
+            logger.warning("⚠️ Erro em %s: %s", nome_competicao, e)
+            return []
+
+    async def executar(self, competicoes=None):
+        """Coleta todas as competições; retorna a mesma lista de dicts de extrair_todas_competicoes"""
+        competicoes = COMPETICOES if competicoes is None else competicoes
+        self._semaforo_global = asyncio.Semaphore(self.limite_global)
+        self._semaforos_host = {}
+        self._limitadores_host = {}
+
+        conector = aiohttp.TCPConnector(limit=self.limite_global, limit_per_host=self.limite_por_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=conector, timeout=timeout, headers=HEADERS_PADRAO) as sessao:
+            resultados = await asyncio.gather(*(
+                self._extrair_competicao(sessao, url, nome) for nome, url in competicoes.items()
+            ))
+
+        todos_dados = []
+        for dados in resultados:
+            if dados:
+                todos_dados.extend(dados)
+        return todos_dados
+
+
+def extrair_todas_competicoes_async(competicoes=None, **opcoes):
+    """Alternativa ao extrair_todas_competicoes (ThreadPoolExecutor) usando asyncio"""
+    with rastreador.span('coleta.total', competicoes=len(COMPETICOES if competicoes is None else competicoes)):
+        return asyncio.run(MotorColetaAsync(**opcoes).executar(competicoes))
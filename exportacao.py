@@ -0,0 +1,62 @@
+import hashlib
+import os
+import tempfile
+
+# 🔥 CSV DOS BOTÕES DE DOWNLOAD: GERADO SÓ NO CLIQUE, EM BLOCOS, GUARDADO POR ESTADO DOS FILTROS
+DIRETORIO_DOWNLOADS = os.environ.get(
+    'FUTALGORITHM_DOWNLOADS',
+    os.path.join(tempfile.gettempdir(), 'futalgorithm_downloads')
+)
+
+# Linhas serializadas por vez (a memória do to_csv fica proporcional ao bloco, não à base inteira)
+LINHAS_POR_BLOCO = 20000
+
+# Arquivos mantidos em disco (os usados há mais tempo saem primeiro)
+MAX_ARQUIVOS_DOWNLOAD = 32
+
+
+def gravar_csv_em_blocos(df, caminho, linhas_por_bloco=LINHAS_POR_BLOCO, encoding='utf-8-sig'):
+    """Grava o DataFrame em CSV (sem índice) bloco a bloco, num temporário trocado com os.replace"""
+    diretorio = os.path.dirname(caminho) or '.'
+    fd, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+    try:
+        # O BOM do utf-8-sig sai só uma vez, no início do arquivo
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as arquivo:
+            for inicio in range(0, max(len(df), 1), linhas_por_bloco):
+                df.iloc[inicio:inicio + linhas_por_bloco].to_csv(arquivo, index=False, header=inicio == 0)
+        os.replace(temporario, caminho)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _remover_antigos(diretorio, manter):
+    arquivos = [os.path.join(diretorio, nome) for nome in os.listdir(diretorio) if nome.endswith('.csv')]
+    arquivos.sort(key=lambda caminho: os.path.getmtime(caminho), reverse=True)
+    for caminho in arquivos[manter:]:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+def csv_sob_demanda(dados, chave, diretorio=DIRETORIO_DOWNLOADS, manter=MAX_ARQUIVOS_DOWNLOAD):
+    """Função sem argumentos para o data= do st.download_button (o Streamlit só a chama no clique).
+
+    dados é o DataFrame (ou uma função que o devolve); chave identifica o estado dos filtros e a
+    versão da base. O CSV de cada chave é gravado uma única vez e reaproveitado nos cliques seguintes.
+    """
+    def gerar():
+        os.makedirs(diretorio, exist_ok=True)
+        nome = hashlib.sha1(repr(chave).encode('utf-8')).hexdigest()
+        caminho = os.path.join(diretorio, f"{nome}.csv")
+        try:
+            # Já gerado: só marca como usado agora
+            os.utime(caminho)
+        except FileNotFoundError:
+            gravar_csv_em_blocos(dados() if callable(dados) else dados, caminho)
+            _remover_antigos(diretorio, manter)
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read()
+    return gerar
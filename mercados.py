@@ -0,0 +1,115 @@
+import numpy as np
+
+# 🔥 MERCADOS DECLARATIVOS: UMA FUNÇÃO VETORIZADA POR MERCADO, NA PERSPECTIVA DO MANDANTE
+# Os parâmetros dizem quais placares o mercado usa: casa_ht, fora_ht, casa_ft, fora_ft
+MERCADOS = {
+    'Casa Vence': lambda casa_ft, fora_ft: casa_ft > fora_ft,
+    'Empate': lambda casa_ft, fora_ft: casa_ft == fora_ft,
+    'Fora Vence': lambda casa_ft, fora_ft: casa_ft < fora_ft,
+    'Over 0.5 HT': lambda casa_ht, fora_ht: casa_ht + fora_ht > 0.5,
+    'Over 1.5 HT': lambda casa_ht, fora_ht: casa_ht + fora_ht > 1.5,
+    'BTTS HT': lambda casa_ht, fora_ht: (casa_ht > 0) & (fora_ht > 0),
+    'Casa Marca HT': lambda casa_ht: casa_ht > 0,
+    'Fora Marca HT': lambda fora_ht: fora_ht > 0,
+    'Over 0.5 FT': lambda casa_ft, fora_ft: casa_ft + fora_ft > 0.5,
+    'Over 1.5 FT': lambda casa_ft, fora_ft: casa_ft + fora_ft > 1.5,
+    'Over 2.5 FT': lambda casa_ft, fora_ft: casa_ft + fora_ft > 2.5,
+    'Over 3.5 FT': lambda casa_ft, fora_ft: casa_ft + fora_ft > 3.5,
+    'Over 4.5 FT': lambda casa_ft, fora_ft: casa_ft + fora_ft > 4.5,
+    'BTTS FT': lambda casa_ft, fora_ft: (casa_ft > 0) & (fora_ft > 0),
+    'BTTS & Over 2.5': lambda casa_ft, fora_ft: (casa_ft > 0) & (fora_ft > 0) & (casa_ft + fora_ft > 2.5),
+    'Casa Marca 1.5': lambda casa_ft: casa_ft >= 1.5,
+    'Fora Marca 1.5': lambda fora_ft: fora_ft >= 1.5,
+    'Casa Marca 2.5': lambda casa_ft: casa_ft >= 2.5,
+    'Fora Marca 2.5': lambda fora_ft: fora_ft >= 2.5,
+}
+
+# Mercados vistos pela equipe analisada: (mercado quando joga em casa, mercado quando joga fora).
+# None = o jogo nunca conta naquele mando
+MERCADOS_EQUIPE = {
+    'Vitorias': ('Casa Vence', 'Fora Vence'),
+    'Derrotas': ('Fora Vence', 'Casa Vence'),
+    'Marca 1.5': ('Casa Marca 1.5', 'Fora Marca 1.5'),
+    'Marca 2.5': ('Casa Marca 2.5', 'Fora Marca 2.5'),
+    'Vence em Casa': ('Casa Vence', None),
+    'Vence Fora': (None, 'Fora Vence'),
+    'Marca 1.5 em Casa': ('Casa Marca 1.5', None),
+    'Marca 1.5 Fora': (None, 'Fora Marca 1.5'),
+}
+
+# Parâmetro das funções -> coluna de gols decodificada na ingestão (base_historica.COLUNAS_GOLS)
+COLUNAS_PLACAR = {
+    'casa_ht': 'Gols Casa HT', 'fora_ht': 'Gols Fora HT',
+    'casa_ft': 'Gols Casa FT', 'fora_ft': 'Gols Fora FT',
+}
+
+PREFIXO_COLUNA_MERCADO = 'Mercado '
+
+
+def coluna_mercado(nome):
+    """Coluna bool da base com o resultado do mercado em cada jogo"""
+    return f"{PREFIXO_COLUNA_MERCADO}{nome}"
+
+
+COLUNAS_MERCADOS = [coluna_mercado(nome) for nome in MERCADOS]
+
+
+def _parametros(funcao):
+    codigo = funcao.__code__
+    return codigo.co_varnames[:codigo.co_argcount]
+
+
+def mercados_por_mando(nome):
+    """(mercado quando a equipe joga em casa, mercado quando joga fora); None se o mercado não existir"""
+    if nome in MERCADOS_EQUIPE:
+        return MERCADOS_EQUIPE[nome]
+    if nome in MERCADOS:
+        return nome, nome
+    return None
+
+
+def usa_ht(nome):
+    """Se o mercado depende do placar do intervalo (jogos sem HT válido não devem contar)"""
+    por_mando = mercados_por_mando(nome)
+    if por_mando is None:
+        return False
+    return any(parametro.endswith('_ht') for mercado in por_mando if mercado
+               for parametro in _parametros(MERCADOS[mercado]))
+
+
+# 🔥 MATRIZ JOGOS x MERCADOS (COLUNAS BOOL CALCULADAS NA INGESTÃO)
+def calcular_mercados(df):
+    """Adiciona uma coluna bool por mercado (COLUNAS_MERCADOS); requer os placares já decodificados"""
+    gols = {parametro: df[coluna].to_numpy(dtype=np.int16) for parametro, coluna in COLUNAS_PLACAR.items()}
+    return df.assign(**{
+        coluna_mercado(nome): funcao(*(gols[parametro] for parametro in _parametros(funcao)))
+        for nome, funcao in MERCADOS.items()
+    })
+
+
+def garantir_mercados(df):
+    """Calcula as colunas de mercados apenas se ainda não existirem"""
+    if all(coluna in df.columns for coluna in COLUNAS_MERCADOS):
+        return df
+    return calcular_mercados(df)
+
+
+def mercado_equipe(dados, nome, em_casa, posicoes=None):
+    """Mercado (da partida ou da equipe) nas linhas indicadas; None se o mercado não existir.
+
+    em_casa: se a equipe analisada é a mandante em cada linha.
+    """
+    por_mando = mercados_por_mando(nome)
+    if por_mando is None:
+        return None
+
+    def coluna(mercado):
+        if mercado is None:
+            return np.zeros(len(em_casa), dtype=bool)
+        valores = dados[coluna_mercado(mercado)].to_numpy(dtype=bool)
+        return valores if posicoes is None else valores[posicoes]
+
+    mercado_casa, mercado_fora = por_mando
+    if mercado_fora == mercado_casa:
+        return coluna(mercado_casa)
+    return np.where(em_casa, coluna(mercado_casa), coluna(mercado_fora))
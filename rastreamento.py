@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+# 🔥 RASTREAMENTO LEVE POR ETAPA (SPANS -> CONTAGEM E P50/P95, EXPORTÁVEL COMO TRACE JSON)
+# Desligado com FUTALGORITHM_RASTREAMENTO=0
+RASTREAMENTO_ATIVO = os.environ.get('FUTALGORITHM_RASTREAMENTO', '1') != '0'
+
+# Spans mantidos em memória (os mais antigos saem primeiro)
+MAX_SPANS = 20000
+
+
+class Rastreador:
+    """Registra a duração de cada etapa (span) em um buffer circular compartilhado entre threads"""
+
+    def __init__(self, max_spans=MAX_SPANS, ativo=RASTREAMENTO_ATIVO):
+        self.ativo = ativo
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._origem_ns = time.perf_counter_ns()
+        self._origem_epoch = time.time()
+
+    @contextmanager
+    def span(self, etapa, **atributos):
+        """Mede o bloco como uma ocorrência da etapa (exceções são registradas e propagadas)"""
+        if not self.ativo:
+            yield
+            return
+        inicio = time.perf_counter_ns()
+        erro = None
+        try:
+            yield
+        except BaseException as e:
+            erro = type(e).__name__
+            raise
+        finally:
+            duracao = time.perf_counter_ns() - inicio
+            with self._lock:
+                self._spans.append((etapa, inicio, duracao, threading.get_ident(), atributos, erro))
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def resumo(self):
+        """Por etapa: chamadas, erros, total, média, p50, p95 e máximo (ms), da mais custosa para a menos"""
+        duracoes, erros = {}, {}
+        for etapa, _, duracao, _, _, erro in self.spans():
+            duracoes.setdefault(etapa, []).append(duracao)
+            erros[etapa] = erros.get(etapa, 0) + (erro is not None)
+
+        linhas = []
+        for etapa, valores in duracoes.items():
+            ms = np.asarray(valores) / 1e6
+            p50, p95 = np.percentile(ms, [50, 95])
+            linhas.append({
+                'Etapa': etapa,
+                'Chamadas': len(ms),
+                'Erros': erros[etapa],
+                'Total (ms)': round(float(ms.sum()), 2),
+                'Média (ms)': round(float(ms.mean()), 2),
+                'p50 (ms)': round(float(p50), 2),
+                'p95 (ms)': round(float(p95), 2),
+                'Máx (ms)': round(float(ms.max()), 2)
+            })
+        linhas.sort(key=lambda linha: linha['Total (ms)'], reverse=True)
+        return linhas
+
+    def exportar_trace(self):
+        """Spans no formato Trace Event (abre no chrome://tracing / Perfetto) + o resumo por etapa"""
+        pid = os.getpid()
+        eventos = [{
+            'name': etapa,
+            'cat': etapa.split('.', 1)[0],
+            'ph': 'X',
+            'ts': (inicio - self._origem_ns) / 1e3,
+            'dur': duracao / 1e3,
+            'pid': pid,
+            'tid': tid,
+            'args': dict(atributos, erro=erro) if erro else atributos
+        } for etapa, inicio, duracao, tid, atributos, erro in self.spans()]
+        return {
+            'traceEvents': eventos,
+            'displayTimeUnit': 'ms',
+            'otherData': {'inicio_epoch': self._origem_epoch},
+            'resumo': self.resumo()
+        }
+
+    def exportar_json(self, caminho=None):
+        """Trace em JSON; grava em caminho se informado"""
+        conteudo = json.dumps(self.exportar_trace(), ensure_ascii=False, default=str)
+        if caminho:
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                arquivo.write(conteudo)
+        return conteudo
+
+    def limpar(self):
+        with self._lock:
+            self._spans.clear()
+
+
+# Instância compartilhada (coleta, analisadores, app e CLI registram no mesmo buffer)
+rastreador = Rastreador()
+
+
+def cronometrar(etapa):
+    """Decorador: cada chamada da função vira um span da etapa"""
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with rastreador.span(etapa):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from analisadores import simular_lote_em_pool
+
+# 🔥 SERVIDOR DO MONTE CARLO EM PARALELO (INICIADO POR analisadores.simular_lote_paralelo)
+# Uso interno: python -m servidor_monte_carlo PROCESSOS
+# Cada pedido (pickle na entrada) vira mensagens ('progresso', concluidos, total) e, no fim,
+# ('resultado', mercados) ou ('erro', exceção) na saída. Termina quando a entrada fecha.
+
+
+def _vigiar_servidor(pid_servidor):
+    """Inicializador dos processos do pool: saem sozinhos se o servidor morrer sem encerrar o pool"""
+    def vigiar():
+        while os.getppid() == pid_servidor:
+            time.sleep(1)
+        os._exit(1)
+
+    threading.Thread(target=vigiar, daemon=True).start()
+
+
+def servir(processos, entrada, saida):
+    def enviar(*mensagem):
+        pickle.dump(mensagem, saida)
+        saida.flush()
+
+    # spawn: o servidor não tem threads para herdar; os processos importam este módulo como __main__
+    with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_vigiar_servidor, initargs=(os.getpid(),)) as pool:
+        # No spawn os processos sobem sob demanda: uma tarefa vazia por processo sobe todos agora
+        for tarefa in [pool.submit(os.getpid) for _ in range(processos)]:
+            tarefa.result()
+
+        while True:
+            try:
+                pedido = pickle.load(entrada)
+            except EOFError:
+                return
+            try:
+                enviar('resultado', simular_lote_em_pool(
+                    pool, *pedido, progresso=lambda concluidos, total: enviar('progresso', concluidos, total)))
+            except Exception as e:
+                enviar('erro', e)
+                if isinstance(e, BrokenProcessPool):
+                    return
+
+
+def main():
+    # Pedidos e respostas em descritores próprios, que os processos do pool não herdam: se o servidor
+    # morrer, quem chamou vê o fim da saída. A saída padrão (prints e avisos) passa a ser o stderr
+    entrada = os.fdopen(os.dup(sys.stdin.fileno()), 'rb')
+    saida = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    with open(os.devnull, 'rb') as nulo:
+        os.dup2(nulo.fileno(), sys.stdin.fileno())
+    servir(int(sys.argv[1]), entrada, saida)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from base_historica import preparar_jogos
+
+# 🔥 SNAPSHOTS VERSIONADOS DA BASE (PUBLICADOS PELO ATUALIZADOR, LIDOS PELO APP)
+DIRETORIO_SNAPSHOTS = os.environ.get(
+    'FUTALGORITHM_SNAPSHOTS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+)
+
+# Quantos snapshots antigos manter no disco (o app pode estar lendo o anterior durante a troca)
+MANTER_SNAPSHOTS = 3
+
+ARQUIVO_ATUAL = 'ATUAL.json'
+
+# Esquema de cada snapshot colunar (um .npy por coluna no diretório jogos-<versão>)
+ARQUIVO_ESQUEMA = 'esquema.json'
+
+
+def _gravar_atomico(diretorio, caminho, escrever):
+    """Escreve em um arquivo temporário do mesmo diretório e troca com os.replace"""
+    fd, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as arquivo:
+            escrever(arquivo)
+        os.replace(temporario, caminho)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+# 🔥 FORMATO COLUNAR: UM .npy POR COLUNA, ABERTO COM MEMORY-MAP
+# Colunas numéricas/datas vão como estão; category como códigos + categorias no esquema;
+# textos (Data, HT, FT) como dicionário (códigos + valores distintos)
+def gravar_colunar(df, caminho):
+    """Grava o DataFrame no diretório caminho (criado aqui)"""
+    os.makedirs(caminho)
+    colunas = []
+    for posicao, (nome, serie) in enumerate(df.items()):
+        coluna = {'nome': nome, 'arquivo': f"c{posicao:03d}.npy"}
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            coluna.update(tipo='categoria', categorias=serie.cat.categories.tolist())
+            valores = serie.cat.codes.to_numpy()
+        elif isinstance(serie.dtype, np.dtype) and serie.dtype.kind in 'biufM':
+            coluna['tipo'] = 'numerico'
+            valores = serie.to_numpy()
+        else:
+            codigos, distintos = pd.factorize(serie)
+            coluna.update(tipo='texto', valores=[str(valor) for valor in distintos])
+            valores = codigos.astype(np.int32)
+        np.save(os.path.join(caminho, coluna['arquivo']), valores, allow_pickle=False)
+        colunas.append(coluna)
+
+    np.save(os.path.join(caminho, 'indice.npy'), df.index.to_numpy(dtype=np.int64), allow_pickle=False)
+    with open(os.path.join(caminho, ARQUIVO_ESQUEMA), 'w', encoding='utf-8') as arquivo:
+        json.dump({'linhas': len(df), 'colunas': colunas}, arquivo, ensure_ascii=False)
+
+
+def ler_colunar(caminho):
+    """DataFrame de gravar_colunar; colunas numéricas e códigos ficam no arquivo (memory-map, somente leitura)"""
+    with open(os.path.join(caminho, ARQUIVO_ESQUEMA), 'r', encoding='utf-8') as arquivo:
+        esquema = json.load(arquivo)
+
+    dados = {}
+    for coluna in esquema['colunas']:
+        valores = np.load(os.path.join(caminho, coluna['arquivo']), mmap_mode='r', allow_pickle=False)
+        if coluna['tipo'] == 'categoria':
+            dados[coluna['nome']] = pd.Categorical.from_codes(valores, categories=coluna['categorias'],
+                                                              validate=False)
+        elif coluna['tipo'] == 'texto':
+            # Código -1 (valor ausente) pega o último item: NaN
+            dados[coluna['nome']] = pd.Index(coluna['valores'] + [np.nan], dtype=str).take(valores).array
+        else:
+            dados[coluna['nome']] = valores
+
+    indice = pd.Index(np.load(os.path.join(caminho, 'indice.npy'), mmap_mode='r', allow_pickle=False))
+    return pd.DataFrame(dados, index=indice, columns=[coluna['nome'] for coluna in esquema['colunas']], copy=False)
+
+
+def publicar_snapshot(df, diretorio=DIRETORIO_SNAPSHOTS, manter=MANTER_SNAPSHOTS):
+    """Grava a base (já com placares, datas e categorias decodificados) como nova versão colunar e só então
+    aponta ATUAL.json para ela. Retorna a versão"""
+    os.makedirs(diretorio, exist_ok=True)
+    criado_em = time.time()
+    versao = time.strftime('%Y%m%d-%H%M%S', time.gmtime(criado_em)) + f"-{int(criado_em * 1000) % 1000:03d}"
+    arquivo = f"jogos-{versao}"
+
+    df = preparar_jogos(df)
+    temporario = tempfile.mkdtemp(dir=diretorio, suffix='.tmp')
+    try:
+        gravar_colunar(df, os.path.join(temporario, arquivo))
+        os.replace(os.path.join(temporario, arquivo), os.path.join(diretorio, arquivo))
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+
+    manifesto = {
+        'versao': versao,
+        'arquivo': arquivo,
+        'formato': 'colunar',
+        'criado_em': criado_em,
+        'linhas': len(df),
+        'competicoes': int(df['Competição'].nunique()) if 'Competição' in df.columns else 0
+    }
+    _gravar_atomico(diretorio, os.path.join(diretorio, ARQUIVO_ATUAL),
+                    lambda f: f.write(json.dumps(manifesto).encode('utf-8')))
+
+    _remover_antigos(diretorio, manter)
+    return versao
+
+
+def _remover_antigos(diretorio, manter):
+    # Diretórios colunares e .pkl do formato anterior, ordenados pela versão
+    snapshots = sorted((nome for nome in os.listdir(diretorio) if nome.startswith('jogos-')),
+                       key=lambda nome: nome.removesuffix('.pkl'))
+    for nome in snapshots[:-manter] if manter > 0 else []:
+        caminho = os.path.join(diretorio, nome)
+        try:
+            if os.path.isdir(caminho):
+                shutil.rmtree(caminho)
+            else:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+def snapshot_atual(diretorio=DIRETORIO_SNAPSHOTS):
+    """Manifesto do snapshot publicado mais recente (None se ainda não existir)"""
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_ATUAL), 'r', encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def carregar_snapshot(versao, diretorio=DIRETORIO_SNAPSHOTS):
+    """DataFrame de uma versão publicada (colunar; .pkl das versões antigas)"""
+    caminho = os.path.join(diretorio, f"jogos-{versao}")
+    if os.path.isdir(caminho):
+        return ler_colunar(caminho)
+    return pd.read_pickle(f"{caminho}.pkl")